@@ -2,6 +2,8 @@
 *                           C extension for vimiv
 * Functions to enhance brightness and contrast of an image.
 *******************************************************************************/
+#ifndef brightness_contrast_h__
+#define brightness_contrast_h__
 
 #include "definitions.h"
 #include "helper_func.h"
@@ -34,6 +36,44 @@ static inline float enhance_contrast(float value, float factor)
     return (value - 0.5) * (TAN[tan_pos]) + 0.5;
 }
 
+/**
+ * Fill a lookup table with the enhanced value of every possible channel value.
+ *
+ * Enhancing brightness and contrast maps every channel value independently, so
+ * the 256 possible values are computed once per parameter set.
+ *
+ * @param lut Lookup table of 256 values to fill.
+ * @param brightness Factor to enhance brightness by.
+ * @param contrast Factor to enhance contrast by.
+ */
+static void bc_lut_c(U_CHAR* lut, float brightness, float contrast)
+{
+    float value;
+
+    for (int i = 0; i < 256; i++) {
+        value = ((float) i) / 255.;
+        value = enhance_brightness(value, brightness);
+        value = enhance_contrast(value, contrast);
+        lut[i] = pixel_value(value);
+    }
+}
+
+/**
+ * Map the R, G and B channels of an image using a lookup table.
+ *
+ * @param data Image pixel data to update.
+ * @param size Total size of the data.
+ * @param lut Lookup table of 256 values.
+ */
+static void apply_lut_c(U_CHAR* data, const Py_ssize_t size, const U_CHAR* lut)
+{
+    for (Py_ssize_t pixel = 0; pixel < size; pixel += 4) {
+        data[pixel + R_CHANNEL] = lut[data[pixel + R_CHANNEL]];
+        data[pixel + G_CHANNEL] = lut[data[pixel + G_CHANNEL]];
+        data[pixel + B_CHANNEL] = lut[data[pixel + B_CHANNEL]];
+    }
+}
+
 /**
  * Enhance brightness and contrast of an image.
  *
@@ -42,18 +82,13 @@ static inline float enhance_contrast(float value, float factor)
  * @param brightness Factor to enhance brightness by.
  * @param contrast Factor to enhance contrast by.
  */
-static void enhance_bc_c(U_CHAR* data, const int size, float brightness, float contrast)
+static void enhance_bc_c(U_CHAR* data, const Py_ssize_t size, float brightness,
+                         float contrast)
 {
-    float value;
+    U_CHAR lut[256];
 
-    for (int pixel = 0; pixel < size; pixel++) {
-        /* Skip alpha channel */
-        if (pixel % 4 != ALPHA_CHANNEL) {
-            value = ((float) data[pixel]) / 255.;
-            value = enhance_brightness(value, brightness);
-            value = enhance_contrast(value, contrast);
-            value = pixel_value(value);
-            data[pixel] = value;
-        }
-    }
+    bc_lut_c(lut, brightness, contrast);
+    apply_lut_c(data, size, lut);
 }
+
+#endif  // ifndef brightness_contrast_h__
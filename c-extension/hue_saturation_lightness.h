@@ -2,6 +2,8 @@
 *                           C extension for vimiv
 * Functions to enhance hue, saturation and value of an image.
 *******************************************************************************/
+#ifndef hue_saturation_lightness_h__
+#define hue_saturation_lightness_h__
 
 #include "definitions.h"
 #include "helper_func.h"
@@ -95,6 +97,36 @@ static void hsl_to_rgb(float h, float s, float l, float* r, float* g, float* b)
     *b = hsl_to_rgb_helper(a, 4, h, l);
 }
 
+/**
+ * Enhance hue, saturation and lightness of a single pixel.
+ *
+ * @param r Pointer to the red value of the pixel to update.
+ * @param g Pointer to the green value of the pixel to update.
+ * @param b Pointer to the blue value of the pixel to update.
+ * @param hue Value to change hue by.
+ * @param saturation Value to change saturation by.
+ * @param lightness Value to change lightness by.
+ */
+static inline void enhance_hsl_pixel(U_CHAR* r, U_CHAR* g, U_CHAR* b, float hue,
+                                     float saturation, float lightness)
+{
+    float r_fl, g_fl, b_fl, h, s, l;
+
+    r_fl = ((float) *r) / 255.;
+    g_fl = ((float) *g) / 255.;
+    b_fl = ((float) *b) / 255.;
+    rgb_to_hsl(r_fl, g_fl, b_fl, &h, &s, &l);
+    hsl_to_rgb(
+        enhance_hue(h, hue),
+        enhance_saturation(s, saturation),
+        enhance_lightness(l, lightness),
+        &r_fl, &g_fl, &b_fl
+    );
+    *r = pixel_value(r_fl);
+    *g = pixel_value(g_fl);
+    *b = pixel_value(b_fl);
+}
+
 /**
  * Enhance hue, saturation and lightness of an image.
  *
@@ -107,26 +139,19 @@ static void hsl_to_rgb(float h, float s, float l, float* r, float* g, float* b)
  * @param saturation Value to change saturation by.
  * @param lightness Value to change lightness by.
  */
-static void enhance_hsl_c(U_CHAR* data, const int size, float hue, float saturation,
-                   float lightness)
+static void enhance_hsl_c(U_CHAR* data, const Py_ssize_t size, float hue,
+                          float saturation, float lightness)
 {
-    float r, g, b, h, s, l;
-
     int channels = 4; // RGBA channels
 
-    for (int pixel = 0; pixel < size; pixel += channels) {
-        r = ((float) data[pixel + R_CHANNEL]) / 255.;
-        g = ((float) data[pixel + G_CHANNEL]) / 255.;
-        b = ((float) data[pixel + B_CHANNEL]) / 255.;
-        rgb_to_hsl(r, g, b, &h, &s, &l);
-        hsl_to_rgb(
-            enhance_hue(h, hue),
-            enhance_saturation(s, saturation),
-            enhance_lightness(l, lightness),
-            &r, &g, &b
+    for (Py_ssize_t pixel = 0; pixel < size; pixel += channels) {
+        enhance_hsl_pixel(
+            data + pixel + R_CHANNEL,
+            data + pixel + G_CHANNEL,
+            data + pixel + B_CHANNEL,
+            hue, saturation, lightness
         );
-        data[pixel + R_CHANNEL] = pixel_value(r);
-        data[pixel + G_CHANNEL] = pixel_value(g);
-        data[pixel + B_CHANNEL] = pixel_value(b);
     }
 }
+
+#endif  // ifndef hue_saturation_lightness_h__
@@ -2,13 +2,128 @@
 *                           C extension for vimiv
 * Simple add-on to manipulate brightness and contrast of an image on the pixel
 * scale.
+*
+* The *_inplace functions manipulate a writable buffer such as the memory of a
+* QImage directly. The other functions take bytes and return manipulated
+* copies. The global interpreter lock is released during all computations.
 *******************************************************************************/
 
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <stdio.h>
+#include <string.h>
 
 #include "brightness_contrast.h"
 #include "hue_saturation_lightness.h"
+#include "pipeline.h"
+
+/*****************************
+*      Buffer handling       *
+*****************************/
+
+/**
+ * Retrieve the pixel data of a python object supporting the buffer protocol.
+ *
+ * The data must be made up of 4 channels per pixel.
+ *
+ * @param py_data Python object providing the data.
+ * @param buffer Buffer to fill, must be released by the caller on success.
+ * @param flags Buffer request flags, e.g. PyBUF_WRITABLE.
+ * @return 0 on success, -1 with the python exception set otherwise.
+ */
+static int get_pixel_buffer(PyObject *py_data, Py_buffer *buffer, int flags)
+{
+    if (PyObject_GetBuffer(py_data, buffer, flags) < 0)
+        return -1;
+    if (buffer->len % 4 != 0) {
+        PyBuffer_Release(buffer);
+        PyErr_SetString(PyExc_ValueError, "Expected 4 channels per pixel");
+        return -1;
+    }
+    return 0;
+}
+
+/**
+ * Create python bytes containing a copy of the pixel data of a python object.
+ *
+ * @param py_data Python object supporting the buffer protocol.
+ * @return The new bytes or NULL with the python exception set.
+ */
+static PyObject *copy_pixel_data(PyObject *py_data)
+{
+    Py_buffer buffer;
+    if (!PyBytes_Check(py_data)) {
+        PyErr_SetString(PyExc_TypeError, "Expected bytes");
+        return NULL;
+    }
+    if (get_pixel_buffer(py_data, &buffer, PyBUF_SIMPLE) < 0)
+        return NULL;
+    PyObject *py_copy = PyBytes_FromStringAndSize(NULL, buffer.len);
+    if (py_copy != NULL)
+        memcpy(PyBytes_AS_STRING(py_copy), buffer.buf, buffer.len);
+    PyBuffer_Release(&buffer);
+    return py_copy;
+}
+
+/**
+ * Parse a python sequence of operations into an array of operations.
+ *
+ * Every item is either bytes of a lookup table with 256 values or a tuple of
+ * hue, saturation and lightness. Consecutive lookup tables are combined.
+ *
+ * @param py_operations Python sequence of operations.
+ * @param n_operations Filled with the number of parsed operations.
+ * @return Array to free using PyMem_Free or NULL with the python exception set.
+ */
+static Operation *parse_operations(PyObject *py_operations, int *n_operations)
+{
+    PyObject *sequence = PySequence_Fast(py_operations, "Expected a sequence");
+    if (sequence == NULL)
+        return NULL;
+    const Py_ssize_t n_items = PySequence_Fast_GET_SIZE(sequence);
+    Operation *operations = PyMem_Malloc((n_items + 1) * sizeof(Operation));
+    if (operations == NULL) {
+        Py_DECREF(sequence);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    *n_operations = 0;
+    for (Py_ssize_t i = 0; i < n_items; i++) {
+        PyObject *item = PySequence_Fast_GET_ITEM(sequence, i);
+        Operation *operation = operations + *n_operations;
+        if (PyBytes_Check(item)) {
+            if (PyBytes_GET_SIZE(item) != 256) {
+                PyErr_SetString(PyExc_ValueError,
+                                "Expected a lookup table of 256 values");
+                goto error;
+            }
+            U_CHAR *lut = (U_CHAR*) PyBytes_AS_STRING(item);
+            if (*n_operations > 0 && (operation - 1)->kind == OPERATION_LUT) {
+                combine_lut_c((operation - 1)->lut, lut);
+                continue;
+            }
+            operation->kind = OPERATION_LUT;
+            memcpy(operation->lut, lut, 256);
+        } else if (PyTuple_Check(item)) {
+            operation->kind = OPERATION_HSL;
+            if (!PyArg_ParseTuple(item, "fff", &operation->hue,
+                                  &operation->saturation, &operation->lightness))
+                goto error;
+        } else {
+            PyErr_SetString(PyExc_TypeError,
+                            "Expected bytes or a tuple of three floats");
+            goto error;
+        }
+        (*n_operations)++;
+    }
+    Py_DECREF(sequence);
+    return operations;
+
+error:
+    Py_DECREF(sequence);
+    PyMem_Free(operations);
+    return NULL;
+}
 
 /*****************************
 *  Generate python functions *
@@ -25,19 +140,20 @@ manipulate_bc(PyObject *self, PyObject *args)
                           &py_data, &brightness, &contrast))
         return NULL;
 
-    /* Convert python bytes to U_CHAR* for pixel data */
-    if (!PyBytes_Check(py_data)) {
-        PyErr_SetString(PyExc_TypeError, "Expected bytes");
+    /* Copy the data as python bytes are immutable */
+    PyObject *py_result = copy_pixel_data(py_data);
+    if (py_result == NULL)
         return NULL;
-    }
-    U_CHAR* data = (U_CHAR*) PyBytes_AsString(py_data);
-    const int size = PyBytes_Size(py_data);
+    U_CHAR* data = (U_CHAR*) PyBytes_AS_STRING(py_result);
+    const Py_ssize_t size = PyBytes_GET_SIZE(py_result);
 
     /* Run the C function to enhance brightness and contrast */
+    Py_BEGIN_ALLOW_THREADS
     enhance_bc_c(data, size, brightness, contrast);
+    Py_END_ALLOW_THREADS
 
     /* Return python bytes of updated data */
-    return PyBytes_FromStringAndSize((char*) data, size);
+    return py_result;
 }
 
 static PyObject *
@@ -52,19 +168,142 @@ manipulate_hsl(PyObject *self, PyObject *args)
                           &py_data, &hue, &saturation, &lightness))
         return NULL;
 
-    /* Convert python bytes to U_CHAR* for pixel data */
-    if (!PyBytes_Check(py_data)) {
-        PyErr_SetString(PyExc_TypeError, "Expected bytes");
+    /* Copy the data as python bytes are immutable */
+    PyObject *py_result = copy_pixel_data(py_data);
+    if (py_result == NULL)
         return NULL;
-    }
-    U_CHAR* data = (U_CHAR*) PyBytes_AsString(py_data);
-    const int size = PyBytes_Size(py_data);
+    U_CHAR* data = (U_CHAR*) PyBytes_AS_STRING(py_result);
+    const Py_ssize_t size = PyBytes_GET_SIZE(py_result);
 
-    /* Run the C function to enhance brightness and contrast */
+    /* Run the C function to enhance hue, saturation and lightness */
+    Py_BEGIN_ALLOW_THREADS
     enhance_hsl_c(data, size, hue, saturation, lightness);
+    Py_END_ALLOW_THREADS
 
     /* Return python bytes of updated data */
-    return PyBytes_FromStringAndSize((char*) data, size);
+    return py_result;
+}
+
+static PyObject *
+manipulate_bc_inplace(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    PyObject *py_data;
+    float brightness;
+    float contrast;
+    Py_buffer buffer;
+    if (!PyArg_ParseTuple(args, "Off",
+                          &py_data, &brightness, &contrast))
+        return NULL;
+    if (get_pixel_buffer(py_data, &buffer, PyBUF_WRITABLE) < 0)
+        return NULL;
+
+    /* Run the C function to enhance brightness and contrast */
+    Py_BEGIN_ALLOW_THREADS
+    enhance_bc_c((U_CHAR*) buffer.buf, buffer.len, brightness, contrast);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&buffer);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+manipulate_bc_lut(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    float brightness;
+    float contrast;
+    U_CHAR lut[256];
+    if (!PyArg_ParseTuple(args, "ff", &brightness, &contrast))
+        return NULL;
+
+    /* Compute the lookup table and return it as python bytes */
+    bc_lut_c(lut, brightness, contrast);
+    return PyBytes_FromStringAndSize((char*) lut, 256);
+}
+
+static PyObject *
+manipulate_lut_inplace(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    PyObject *py_data;
+    PyObject *py_lut;
+    Py_buffer buffer;
+    Py_buffer lut;
+    if (!PyArg_ParseTuple(args, "OO", &py_data, &py_lut))
+        return NULL;
+    if (PyObject_GetBuffer(py_lut, &lut, PyBUF_SIMPLE) < 0)
+        return NULL;
+    if (lut.len != 256) {
+        PyBuffer_Release(&lut);
+        PyErr_SetString(PyExc_ValueError, "Expected a lookup table of 256 values");
+        return NULL;
+    }
+    if (get_pixel_buffer(py_data, &buffer, PyBUF_WRITABLE) < 0) {
+        PyBuffer_Release(&lut);
+        return NULL;
+    }
+
+    /* Run the C function to map the channels */
+    Py_BEGIN_ALLOW_THREADS
+    apply_lut_c((U_CHAR*) buffer.buf, buffer.len, (U_CHAR*) lut.buf);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&buffer);
+    PyBuffer_Release(&lut);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+manipulate_hsl_inplace(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    PyObject *py_data;
+    float hue;
+    float saturation;
+    float lightness;
+    Py_buffer buffer;
+    if (!PyArg_ParseTuple(args, "Offf",
+                          &py_data, &hue, &saturation, &lightness))
+        return NULL;
+    if (get_pixel_buffer(py_data, &buffer, PyBUF_WRITABLE) < 0)
+        return NULL;
+
+    /* Run the C function to enhance hue, saturation and lightness */
+    Py_BEGIN_ALLOW_THREADS
+    enhance_hsl_c((U_CHAR*) buffer.buf, buffer.len, hue, saturation, lightness);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&buffer);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+manipulate_pipeline_inplace(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    PyObject *py_data;
+    PyObject *py_operations;
+    Py_buffer buffer;
+    int n_operations;
+    if (!PyArg_ParseTuple(args, "OO", &py_data, &py_operations))
+        return NULL;
+    Operation *operations = parse_operations(py_operations, &n_operations);
+    if (operations == NULL)
+        return NULL;
+    if (get_pixel_buffer(py_data, &buffer, PyBUF_WRITABLE) < 0) {
+        PyMem_Free(operations);
+        return NULL;
+    }
+
+    /* Run the C function to apply all operations in a single pass */
+    Py_BEGIN_ALLOW_THREADS
+    apply_pipeline_c((U_CHAR*) buffer.buf, buffer.len, operations, n_operations);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&buffer);
+    PyMem_Free(operations);
+    Py_RETURN_NONE;
 }
 
 /*****************************
@@ -74,6 +313,16 @@ manipulate_hsl(PyObject *self, PyObject *args)
 static PyMethodDef ManipulateMethods[] = {
     {"brightness_contrast", manipulate_bc, METH_VARARGS, "Manipulate brightness and contrast"},
     {"hue_saturation_lightness", manipulate_hsl, METH_VARARGS, "Manipulate hue, saturation and lightness"},
+    {"brightness_contrast_inplace", manipulate_bc_inplace, METH_VARARGS,
+     "Manipulate brightness and contrast of a writable buffer in place"},
+    {"hue_saturation_lightness_inplace", manipulate_hsl_inplace, METH_VARARGS,
+     "Manipulate hue, saturation and lightness of a writable buffer in place"},
+    {"brightness_contrast_lut", manipulate_bc_lut, METH_VARARGS,
+     "Return the lookup table of brightness and contrast as bytes"},
+    {"apply_lut_inplace", manipulate_lut_inplace, METH_VARARGS,
+     "Map the channels of a writable buffer in place using a lookup table"},
+    {"apply_pipeline_inplace", manipulate_pipeline_inplace, METH_VARARGS,
+     "Apply a sequence of operations to a writable buffer in a single pass"},
     {NULL, NULL, 0, NULL}  /* Sentinel */
 };
 
@@ -0,0 +1,80 @@
+/*******************************************************************************
+*                           C extension for vimiv
+* Fused pipeline applying several manipulations in a single pass over an image.
+*******************************************************************************/
+#ifndef pipeline_h__
+#define pipeline_h__
+
+#include "definitions.h"
+#include "hue_saturation_lightness.h"
+
+#define OPERATION_LUT 0
+#define OPERATION_HSL 1
+
+/**
+ * A single operation of the pipeline.
+ *
+ * Operations of kind OPERATION_LUT map the channels using the lookup table,
+ * operations of kind OPERATION_HSL enhance hue, saturation and lightness.
+ */
+typedef struct {
+    int kind;
+    U_CHAR lut[256];
+    float hue;
+    float saturation;
+    float lightness;
+} Operation;
+
+/**
+ * Combine a lookup table into another one so that it applies both in order.
+ *
+ * @param lut Lookup table applied first which is updated.
+ * @param next Lookup table applied second.
+ */
+static void combine_lut_c(U_CHAR* lut, const U_CHAR* next)
+{
+    for (int i = 0; i < 256; i++)
+        lut[i] = next[lut[i]];
+}
+
+/**
+ * Apply a pipeline of operations to an image.
+ *
+ * Every pixel is read and written once and all operations are applied in
+ * between. A lookup table followed by an HSL operation is thus folded into the
+ * conversion to the HSL space. Consecutive lookup tables should be combined
+ * beforehand using combine_lut_c.
+ *
+ * @param data Image pixel data to update.
+ * @param size Total size of the data.
+ * @param operations The operations to apply in order.
+ * @param n_operations Number of operations.
+ */
+static void apply_pipeline_c(U_CHAR* data, const Py_ssize_t size,
+                             const Operation* operations, const int n_operations)
+{
+    U_CHAR r, g, b;
+    const Operation* operation;
+
+    for (Py_ssize_t pixel = 0; pixel < size; pixel += 4) {
+        r = data[pixel + R_CHANNEL];
+        g = data[pixel + G_CHANNEL];
+        b = data[pixel + B_CHANNEL];
+        for (int i = 0; i < n_operations; i++) {
+            operation = operations + i;
+            if (operation->kind == OPERATION_LUT) {
+                r = operation->lut[r];
+                g = operation->lut[g];
+                b = operation->lut[b];
+            } else {
+                enhance_hsl_pixel(&r, &g, &b, operation->hue, operation->saturation,
+                                  operation->lightness);
+            }
+        }
+        data[pixel + R_CHANNEL] = r;
+        data[pixel + G_CHANNEL] = g;
+        data[pixel + B_CHANNEL] = b;
+    }
+}
+
+#endif  // ifndef pipeline_h__
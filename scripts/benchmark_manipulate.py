@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Benchmark the fused manipulation pipeline against applying groups one by one.
+
+Random image data of the given size in megapixels is manipulated by a sequence of
+brightness | contrast and hue | saturation | lightness changes as they are stored when
+accepting manipulations. The throughput of applying every group in a separate pass is
+compared to applying the fused pipeline in a single pass. Both run in the calling
+thread, the c-extension must be built, e.g. using scripts/maybe_build_cextension.py.
+"""
+
+import argparse
+import os
+import timeit
+
+from vimiv.imutils import _c_manipulate  # type: ignore
+
+
+def main():
+    parser = get_parser()
+    args = parser.parse_args()
+    data = bytearray(os.urandom(int(args.megapixels * 1e6) * 4))
+    operations = [
+        _c_manipulate.brightness_contrast_lut(0.2, 0.1),
+        (30.0, 0.2, -0.1),
+        _c_manipulate.brightness_contrast_lut(-0.1, 0.3),
+        (-60.0, -0.3, 0.2),
+    ][: args.groups]
+
+    def per_group():
+        for operation in operations:
+            if isinstance(operation, bytes):
+                _c_manipulate.apply_lut_inplace(data, operation)
+            else:
+                _c_manipulate.hue_saturation_lightness_inplace(data, *operation)
+
+    def fused():
+        _c_manipulate.apply_pipeline_inplace(data, operations)
+
+    print(f"{args.megapixels} MP, {len(operations)} groups, {args.repeat} runs")
+    for name, function in (("per group", per_group), ("fused", fused)):
+        seconds = min(timeit.repeat(function, number=1, repeat=args.repeat))
+        print(f"{name:>10}: {seconds:.3f} s, {args.megapixels / seconds:.1f} MP/s")
+
+
+def get_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--megapixels", type=float, default=12, help="Size of the image data"
+    )
+    parser.add_argument(
+        "--groups",
+        type=int,
+        default=4,
+        choices=range(1, 5),
+        help="Number of manipulation groups to apply",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs")
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ import mockdecorators
 with mockdecorators.apply():
     from vimiv import api, startup, utils
     from vimiv.commands import runners
-    from vimiv.imutils import filelist
+    from vimiv.imutils import filelist, _file_handler
     from vimiv.gui import eventhandler
     from vimiv.utils import trash_manager
 
@@ -73,6 +73,12 @@ def faster_wait_times():
     utils.Throttle.unthrottle()
 
 
+@pytest.fixture(autouse=True, scope="session")
+def synchronous_image_loading():
+    """Fixture to load images synchronously so they can be checked directly."""
+    _file_handler.ImageFileHandler.asynchronous = False
+
+
 ###############################################################################
 #                                  bdd Given                                  #
 ###############################################################################
@@ -6,11 +6,13 @@
 
 import pytest_bdd as bdd
 
+from vimiv.gui.thumbnail import ThumbnailModel
+
 
 bdd.scenarios("thumbnailmark.feature")
 
 
 @bdd.then(bdd.parsers.parse("the thumbnail number {number:d} should be marked"))
 def check_thumbnail_marked(thumbnail, number):
-    item = thumbnail.item(number - 1)
-    assert item is not None and item.marked
+    index = thumbnail.model().index(number - 1)
+    assert index.isValid() and index.data(ThumbnailModel.MarkedRole)
@@ -0,0 +1,75 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.api.working_directory."""
+
+import pytest
+from PyQt5.QtGui import QImage
+
+from vimiv.api.working_directory import WorkingDirectoryHandler
+
+
+def create_image(path):
+    QImage(4, 4, QImage.Format_RGB32).save(str(path), "jpg")
+
+
+@pytest.fixture()
+def directory(tmp_path):
+    create_image(tmp_path / "image_1.jpg")
+    (tmp_path / "sub_1").mkdir()
+    (tmp_path / "text.txt").write_text("not an image")
+    yield tmp_path
+
+
+@pytest.fixture()
+def handler(qtbot, directory):
+    instance = WorkingDirectoryHandler()
+    instance._load_directory(str(directory))
+    qtbot.waitUntil(lambda: not instance._scanning)
+    yield instance
+
+
+def test_update_content_emits_changes_only(qtbot, handler, directory):
+    create_image(directory / "image_0.jpg")
+    (directory / "image_1.jpg").unlink()
+    (directory / "sub_0").mkdir()
+    with qtbot.waitSignal(handler.images_changed) as blocker:
+        handler._update_content()
+    images, added, removed = blocker.args
+    assert images == [str(directory / "image_0.jpg")]
+    assert added == [str(directory / "image_0.jpg")]
+    assert removed == [str(directory / "image_1.jpg")]
+    assert handler._directories == [
+        str(directory / "sub_0"),
+        str(directory / "sub_1"),
+    ]
+
+
+def test_update_content_without_changes(qtbot, handler):
+    with qtbot.assertNotEmitted(handler.changed):
+        handler._update_content()
+
+
+def test_update_content_skips_unmodified_files(mocker, handler):
+    is_image = mocker.patch("vimiv.utils.files.is_image", return_value=False)
+    handler._update_content()
+    handler._update_content()
+    assert not is_image.called  # Files rejected by the initial scan are not read
+
+
+def test_update_content_checks_new_files_once(mocker, handler, directory):
+    (directory / "new.txt").write_text("not an image")
+    is_image = mocker.patch("vimiv.utils.files.is_image", return_value=False)
+    handler._update_content()
+    handler._update_content()
+    assert is_image.call_count == 1
+
+
+def test_update_content_detects_modified_file(qtbot, handler, directory):
+    create_image(directory / "text.txt")
+    with qtbot.waitSignal(handler.images_changed) as blocker:
+        handler._update_content()
+    assert blocker.args[1] == [str(directory / "text.txt")]
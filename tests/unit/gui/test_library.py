@@ -0,0 +1,169 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.gui.library."""
+
+from PyQt5.QtGui import QFont
+
+import pytest
+
+from vimiv import api, utils
+from vimiv.gui.library import LibraryDelegate, LibraryModel
+
+
+@pytest.fixture()
+def delegate(qtbot, mocker):
+    """Fixture to retrieve a LibraryDelegate with dummy styles."""
+    colors = {"library.fg": "#ffffff", "library.search.highlighted.fg": "#ff0000"}
+    mocker.patch(
+        "vimiv.config.styles.get", side_effect=lambda name: colors.get(name, "#000000")
+    )
+    yield LibraryDelegate()
+
+
+@pytest.fixture()
+def asyncrun(mocker):
+    """Fixture to record the sizes to compute instead of starting the worker thread."""
+    mocker.patch("vimiv.utils.files.get_size_file", return_value="1 B")
+    mocker.patch("vimiv.utils.files.get_size_directory", return_value="2")
+    yield mocker.patch("vimiv.gui.library.asyncrun")
+
+
+@pytest.fixture()
+def model(qtbot, mocker, asyncrun):
+    """Fixture to retrieve a LibraryModel with a dummy library."""
+    mocker.patch.object(api.working_directory, "handler")
+    yield LibraryModel(mocker.Mock())
+
+
+@pytest.fixture()
+def signals(model, mocker):
+    """Fixture to record the row signals emitted by the model."""
+    names = ("rowsRemoved", "rowsInserted")
+    recorded = {name: mocker.Mock() for name in names}
+    for name, mock in recorded.items():
+        getattr(model, name).connect(mock)
+    yield recorded
+
+
+def column(model, col):
+    return [model.item(row, col).text() for row in range(model.rowCount())]
+
+
+def compute_sizes(calls):
+    """Run the recorded computations of sizes as the worker thread would."""
+    for (function, *args), _kwargs in list(calls):
+        function(*args)
+
+
+def test_text_segments_of_image(delegate):
+    segments = delegate.text_segments("image.jpg", False, QFont(), 1000)
+    assert len(segments) == 1
+    assert segments[0].text.text() == "image.jpg"
+    assert segments[0].color == delegate.fg
+    assert not segments[0].font.bold()
+
+
+def test_text_segments_of_marked_directory(delegate):
+    text = api.mark.highlight(utils.add_html("directory/", "b"))
+    mark, name = delegate.text_segments(text, True, QFont(), 1000)
+    assert mark.text.text() == utils.strip_html(api.mark.indicator) + " "
+    assert mark.x == 0
+    assert name.text.text() == "directory/"
+    assert name.x > 0
+    assert name.color == delegate.search_fg
+    assert name.font.bold()
+
+
+def test_text_segments_elided(delegate):
+    name = "a" * 200 + ".jpg"
+    (segment,) = delegate.text_segments(name, False, QFont(), 100)
+    assert "…" in segment.text.text()
+    assert segment.text.text().endswith(".jpg")
+
+
+def test_update_rows_inserts_and_removes_blocks(model, signals):
+    model._set_rows(["a.jpg", "b.jpg", "c.jpg", "d.jpg"], ["x", "y"])
+    for mock in signals.values():
+        mock.reset_mock()
+    assert model._update_rows(["a.jpg", "bb.jpg", "d.jpg", "e.jpg"], ["w", "x", "y"])
+    assert model.paths == ["w", "x", "y", "a.jpg", "bb.jpg", "d.jpg", "e.jpg"]
+    assert model._rows["d.jpg"] == 5
+    assert signals["rowsRemoved"].call_count == 1  # Block b, c
+    assert signals["rowsInserted"].call_count == 3  # Blocks w, bb and e
+    assert column(model, 1)[0] == utils.add_html("w/", "b")
+    assert column(model, 1)[4] == "bb.jpg"
+
+
+def test_update_rows_at_directory_image_boundary(model, signals):
+    model._set_rows(["a.jpg"], ["x"])
+    for mock in signals.values():
+        mock.reset_mock()
+    assert model._update_rows(["b.jpg", "a.jpg"], ["x", "y"])
+    assert model.paths == ["x", "y", "b.jpg", "a.jpg"]
+    assert model._n_directories == 2
+    assert signals["rowsInserted"].call_count == 2  # Directory y and image b
+    assert column(model, 1)[1:3] == [utils.add_html("y/", "b"), "b.jpg"]
+
+
+def test_update_rows_renumbers_rows(model):
+    model._set_rows(["a.jpg", "b.jpg", "c.jpg"], [])
+    assert model._update_rows(["b.jpg", "bb.jpg", "c.jpg"], [])
+    assert column(model, 0) == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize(
+    "images, directories",
+    [
+        (["b.jpg", "a.jpg"], ["x"]),  # Order changed
+        (["x", "a.jpg"], []),  # Directory became image
+    ],
+)
+def test_update_rows_fails_for_changed_order_or_type(model, images, directories):
+    model._set_rows(["a.jpg", "b.jpg"], ["x"])
+    assert not model._update_rows(images, directories)
+
+
+def test_update_rows_fails_for_too_many_blocks(model, mocker):
+    mocker.patch.object(LibraryModel, "MAX_BLOCKS", 1)
+    model._set_rows(["a.jpg", "c.jpg"], [])
+    assert not model._update_rows(["a.jpg", "b.jpg", "c.jpg", "d.jpg"], [])
+
+
+def test_directory_changed_recreates_rows_as_fallback(model):
+    model._set_rows(["a.jpg"], ["x"])
+    model._on_directory_changed(["x", "a.jpg"], [])
+    assert model.paths == ["x", "a.jpg"]
+    assert model._n_directories == 0
+    assert column(model, 0) == ["1", "2"]
+    assert column(model, 1) == ["x", "a.jpg"]
+
+
+def test_size_placeholder_replaced_once_computed(model, asyncrun):
+    model._set_rows(["a.jpg"], ["x"])
+    assert column(model, 2) == [LibraryModel.SIZE_PLACEHOLDER] * 2
+    compute_sizes(asyncrun.call_args_list)
+    assert column(model, 2) == ["2", "1 B"]
+
+
+def test_size_of_inserted_row_computed(model, asyncrun):
+    model._set_rows(["a.jpg"], [])
+    compute_sizes(asyncrun.call_args_list)
+    asyncrun.reset_mock()
+    model._update_rows(["a.jpg", "b.jpg"], [])
+    assert column(model, 2) == ["1 B", LibraryModel.SIZE_PLACEHOLDER]
+    compute_sizes(asyncrun.call_args_list)
+    assert column(model, 2) == ["1 B", "1 B"]
+
+
+def test_outdated_sizes_are_dropped(model, asyncrun):
+    model._set_rows(["a.jpg"], [])
+    outdated = list(asyncrun.call_args_list)
+    size_id = model._size_id
+    model._set_rows(["a.jpg"], [])
+    compute_sizes(outdated)
+    model._on_sizes_computed(size_id, [("a.jpg", "9 B")])
+    assert column(model, 2) == [LibraryModel.SIZE_PLACEHOLDER]
@@ -6,25 +6,59 @@
 
 """Tests for vimiv.gui.thumbnail."""
 
-from PyQt5.QtCore import QSize
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 
 import pytest
 
-from vimiv.gui.thumbnail import ThumbnailItem
+from vimiv.gui.thumbnail import ThumbnailModel
 
 
 @pytest.fixture()
-def item(mocker):
-    """Fixture to retrieve a vanilla ThumbnailItem."""
-    ThumbnailItem._default_icon = None
-    mocker.patch.object(ThumbnailItem, "create_default_icon", return_value=QIcon())
-    yield ThumbnailItem
+def model(mocker):
+    """Fixture to retrieve a vanilla ThumbnailModel."""
+    ThumbnailModel._default_icon = None
+    mocker.patch.object(ThumbnailModel, "create_default_icon", return_value=QIcon())
+    yield ThumbnailModel()
 
 
-def test_create_default_pixmap_once(item):
+@pytest.fixture()
+def signals(model, mocker):
+    """Fixture to record the row signals emitted by the model."""
+    names = ("rowsRemoved", "rowsInserted", "modelReset")
+    recorded = {name: mocker.Mock() for name in names}
+    for name, mock in recorded.items():
+        getattr(model, name).connect(mock)
+    yield recorded
+
+
+def test_create_default_pixmap_once(model):
     """Ensure the default thumbnail icon is only created once."""
-    size_hint = QSize(128, 128)
-    for index in range(5):
-        item(None, index, size_hint=size_hint)
-    item.create_default_icon.assert_called_once()
+    model.set_paths([f"image_{i}.jpg" for i in range(5)])
+    for row in range(5):
+        model.data(model.index(row), Qt.DecorationRole)
+    model.create_default_icon.assert_called_once()
+
+
+def test_set_paths_inserts_and_removes_blocks(model, signals):
+    model.set_paths(list("abcdef"))
+    for mock in signals.values():
+        mock.reset_mock()
+    model.set_paths(list("axbcyzf"))
+    assert model.paths == list("axbcyzf")
+    assert model.row("y") == 4
+    assert signals["rowsRemoved"].call_count == 1  # Block d, e
+    assert signals["rowsInserted"].call_count == 2  # Blocks x and y, z
+    signals["modelReset"].assert_not_called()
+
+
+def test_set_paths_resets_on_reorder(model, signals):
+    model.set_paths(list("abc"))
+    model.set_icon(1, QIcon())
+    for mock in signals.values():
+        mock.reset_mock()
+    model.set_paths(list("cba"))
+    assert model.paths == list("cba")
+    assert model.row("a") == 2
+    assert "b" in model._icons
+    signals["modelReset"].assert_called_once()
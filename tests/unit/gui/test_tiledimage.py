@@ -0,0 +1,64 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.gui.tiledimage."""
+
+from PyQt5.QtCore import QRect, QRectF, QSize
+from PyQt5.QtGui import QImageIOHandler
+
+import pytest
+
+from vimiv.gui.tiledimage import TiledImage, TILE_SIZE, stored_rect
+
+
+@pytest.fixture()
+def item(qtbot):
+    """Fixture to retrieve a TiledImage of a 20000x10000 px image."""
+    yield TiledImage("not_decoded.jpg", QSize(20000, 10000))
+
+
+def test_overview_fits_overview_size(item):
+    assert item._overview_level == 4  # 20000 / 2 ** 4 = 1250
+
+
+@pytest.mark.parametrize(
+    "lod, level", [(2.0, 0), (1.0, 0), (0.5, 1), (0.3, 1), (0.25, 2), (0.01, 4)]
+)
+def test_level_for_level_of_detail(item, lod, level):
+    assert item._level_for(lod) == level
+
+
+def test_tiles_of_visible_region(item):
+    extent = TILE_SIZE * 2
+    rect = QRectF(extent - 1, 0, extent, 1)
+    assert list(item._tiles(1, rect)) == [(1, 0, 0), (1, 1, 0)]
+
+
+def test_overview_is_single_tile(item):
+    assert list(item._tiles(4, item.boundingRect())) == [(4, 0, 0)]
+    assert item._image_rect((4, 0, 0)) == QRect(0, 0, 20000, 10000)
+
+
+def test_image_rect_clipped_to_image(item):
+    col = 20000 // TILE_SIZE
+    assert item._image_rect((0, col, 0)) == QRect(col * TILE_SIZE, 0, 32, TILE_SIZE)
+
+
+@pytest.mark.parametrize(
+    "transformation, expected",
+    [
+        (QImageIOHandler.TransformationNone, QRect(10, 20, 30, 40)),
+        (QImageIOHandler.TransformationMirror, QRect(160, 20, 30, 40)),
+        (QImageIOHandler.TransformationFlip, QRect(10, 40, 30, 40)),
+        (QImageIOHandler.TransformationRotate90, QRect(20, 60, 40, 30)),
+        (QImageIOHandler.TransformationRotate180, QRect(160, 40, 30, 40)),
+        (QImageIOHandler.TransformationRotate270, QRect(140, 10, 40, 30)),
+    ],
+)
+def test_stored_rect_of_transformed_image(transformation, expected):
+    size = QSize(200, 100)  # Stored image
+    rect = QRect(10, 20, 30, 40)  # Displayed image
+    assert stored_rect(rect, size, transformation) == expected
@@ -0,0 +1,80 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for the vimiv.imutils._c_manipulate C extension."""
+
+import pytest
+
+from vimiv.imutils import _c_manipulate
+
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.mark.parametrize(
+    "name, args",
+    [
+        ("brightness_contrast", (0.2, -0.1)),
+        ("hue_saturation_lightness", (30, 0.2, 0.1)),
+    ],
+)
+def test_manipulate_inplace_equals_copy(name, args):
+    copied = getattr(_c_manipulate, name)(DATA, *args)
+    buffer = bytearray(DATA)
+    getattr(_c_manipulate, name + "_inplace")(memoryview(buffer), *args)
+    assert bytes(buffer) == copied != DATA
+
+
+def test_manipulate_does_not_modify_bytes():
+    data = bytes(DATA)
+    _c_manipulate.brightness_contrast(data, 0.5, 0.5)
+    assert data == DATA
+
+
+def test_manipulate_inplace_requires_writable_buffer():
+    with pytest.raises(BufferError):
+        _c_manipulate.brightness_contrast_inplace(DATA, 0.5, 0.5)
+
+
+def test_manipulate_inplace_requires_four_channels():
+    with pytest.raises(ValueError):
+        _c_manipulate.brightness_contrast_inplace(bytearray(3), 0.5, 0.5)
+
+
+def test_brightness_contrast_lut_equals_direct_computation():
+    lut = _c_manipulate.brightness_contrast_lut(0.2, -0.1)
+    buffer = bytearray(DATA)
+    _c_manipulate.apply_lut_inplace(buffer, lut)
+    assert bytes(buffer) == _c_manipulate.brightness_contrast(DATA, 0.2, -0.1)
+
+
+def test_apply_lut_requires_256_values():
+    with pytest.raises(ValueError):
+        _c_manipulate.apply_lut_inplace(bytearray(DATA), bytes(255))
+
+
+def test_pipeline_equals_groups_in_series():
+    operations = [
+        _c_manipulate.brightness_contrast_lut(0.2, 0.1),
+        _c_manipulate.brightness_contrast_lut(-0.1, 0.3),
+        (30, 0.2, -0.1),
+        _c_manipulate.brightness_contrast_lut(0.1, 0.0),
+    ]
+    expected = bytearray(DATA)
+    for operation in operations:
+        if isinstance(operation, bytes):
+            _c_manipulate.apply_lut_inplace(expected, operation)
+        else:
+            _c_manipulate.hue_saturation_lightness_inplace(expected, *operation)
+    buffer = bytearray(DATA)
+    _c_manipulate.apply_pipeline_inplace(buffer, operations)
+    assert buffer == expected
+
+
+@pytest.mark.parametrize("operation", [b"lut", (1, 2), 42])
+def test_pipeline_rejects_invalid_operation(operation):
+    with pytest.raises((TypeError, ValueError)):
+        _c_manipulate.apply_pipeline_inplace(bytearray(DATA), [operation])
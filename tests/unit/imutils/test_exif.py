@@ -6,6 +6,9 @@
 
 """Tests for vimiv.imutils.exif."""
 
+from PyQt5.QtCore import QBuffer, QIODevice, QSize
+from PyQt5.QtGui import QImage
+
 import pytest
 
 from vimiv.imutils import exif
@@ -39,6 +42,7 @@ def test_check_exif_dependency_noexif(noexif):
         ("exif_date_time", ()),
         ("get_formatted_exif", ([],)),
         ("get_keys", ()),
+        ("get_embedded_preview", ()),
     ),
 )
 def test_handler_base_raises(methodname, args):
@@ -59,3 +63,33 @@ def test_handler_base_raises(methodname, args):
 def test_handler_exception_customization(handler, expected_msg):
     with pytest.raises(exif.UnsupportedExifOperation, match=expected_msg):
         handler.raise_exception("test operation")
+
+
+@pytest.fixture()
+def image_with_preview(tmp_path):
+    """Fixture to retrieve a helper function creating a jpg with embedded preview."""
+
+    def create_image(size, preview_size):
+        path = str(tmp_path / "image.jpg")
+        QImage(size, QImage.Format_RGB32).save(path)
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        QImage(preview_size, QImage.Format_RGB32).save(buffer, "jpg")
+        exif_dict = {"0th": {}, "1st": {}, "thumbnail": bytes(buffer.data())}
+        exif.piexif.insert(exif.piexif.dump(exif_dict), path)
+        return path
+
+    return create_image
+
+
+def test_read_embedded_preview(image_with_preview):
+    path = image_with_preview(QSize(300, 200), QSize(150, 100))
+    assert exif.read_embedded_preview(path).size() == QSize(150, 100)
+
+
+@pytest.mark.parametrize(
+    "preview_size, min_size", ((QSize(150, 100), 200), (QSize(100, 100), 0))
+)
+def test_ignore_unusable_embedded_preview(image_with_preview, preview_size, min_size):
+    path = image_with_preview(QSize(300, 200), preview_size)
+    assert exif.read_embedded_preview(path, min_size=min_size).isNull()
@@ -0,0 +1,116 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for the asynchronous loading of vimiv.imutils._file_handler."""
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage
+
+import pytest
+
+from vimiv import api
+from vimiv.imutils import _file_handler, _prefetch
+
+
+@pytest.fixture()
+def images(tmp_path):
+    """Fixture to create two 10x10 images which are not in the prefetch cache."""
+    _prefetch.cache.clear()
+    paths = []
+    for name in "first.png", "second.png":
+        path = str(tmp_path / name)
+        image = QImage(10, 10, QImage.Format_RGB32)
+        image.fill(0)
+        image.save(path)
+        paths.append(path)
+    yield paths
+    _prefetch.cache.clear()
+
+
+@pytest.fixture()
+def asyncrun(mocker):
+    """Fixture to record the decoding jobs instead of starting them."""
+    yield mocker.patch.object(_file_handler.utils, "asyncrun")
+
+
+@pytest.fixture()
+def handler(qtbot, mocker, asyncrun):
+    """Fixture to retrieve an asynchronous file handler with a mocked loader pool."""
+    mocker.patch.object(_file_handler.ImageFileHandler, "pool")
+    handler = _file_handler.ImageFileHandler()
+    yield handler
+    api.signals.new_image_opened.disconnect(handler._on_new_image_opened)
+    api.signals.all_images_cleared.disconnect(handler._on_images_cleared)
+    api.signals.image_changed.disconnect(handler.reload)
+    api.signals.load_full_resolution.disconnect(handler._on_load_full_resolution)
+
+
+@pytest.fixture()
+def loaded(mocker):
+    """Fixture to record the pixmaps emitted with pixmap_loaded."""
+    mock = mocker.Mock()
+    api.signals.pixmap_loaded.connect(mock)
+    yield mock
+    api.signals.pixmap_loaded.disconnect(mock)
+
+
+def run_job(asyncrun, index=-1):
+    """Run the decoding job started with asyncrun synchronously."""
+    function, *args = asyncrun.call_args_list[index][0]
+    function(*args)
+
+
+def test_load_decodes_asynchronously(handler, asyncrun, images, loaded, qtbot):
+    handler._load(images[0], keep_zoom=False)
+    assert asyncrun.call_count == 1
+    assert not loaded.called
+    with qtbot.waitSignal(handler._image_read):
+        run_job(asyncrun)
+    assert loaded.call_count == 1
+    assert handler._path == images[0]
+
+
+def test_load_cancels_pending_reads(handler, asyncrun, images):
+    handler._load(images[0], keep_zoom=False)
+    load_id = handler._load_id
+    handler.pool.clear.reset_mock()
+    handler._load(images[1], keep_zoom=False)
+    handler.pool.clear.assert_called_once()
+    assert handler._load_id > load_id
+
+
+def test_superseded_read_is_skipped(handler, asyncrun, images, mocker):
+    read_image = mocker.spy(_prefetch, "read_image")
+    handler._load(images[0], keep_zoom=False)
+    handler._load(images[1], keep_zoom=False)
+    run_job(asyncrun, index=0)
+    assert not read_image.called
+
+
+def test_stale_image_read_is_discarded(handler, images, loaded):
+    handler._load(images[0], keep_zoom=False)
+    stale_id = handler._load_id
+    handler._load(images[1], keep_zoom=False)
+    handler._on_image_read(stale_id, images[0], QImage(images[0]), QSize(), False)
+    assert not loaded.called
+    assert handler._path != images[0]
+
+
+def test_newest_image_read_is_displayed(handler, asyncrun, images, loaded):
+    handler._load(images[0], keep_zoom=False)
+    handler._load(images[1], keep_zoom=False)
+    run_job(asyncrun, index=0)
+    run_job(asyncrun, index=1)
+    assert loaded.call_count == 1
+    assert handler._path == images[1]
+
+
+def test_images_cleared_cancels_pending_reads(handler, images, loaded):
+    handler._load(images[0], keep_zoom=False)
+    load_id = handler._load_id
+    handler._on_images_cleared()
+    handler._on_image_read(load_id, images[0], QImage(images[0]), QSize(), False)
+    assert not loaded.called
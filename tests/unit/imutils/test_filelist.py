@@ -0,0 +1,81 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for updating the paths of vimiv.imutils.filelist."""
+
+import pytest
+
+from vimiv.imutils import filelist
+
+
+DIRECTORY = "/images"
+
+
+def paths(*names):
+    return [f"{DIRECTORY}/{name}.jpg" for name in names]
+
+
+@pytest.fixture()
+def load_paths(mocker):
+    """Fixture to record the paths loaded into the filelist."""
+    mocker.patch.object(filelist.api.status, "update")
+    mocker.patch.object(filelist, "_paths", [])
+    yield mocker.patch.object(filelist, "_load_paths")
+
+
+def images_changed(filelist_paths, new_paths, added, removed=()):
+    """Emulate images_changed of the working directory for filelist_paths."""
+    filelist._paths = filelist_paths
+    filelist.SignalHandler._on_images_changed(None, new_paths, added, list(removed))
+
+
+def loaded(load_paths):
+    return load_paths.call_args[0][0]
+
+
+def test_add_images_to_complete_directory(load_paths):
+    images_changed(paths("a", "c"), paths("a", "b", "c"), paths("b"))
+    assert loaded(load_paths) == paths("a", "b", "c")
+
+
+def test_do_not_add_images_to_subset_of_directory(load_paths):
+    images_changed(paths("a"), paths("a", "b", "c"), paths("b"))
+    assert loaded(load_paths) == paths("a")
+
+
+def test_do_not_add_images_of_other_directory(load_paths):
+    images_changed(["/other/a.jpg"], paths("b"), paths("b"))
+    assert loaded(load_paths) == ["/other/a.jpg"]
+
+
+def test_add_scanned_chunks_with_image_opened_from_later_chunk(load_paths):
+    # The image "y" was opened explicitly while only the first chunk was scanned
+    filelist_paths = paths("y", "a", "b")
+    images_changed(filelist_paths, paths("a", "b", "c", "d"), paths("c", "d"))
+    filelist_paths = loaded(load_paths)
+    assert filelist_paths == paths("a", "b", "c", "d", "y")
+    new_paths = paths("a", "b", "c", "d", "x", "y")
+    images_changed(filelist_paths, new_paths, paths("x", "y"))
+    assert loaded(load_paths) == paths("a", "b", "c", "d", "x", "y")
+
+
+def test_remove_images(load_paths):
+    images_changed(paths("a", "b"), paths("a"), [], paths("b"))
+    assert loaded(load_paths) == paths("a")
+
+
+def test_discard_path(load_paths):
+    filelist._paths = paths("a", "b", "c")
+    filelist.discard(paths("b")[0])
+    assert loaded(load_paths) == paths("a", "c")
+
+
+def test_discard_last_path_clears_filelist(load_paths, mocker):
+    clear = mocker.patch.object(filelist, "_clear")
+    filelist._paths = paths("a")
+    filelist.discard(paths("a")[0])
+    clear.assert_called_once()
+    assert not load_paths.called
@@ -0,0 +1,113 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.imutils.immanipulate."""
+
+from PyQt5.QtGui import QPixmap
+
+import pytest
+
+from vimiv import api
+from vimiv.imutils import immanipulate, _c_manipulate
+
+
+DATA = bytes(range(256)) * 1001
+
+
+@pytest.fixture()
+def bands(mocker):
+    """Fixture to split any data into bands processed by four threads."""
+    mocker.patch.object(immanipulate, "MIN_BANDSIZE", 0)
+    api.settings.manipulate.threads.value = 4
+    yield
+    api.settings.manipulate.threads.set_to_default()
+
+
+@pytest.fixture()
+def manipulator(qtbot, mocker):
+    """Fixture to retrieve a Manipulator in manipulate mode with the pools mocked."""
+    mocker.patch.object(immanipulate.utils, "asyncrun")
+    manipulator = immanipulate.Manipulator(mocker.Mock())
+    manipulator._pixmap = QPixmap(40, 40)
+    manipulator._proxy = QPixmap(10, 10)
+    yield manipulator
+
+
+@pytest.fixture()
+def updated(manipulator, mocker):
+    """Fixture to record the pixmaps displayed by the manipulator."""
+    mock = mocker.Mock()
+    manipulator.updated.connect(mock)
+    yield mock
+
+
+def displayed_widths(updated):
+    return [call[0][0].width() for call in updated.call_args_list]
+
+
+def test_run_in_bands_equals_single_pass(bands):
+    buffer = bytearray(DATA)
+    immanipulate.run_in_bands(
+        _c_manipulate.hue_saturation_lightness_inplace, memoryview(buffer), 30, 0.2, 0.1
+    )
+    assert bytes(buffer) == _c_manipulate.hue_saturation_lightness(DATA, 30, 0.2, 0.1)
+
+
+def test_run_in_bands_raises_exception_of_band(bands):
+    with pytest.raises(ValueError):
+        immanipulate.run_in_bands(
+            _c_manipulate.apply_lut_inplace, memoryview(bytearray(DATA)), bytes(1)
+        )
+
+
+def test_display_proxy_and_refined_preview(manipulator, updated):
+    manipulator._generation = 1
+    manipulator._on_computed(1, False, QPixmap(10, 10))
+    manipulator._on_computed(1, True, QPixmap(40, 40))
+    assert displayed_widths(updated) == [10, 40]
+
+
+def test_proxy_does_not_replace_refined_preview(manipulator, updated):
+    manipulator._generation = 1
+    manipulator._on_computed(1, True, QPixmap(40, 40))
+    manipulator._on_computed(1, False, QPixmap(10, 10))
+    assert displayed_widths(updated) == [40]
+
+
+def test_outdated_previews_are_ignored(manipulator, updated):
+    manipulator._generation = 2
+    manipulator._on_computed(1, False, QPixmap(10, 10))
+    manipulator._on_computed(1, True, QPixmap(40, 40))
+    updated.assert_not_called()
+
+
+def test_save_changes_uses_refined_preview(manipulator):
+    manipulation = manipulator.manipulations[0]
+    manipulation.value = 10
+    manipulator._on_computed(manipulator._generation, True, QPixmap(30, 30))
+    immanipulate.utils.asyncrun.reset_mock()
+    manipulator._save_changes()
+    assert manipulator._pixmap.width() == 30
+    assert not manipulation.changed
+    (change,) = manipulator._changes
+    assert change.manipulations.manipulations[0].value == 10
+    (call,) = immanipulate.utils.asyncrun.call_args_list
+    assert call[1]["pool"] is manipulator.proxy_pool  # Only the proxy is rebased
+
+
+def test_save_changes_rebases_outdated_preview_in_background(manipulator):
+    manipulator.manipulations[0].value = 10
+    immanipulate.utils.asyncrun.reset_mock()
+    manipulator._save_changes()
+    assert manipulator._pixmap.width() == 40
+    pools = [call[1]["pool"] for call in immanipulate.utils.asyncrun.call_args_list]
+    assert pools == [manipulator.pool, manipulator.proxy_pool]
+
+
+def test_save_unchanged_does_nothing(manipulator):
+    manipulator._save_changes()
+    assert not manipulator._changes
+    immanipulate.utils.asyncrun.assert_not_called()
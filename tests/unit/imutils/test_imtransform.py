@@ -8,6 +8,7 @@
 
 import functools
 
+from PyQt5.QtCore import QSize
 from PyQt5.QtGui import QPixmap
 
 import pytest
@@ -51,3 +52,17 @@ def test_change_and_reset(action, transform):
 def test_rotate_angle(transform, angle):
     transform.rotate(angle)
     assert transform.angle == pytest.approx(angle)
+
+
+def test_transform_preview_uses_full_resolution(qtbot):
+    """Ensure transforming a preview loads and transforms the full resolution."""
+    current_pm = current_pixmap.CurrentPixmap()
+    transform = imtransform.Transform(current_pm)
+    current_pm.set_preview(QPixmap(30, 20), lambda: QPixmap(300, 200))
+    transform.original = None
+    assert current_pm.is_preview
+    transform.rotate(90)
+    with qtbot.waitSignal(transform.transformed) as blocker:
+        transform.apply()
+    assert not current_pm.is_preview
+    assert blocker.args[0].size() == QSize(200, 300)
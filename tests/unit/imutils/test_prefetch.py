@@ -0,0 +1,117 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.imutils._prefetch and the neighbours of the filelist."""
+
+from PyQt5.QtGui import QImage
+
+import pytest
+
+from vimiv import api
+from vimiv.imutils import _prefetch, filelist
+
+
+@pytest.fixture()
+def paths(mocker):
+    """Fixture to load a filelist of ten dummy paths with the first path selected."""
+    paths = [f"image_{i}.png" for i in range(10)]
+    mocker.patch.object(filelist, "_paths", paths)
+    mocker.patch.object(filelist, "_index", 0)
+    yield paths
+
+
+@pytest.fixture()
+def images(tmp_path, mocker):
+    """Fixture to load a filelist of five 10x10 images with the first one selected."""
+    paths = []
+    for i in range(5):
+        path = str(tmp_path / f"image_{i}.png")
+        image = QImage(10, 10, QImage.Format_RGB32)
+        image.fill(0)
+        image.save(path)
+        paths.append(path)
+    mocker.patch.object(filelist, "_paths", paths)
+    mocker.patch.object(filelist, "_index", 0)
+    yield paths
+
+
+@pytest.fixture()
+def cache():
+    """Fixture to provide an empty prefetch cache restored after the test."""
+    maxsize = _prefetch.cache.maxsize
+    _prefetch.cache.clear()
+    yield _prefetch.cache
+    _prefetch.cache.clear()
+    _prefetch.cache.maxsize = maxsize
+
+
+@pytest.fixture()
+def prefetcher(qtbot, mocker, cache):
+    """Fixture to retrieve a Prefetcher which decodes synchronously."""
+    mocker.patch.object(
+        _prefetch.utils,
+        "asyncrun",
+        side_effect=lambda func, *args, pool: func(*args),
+    )
+    yield _prefetch.Prefetcher()
+    api.settings.image.prefetch.set_to_default()
+
+
+def prefetch(prefetcher, path):
+    """Emit new_image_opened for path to the prefetcher."""
+    prefetcher._on_new_image_opened(path, False)
+
+
+def test_neighbours_ordered_by_distance(paths):
+    filelist._index = 4
+    assert filelist.neighbours(2) == [paths[5], paths[3], paths[6], paths[2]]
+
+
+def test_neighbours_wrap_around(paths):
+    assert filelist.neighbours(2) == [paths[1], paths[9], paths[2], paths[8]]
+
+
+@pytest.mark.parametrize("count", (0, 1, 3))
+def test_neighbours_count(paths, count):
+    assert len(filelist.neighbours(count)) == 2 * count
+
+
+def test_neighbours_not_duplicated_in_short_filelist(paths, mocker):
+    mocker.patch.object(filelist, "_paths", paths[:3])
+    assert filelist.neighbours(5) == [paths[1], paths[2]]
+
+
+def test_prefetch_number_of_neighbours(prefetcher, images, mocker):
+    api.settings.image.prefetch.value = 2
+    read_image = mocker.spy(_prefetch, "read_image")
+    prefetch(prefetcher, images[0])
+    read = {call[0][0].path for call in read_image.call_args_list}
+    assert read == {images[1], images[4], images[2], images[3]}
+
+
+def test_prefetch_neighbours_into_cache(prefetcher, images):
+    prefetch(prefetcher, images[0])
+    assert _prefetch.is_cached(images[1])
+    assert _prefetch.is_cached(images[4])
+    assert not _prefetch.is_cached(images[2])
+
+
+def test_prefetch_does_not_reread_cached_images(prefetcher, images, mocker):
+    prefetch(prefetcher, images[0])
+    read_image = mocker.spy(_prefetch, "read_image")
+    filelist._index = 2
+    prefetch(prefetcher, images[2])
+    read = [call[0][0].path for call in read_image.call_args_list]
+    assert read == [images[3]]
+
+
+def test_prefetch_honours_cache_size(prefetcher, images, cache):
+    image_size = QImage(images[0]).byteCount()
+    cache.maxsize = image_size
+    prefetch(prefetcher, images[0])
+    assert cache.size <= cache.maxsize
+    assert len(cache) == 1
+    assert _prefetch.is_cached(images[4])  # The last neighbour is kept
@@ -60,6 +60,17 @@ def test_fail_existing_file(mocker):
         parser.existing_file("any")
 
 
+def test_existing_directory(mocker):
+    mocker.patch("os.path.isdir", return_value=True)
+    assert os.path.abspath("any") == parser.existing_directory("any")
+
+
+def test_fail_existing_directory(mocker):
+    mocker.patch("os.path.isdir", return_value=False)
+    with pytest.raises(argparse.ArgumentTypeError, match="No directory called"):
+        parser.existing_directory("any")
+
+
 def test_existing_path(mocker):
     mocker.patch("os.path.exists", return_value=True)
     assert os.path.abspath("any") == parser.existing_path("any")
@@ -8,6 +8,8 @@
 
 import re
 
+import pytest
+
 from vimiv.utils import debug
 
 
@@ -33,3 +35,16 @@ def test_timed(mocker, capsys):
     # Ensure the message contains the elapsed time
     time_match = re.search(r"\d+.\d+", captured.out)
     assert time_match is not None, "No time logged"
+
+
+def test_time_counter(mocker):
+    mocker.patch("time.perf_counter", side_effect=(1.0, 1.5, 2.0, 3.5))
+    counter = debug.TimeCounter()
+    for _ in range(2):
+        with counter:
+            pass
+    assert counter.count == 2
+    assert counter.seconds == pytest.approx(2.0)
+    assert counter.mean == pytest.approx(1.0)
+    counter.reset()
+    assert counter.count == 0 and counter.mean == 0
@@ -0,0 +1,134 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.utils.directory_index."""
+
+import os
+
+import pytest
+
+from vimiv.utils import directory_index
+
+
+@pytest.fixture(autouse=True)
+def index(tmp_path):
+    """Fixture to enable the directory index using a temporary database."""
+    directory_index.init(str(tmp_path / "cache" / "directories.sqlite"))
+    yield
+    directory_index.close()
+
+
+@pytest.fixture()
+def directory(tmp_path):
+    """Fixture to create a directory with two images and one subdirectory.
+
+    The modification time of the directory is set to the past so it can be indexed.
+    """
+    directory = tmp_path / "directory"
+    (directory / "sub").mkdir(parents=True)
+    for name in ("image_0.jpg", "image_1.jpg"):
+        (directory / name).write_bytes(b"\xff\xd8" + b"0" * 100)
+    (directory / "text.txt").write_text("not an image")
+    os.utime(str(directory), (0, 1000))
+    yield directory
+
+
+def put(directory, show_hidden=False, by_extension=False):
+    images = [str(directory / name) for name in ("image_0.jpg", "image_1.jpg")]
+    directory_index.put(
+        str(directory), images, [str(directory / "sub")], show_hidden, by_extension
+    )
+
+
+def test_get_stored_content(directory):
+    put(directory)
+    images, directories = directory_index.get(str(directory), False, False)
+    assert images == [str(directory / "image_0.jpg"), str(directory / "image_1.jpg")]
+    assert directories == [str(directory / "sub")]
+
+
+def test_get_unknown_directory(directory):
+    assert directory_index.get(str(directory), False, False) is None
+
+
+@pytest.mark.parametrize("show_hidden, by_extension", [(True, False), (False, True)])
+def test_do_not_get_content_stored_with_other_options(
+    directory, show_hidden, by_extension
+):
+    put(directory)
+    assert directory_index.get(str(directory), show_hidden, by_extension) is None
+
+
+def test_do_not_get_modified_directory(directory):
+    put(directory)
+    os.utime(str(directory), (0, 2000))
+    assert directory_index.get(str(directory), False, False) is None
+
+
+def test_do_not_store_recently_modified_directory(directory):
+    os.utime(str(directory))
+    put(directory)
+    assert directory_index.get(str(directory), False, False) is None
+
+
+def test_stored_sizes(directory):
+    put(directory)
+    assert directory_index.file_size(str(directory / "image_0.jpg")) == 102
+    assert directory_index.n_entries(str(directory)) == 4
+
+
+def test_disabled_index_is_noop(directory):
+    directory_index.close()
+    put(directory)
+    assert directory_index.get(str(directory), False, False) is None
+    assert directory_index.file_size(str(directory / "image_0.jpg")) is None
+
+
+def test_sizes_of_other_directories_are_kept(directory, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    os.utime(str(other), (0, 1000))
+    put(directory)
+    directory_index.put(str(other), [], [], False, False)
+    directory_index.get(str(other), False, False)
+    assert directory_index.file_size(str(directory / "image_0.jpg")) == 102
+
+
+def test_do_not_use_sizes_of_modified_directory(directory):
+    put(directory)
+    os.utime(str(directory), (0, 2000))
+    assert directory_index.file_size(str(directory / "image_0.jpg")) is None
+
+
+def test_do_not_use_sizes_when_skipping_recently_modified_directory(directory):
+    put(directory)
+    os.utime(str(directory))
+    put(directory)
+    os.utime(str(directory), (0, 1000))
+    assert directory_index.file_size(str(directory / "image_0.jpg")) is None
+
+
+def test_discard_size_of_changed_image(directory):
+    put(directory)
+    directory_index.discard(str(directory / "image_0.jpg"))
+    assert directory_index.file_size(str(directory / "image_0.jpg")) is None
+    assert directory_index.file_size(str(directory / "image_1.jpg")) == 102
+
+
+def test_do_not_use_size_of_image_rewritten_in_place(directory):
+    put(directory)
+    image = directory / "image_0.jpg"
+    image.write_bytes(b"\xff\xd8")
+    os.utime(str(image), (0, 2000))
+    assert directory_index.file_size(str(image)) is None
+
+
+def test_use_indexed_sizes_of_unmodified_images(directory):
+    put(directory)
+    directory_index.close()
+    directory_index.init(str(directory.parent / "cache" / "directories.sqlite"))
+    directory_index.get(str(directory), False, False)
+    assert directory_index.file_size(str(directory / "image_0.jpg")) == 102
@@ -11,7 +11,7 @@ import imghdr
 import os
 import tarfile
 
-from PyQt5.QtGui import QImageReader
+from PyQt5.QtGui import QImage, QImageReader
 
 import pytest
 
@@ -122,6 +122,91 @@ def test_images_supported(mocker):
     assert not directories
 
 
+@pytest.mark.parametrize("show_hidden", (True, False))
+def test_scan(tmp_path, show_hidden):
+    for name in ("image.png", ".hidden.png"):
+        QImage(16, 16, QImage.Format_RGB32).save(str(tmp_path / name))
+    for name in ("directory", ".hidden"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "text.txt").write_text("not an image")
+    (images, directories), *remaining = files.scan(str(tmp_path), show_hidden)
+    expected_images = ["image.png"] + ([".hidden.png"] if show_hidden else [])
+    expected_directories = ["directory"] + ([".hidden"] if show_hidden else [])
+    assert images == sorted(str(tmp_path / name) for name in expected_images)
+    assert directories == sorted(str(tmp_path / name) for name in expected_directories)
+    assert not remaining
+
+
+def test_scan_records_rejected_files(tmp_path):
+    QImage(16, 16, QImage.Format_RGB32).save(str(tmp_path / "image.png"))
+    (tmp_path / "text.txt").write_text("not an image")
+    (tmp_path / "directory").mkdir()
+    rejected = {}
+    list(files.scan(str(tmp_path), rejected=rejected))
+    stat = os.stat(str(tmp_path / "text.txt"))
+    assert rejected == {"text.txt": (stat.st_ino, stat.st_size, stat.st_mtime_ns)}
+
+
+@pytest.mark.parametrize("n_paths, n_chunks", [(0, 1), (2, 2), (5, 2), (6, 3)])
+def test_scan_in_chunks(tmp_path, n_paths, n_chunks):
+    for i in range(n_paths):
+        (tmp_path / f"directory_{i}").mkdir()
+    chunks = list(files.scan(str(tmp_path), chunksize=2))
+    assert len(chunks) == n_chunks
+    assert sorted(path for _, directories in chunks for path in directories) == sorted(
+        str(tmp_path / f"directory_{i}") for i in range(n_paths)
+    )
+
+
+@pytest.fixture()
+def image_extensions(mocker):
+    """Fixture to mock the image formats supported by QImageReader."""
+    formats = [b"jpeg", b"jpg", b"png", b"tiff"]
+    mime_types = [b"image/jpeg", b"image/png", b"image/tiff"]
+    mocker.patch.object(QImageReader, "supportedImageFormats", return_value=formats)
+    mocker.patch.object(QImageReader, "supportedMimeTypes", return_value=mime_types)
+    files.image_extensions.cache_clear()
+    yield
+    files.image_extensions.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("image.jpg", True),
+        ("image.JPEG", True),
+        ("image.jpe", True),
+        ("image.tif", True),
+        ("a.txt", False),
+    ],
+)
+def test_has_image_extension(image_extensions, tmp_path, name, expected):
+    path = tmp_path / name
+    path.write_text("not read")
+    assert files.has_image_extension(str(path)) == expected
+
+
+@pytest.mark.parametrize("name", ("image.heif", "image.heic"))
+def test_has_image_extension_of_external_format(image_extensions, mocker, name):
+    mocker.patch.dict(files.imagereader.external_handler, {"heif": lambda path: None})
+    assert files.has_image_extension(name)
+
+
+def test_has_image_extension_reads_file_without_extension(image_extensions, tmp_path):
+    image, text = tmp_path / "image", tmp_path / "text"
+    QImage(16, 16, QImage.Format_RGB32).save(str(image), "png")
+    text.write_text("not an image")
+    assert files.has_image_extension(str(image))
+    assert not files.has_image_extension(str(text))
+
+
+def test_scan_by_extension(image_extensions, tmp_path):
+    (tmp_path / "image.jpg").write_text("not read")
+    (tmp_path / "text.txt").write_bytes(b"\xff\xd8 would be detected as jpg")
+    (images, _), *_ = files.scan(str(tmp_path), by_extension=True)
+    assert images == [str(tmp_path / "image.jpg")]
+
+
 def test_tar_gz_not_an_image(tmp_path):
     """Test if is_image for a tar.gz returns False.
 
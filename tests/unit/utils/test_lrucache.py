@@ -0,0 +1,89 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Tests for vimiv.utils.lrucache."""
+
+import pytest
+
+from vimiv.utils import lrucache
+
+
+@pytest.fixture
+def cache():
+    """Fixture to retrieve a cache which stores strings with their length as size."""
+    yield lrucache.LRUCache(maxsize=10, sizefunc=len)
+
+
+def test_put_and_get(cache):
+    cache.put("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.size == len("value")
+
+
+def test_get_missing(cache):
+    assert cache.get("key") is None
+
+
+def test_statistics(cache):
+    cache.put("key", "value")
+    cache.get("key")
+    cache.get("other")
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == pytest.approx(0.5)
+
+
+def test_contains_does_not_update_statistics(cache):
+    cache.put("key", "value")
+    assert "key" in cache
+    assert cache.hits == cache.misses == 0
+
+
+def test_evict_least_recently_used(cache):
+    cache.put("first", "aaaa")
+    cache.put("second", "bbbb")
+    cache.get("first")  # Second is now least recently used
+    cache.put("third", "cccc")
+    assert "first" in cache
+    assert "second" not in cache
+    assert "third" in cache
+    assert cache.size == 8
+
+
+def test_do_not_store_too_large_value(cache):
+    cache.put("key", "a" * (cache.maxsize + 1))
+    assert "key" not in cache
+    assert cache.size == 0
+
+
+def test_replace_value_updates_size(cache):
+    cache.put("key", "aaaa")
+    cache.put("key", "aa")
+    assert len(cache) == 1
+    assert cache.size == 2
+
+
+def test_reduce_maxsize_evicts(cache):
+    cache.put("first", "aaaa")
+    cache.put("second", "bbbb")
+    cache.maxsize = 5
+    assert "first" not in cache
+    assert "second" in cache
+
+
+def test_pop(cache):
+    cache.put("key", "value")
+    cache.pop("key")
+    assert "key" not in cache
+    assert cache.size == 0
+
+
+def test_clear(cache):
+    cache.put("key", "value")
+    cache.get("key")
+    cache.clear()
+    assert not cache
+    assert cache.size == cache.hits == cache.misses == 0
@@ -7,10 +7,11 @@
 import hashlib
 import os
 
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QImage, QPixmap
 
 import pytest
 
+from vimiv import api
 from vimiv.utils import thumbnail_manager
 
 
@@ -22,6 +23,7 @@ def manager(qtbot, tmp_path, mocker):
     mocker.patch("vimiv.utils.xdg.user_cache_dir", return_value=str(tmp_cache_dir))
     # Create thumbnail manager and yield the instance
     yield thumbnail_manager.ThumbnailManager(None)
+    thumbnail_manager.cache.clear()
 
 
 @pytest.mark.parametrize("n_paths", (1, 5))
@@ -34,6 +36,176 @@ def test_create_n_thumbnails(qtbot, tmp_path, manager, n_paths):
     check_thumbails_created(qtbot, manager, n_paths)
 
 
+def test_create_thumbnail_from_memory_cache(qtbot, tmp_path, manager):
+    filename = str(tmp_path / "image.jpg")
+    QPixmap(300, 300).save(filename, "jpg")
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+    for thumbnail in os.listdir(manager.directory):
+        os.remove(os.path.join(manager.directory, thumbnail))
+    with qtbot.waitSignal(manager.created):
+        manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 0)  # Disk cache was not accessed
+
+
+@pytest.mark.parametrize(
+    "size, tier", [(64, "normal"), (128, "normal"), (200, "large"), (2048, "xx-large")]
+)
+def test_select_tier(manager, size, tier):
+    manager.set_size(size)
+    assert os.path.basename(manager.directory) == tier
+
+
+def test_downscale_thumbnail_from_larger_tier(qtbot, tmp_path, manager, mocker):
+    filename = str(tmp_path / "image.jpg")
+    QPixmap(600, 600).save(filename, "jpg")
+    manager.set_size(512)
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+    mocker.patch.object(
+        thumbnail_manager.ThumbnailCreator, "_read_image", side_effect=ValueError
+    )
+    assert manager.set_size(128)
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+    thumbnail = os.path.join(manager.directory, os.listdir(manager.directory)[0])
+    assert QPixmap(thumbnail).width() == 128
+
+
+def test_create_thumbnails_in_processes(qtbot, tmp_path, manager):
+    filenames = [str(tmp_path / f"image_{i}.jpg") for i in range(3)]
+    for filename in filenames:
+        QPixmap(300, 300).save(filename, "jpg")
+    api.settings.thumbnail.processes.value = 2
+    try:
+        assert manager.pool.maxThreadCount() == 2
+        manager.create_thumbnails_async(filenames)
+        check_thumbails_created(qtbot, manager, 3)
+    finally:
+        api.settings.thumbnail.processes.set_to_default()
+
+
+def test_create_thumbnail_ignored_by_process_in_thread(
+    qtbot, tmp_path, manager, mocker
+):
+    filename = str(tmp_path / "image.jpg")
+    QPixmap(300, 300).save(filename, "jpg")
+    mocker.patch.object(
+        manager, "generate_in_process", return_value=thumbnail_manager.IGNORED
+    )
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+
+
+def test_generate_thumbnails(tmp_path, manager):
+    directory = tmp_path / "images"
+    (directory / "sub").mkdir(parents=True)
+    for filename in ("image.jpg", "sub/image.jpg", ".hidden.jpg"):
+        QImage(300, 300, QImage.Format_RGB32).save(str(directory / filename))
+    (directory / "text.txt").write_text("not an image")
+    result = thumbnail_manager.generate(str(directory), recursive=True, jobs=2)
+    assert result[:4] == (2, 0, 0, 1)
+    result = thumbnail_manager.generate(str(directory), recursive=True, jobs=2)
+    assert result[:4] == (0, 2, 0, 1)
+    result = thumbnail_manager.generate(str(tmp_path), recursive=True, jobs=2)
+    assert result[:3] == (0, 2, 0)  # Thumbnails themselves are ignored
+
+
+@pytest.mark.parametrize("ignored, reported", [(0, False), (2, True)])
+def test_generation_result_reports_ignored_files(ignored, reported):
+    result = thumbnail_manager.GenerationResult(1, 2, 0, ignored, 1.0)
+    assert str(result).startswith("Processed 3 images")
+    assert ("Ignored 2 files" in str(result)) == reported
+
+
+def test_record_failed_thumbnail(qtbot, tmp_path, manager, mocker):
+    filename = str(tmp_path / "image.jpg")
+    (tmp_path / "image.jpg").write_bytes(b"\xff\xd8 corrupt")
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 0)
+    assert len(os.listdir(manager.fail_directory)) == 1
+    read_image = mocker.patch.object(thumbnail_manager.ThumbnailCreator, "_read_image")
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 0)
+    read_image.assert_not_called()
+
+
+def test_retry_failed_thumbnail_if_modified(qtbot, tmp_path, manager):
+    filename = str(tmp_path / "image.jpg")
+    (tmp_path / "image.jpg").write_bytes(b"\xff\xd8 corrupt")
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 0)
+    QPixmap(300, 300).save(filename, "jpg")
+    os.utime(filename, (0, os.path.getmtime(filename) + 10))
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+    assert not os.listdir(manager.fail_directory)
+
+
+@pytest.mark.parametrize("retry, n_remaining", [(False, 1), (True, 0)])
+def test_clean_failed_thumbnails(qtbot, tmp_path, manager, retry, n_remaining):
+    filenames = [str(tmp_path / f"image_{i}.jpg") for i in range(2)]
+    for filename in filenames:
+        with open(filename, "wb") as f:
+            f.write(b"\xff\xd8 corrupt")
+    manager.create_thumbnails_async(filenames)
+    check_thumbails_created(qtbot, manager, 0)
+    os.remove(filenames[0])
+    assert thumbnail_manager.clean_failed(retry=retry) == 2 - n_remaining
+    assert len(os.listdir(manager.fail_directory)) == n_remaining
+
+
+@pytest.mark.parametrize(
+    "value", ("file:///home/user/image.jpg", "file:///home/üser/画像.jpg", "x" * 2000)
+)
+def test_read_png_text(tmp_path, value):
+    filename = str(tmp_path / "thumbnail.png")
+    image = QImage(16, 16, QImage.Format_ARGB32)
+    image.setText("Thumb::URI", value)
+    image.setText("Thumb::MTime", "42")
+    image.save(filename)
+    text = thumbnail_manager.read_png_text(filename, ("Thumb::URI", "Thumb::MTime"))
+    assert text == {"Thumb::URI": value, "Thumb::MTime": "42"}
+
+
+@pytest.mark.parametrize("content", (None, b"", b"not a png"))
+def test_read_png_text_invalid_file(tmp_path, content):
+    filename = tmp_path / "thumbnail.png"
+    if content is not None:
+        filename.write_bytes(content)
+    assert thumbnail_manager.read_png_text(str(filename), ("Thumb::URI",)) == {}
+
+
+def test_clean_removes_thumbnails_of_deleted_images(qtbot, tmp_path, manager):
+    filenames = [str(tmp_path / f"image_{i}.jpg") for i in range(2)]
+    for filename in filenames:
+        QPixmap(300, 300).save(filename, "jpg")
+    manager.create_thumbnails_async(filenames)
+    check_thumbails_created(qtbot, manager, 2)
+    os.remove(filenames[0])
+    result = thumbnail_manager.clean()
+    assert result.removed == 1
+    (thumbnail,) = os.listdir(manager.directory)
+    uri = QImage(os.path.join(manager.directory, thumbnail)).text("Thumb::URI")
+    assert uri == "file://" + filenames[1]
+
+
+def test_clean_evicts_least_recently_used(qtbot, tmp_path, manager):
+    filenames = [str(tmp_path / f"image_{i}.jpg") for i in range(3)]
+    for filename in filenames:
+        QPixmap(300, 300).save(filename, "jpg")
+    manager.create_thumbnails_async(filenames)
+    check_thumbails_created(qtbot, manager, 3)
+    thumbnails = [thumbnail_path(manager, filename) for filename in filenames]
+    for atime, thumbnail in zip((300, 100, 200), thumbnails):
+        os.utime(thumbnail, (atime, os.path.getmtime(thumbnail)))
+    budget = sum(os.path.getsize(thumbnail) for thumbnail in thumbnails[::2])
+    result = thumbnail_manager.clean(budget)
+    assert result.removed == 1
+    assert result.size == budget
+    assert not os.path.exists(thumbnails[1])
+
+
 def test_create_thumbnails_for_non_existing_path(qtbot, manager):
     manager.create_thumbnails_async(["this/is/not/a/path"])
     check_thumbails_created(qtbot, manager, 0)
@@ -54,9 +226,74 @@ def test_do_not_create_thumbnail_for_thumbnail(qtbot, manager):
     check_thumbails_created(qtbot, manager, 1)
 
 
+def test_clearing_pool_does_not_drop_creators(qtbot, tmp_path, manager):
+    filenames = [str(tmp_path / f"image_{i}.jpg") for i in range(5)]
+    for filename in filenames:
+        QPixmap(300, 300).save(filename, "jpg")
+    manager.pool.setMaxThreadCount(1)
+    try:
+        manager.create_thumbnails_async(filenames)
+        manager.pool.clear()
+        check_thumbails_created(qtbot, manager, 5)
+    finally:
+        manager.pool.setMaxThreadCount(thumbnail_manager.QThread.idealThreadCount())
+
+
+def thumbnail_path(manager, filename):
+    md5 = hashlib.md5(f"file://{filename}".encode()).hexdigest()
+    return os.path.join(manager.directory, md5 + ".png")
+
+
 def check_thumbails_created(qtbot, manager, n_paths):
     def wait_thread():
         assert manager.pool.activeThreadCount() == 0
 
     qtbot.waitUntil(wait_thread, timeout=30000)
     assert len(os.listdir(manager.directory)) == n_paths
+
+
+@pytest.fixture
+def queue():
+    """Fixture to create a thumbnail queue with ten paths."""
+    queue = thumbnail_manager.ThumbnailQueue()
+    queue.reset([f"image_{i}.jpg" for i in range(10)])
+    yield queue
+
+
+def pop_all(queue):
+    indices = []
+    while True:
+        item = queue.pop()
+        if item is None:
+            return indices
+        indices.append(item[0])
+
+
+def test_queue_pops_in_order(queue):
+    assert pop_all(queue) == list(range(10))
+
+
+def test_queue_pops_visible_then_closest_to_current(queue):
+    queue.prioritize(visible=[6, 7], current=4)
+    assert pop_all(queue) == [6, 7, 4, 5, 3, 2, 1, 8, 0, 9]
+
+
+def test_queue_reprioritize_skips_popped(queue):
+    queue.pop()
+    queue.prioritize(visible=[0, 1], current=9)
+    assert pop_all(queue) == [1, 9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def test_queue_reset_cancels_pending(queue):
+    generation = queue.generation
+    queue.pop()
+    queue.reset(["other.jpg"])
+    assert queue.generation == generation + 1
+    assert pop_all(queue) == [0]
+
+
+def test_queue_push_with_top_priority(queue):
+    queue.pop()
+    index, _ = queue.pop()
+    queue.push(index)
+    assert pop_all(queue) == list(range(1, 10))
@@ -191,6 +191,14 @@ def test_flatten():
     assert utils.flatten(list_of_lists) == [1, 2, 3, 4]
 
 
+@pytest.mark.parametrize(
+    "rows, expected",
+    [([], []), ([3], [(3, 3)]), ([0, 1, 2, 5, 7, 8], [(0, 2), (5, 5), (7, 8)])],
+)
+def test_blocks(rows, expected):
+    assert utils.blocks(rows) == expected
+
+
 def test_recursive_split():
     def updater(text):
         """Return a text containing two numbers decremented by one, break at 0.
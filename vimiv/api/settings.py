@@ -386,6 +386,38 @@ class image:  # pylint: disable=invalid-name
         suggestions=["1.0", "1.5", "2.0", "5.0"],
         min_value=1.0,
     )
+    prefetch = IntSetting(
+        "image.prefetch",
+        1,
+        desc="Number of images before and after the current image to load in advance",
+        min_value=0,
+        max_value=10,
+    )
+    cache_size = IntSetting(
+        "image.cache_size",
+        512,
+        desc="Maximum memory (in MiB) used to cache decoded images",
+        suggestions=["0", "256", "512", "1024", "2048"],
+        min_value=0,
+    )
+    tiling_threshold = IntSetting(
+        "image.tiling_threshold",
+        0,
+        desc="Minimum size in megapixels of images that are displayed in tiles which "
+        "are decoded on demand and cannot be edited or printed, 0 disables tiling",
+        min_value=0,
+    )
+    display_resolution = BoolSetting(
+        "image.display_resolution",
+        False,
+        desc="Decode large images at screen resolution and load the full resolution "
+        "only when zooming in or editing",
+    )
+    embedded_preview = BoolSetting(
+        "image.embedded_preview",
+        False,
+        desc="Display the preview embedded in the exif data while decoding the image",
+    )
 
 
 class library:  # pylint: disable=invalid-name
@@ -402,12 +434,66 @@ class library:  # pylint: disable=invalid-name
     show_hidden = BoolSetting(
         "library.show_hidden", False, desc="Show hidden files in the library"
     )
+    detect_by_extension = BoolSetting(
+        "library.detect_by_extension",
+        False,
+        desc="Detect images in directories by their file extension instead of reading "
+        "the header of every file",
+    )
+    directory_index = BoolSetting(
+        "library.directory_index",
+        False,
+        desc="Store the content of directories on disk and only scan directories again "
+        "once they were modified",
+    )
 
 
 class thumbnail:  # pylint: disable=invalid-name
     """Namespace for thumbnail related settings."""
 
     size = ThumbnailSizeSetting("thumbnail.size", 128, desc="Size of thumbnails")
+    cache_size = IntSetting(
+        "thumbnail.cache_size",
+        64,
+        desc="Maximum memory (in MiB) used to cache decoded thumbnails",
+        suggestions=["0", "32", "64", "128", "256"],
+        min_value=0,
+    )
+    disk_cache_size = IntSetting(
+        "thumbnail.disk_cache_size",
+        0,
+        desc="Maximum disk space (in MiB) used by thumbnails, least recently used "
+        "thumbnails are removed once exceeded, 0 for unlimited",
+        suggestions=["0", "256", "512", "1024"],
+        min_value=0,
+    )
+    embedded_preview = BoolSetting(
+        "thumbnail.embedded_preview",
+        False,
+        desc="Create thumbnails from the preview embedded in the exif data if it is "
+        "large enough instead of decoding the full image",
+    )
+    processes = IntSetting(
+        "thumbnail.processes",
+        0,
+        desc="Number of processes used to create thumbnails, 0 to create them in "
+        "threads of the main process",
+        suggestions=["0", "2", "4", "8"],
+        min_value=0,
+    )
+
+
+class manipulate:  # pylint: disable=invalid-name
+    """Namespace for manipulate related settings."""
+
+    threads = IntSetting(
+        "manipulate.threads",
+        0,
+        desc="Number of threads used to apply manipulations, 0 to use one thread per "
+        "core",
+        suggestions=["0", "1", "2", "4", "8"],
+        min_value=0,
+    )
 
 
 class slideshow:  # pylint: disable=invalid-name
@@ -6,7 +6,7 @@
 
 """Namespace for signals exposed via the api."""
 
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QSize, pyqtSignal
 from PyQt5.QtGui import QPixmap, QMovie
 
 
@@ -35,6 +35,20 @@ class _SignalHandler(QObject):
         svg_loaded: Emitted when the file handler loaded a new vector graphic.
             arg1: The path as the VectorGraphic class is constructed directly.
             arg2: True if it is only reloaded.
+        tiled_image_loaded: Emitted when the file handler loaded a new huge image which
+                is displayed in tiles.
+            arg1: The path as the tiles are decoded on demand.
+            arg2: QSize of the image.
+            arg3: True if it is only reloaded.
+        pixmap_preview_loaded: Emitted when the file handler loaded a reduced-size
+                preview of a new pixmap.
+            arg1: The QPixmap preview loaded.
+            arg2: QSize of the full resolution image.
+            arg3: True if it is only reloaded.
+        pixmap_updated: Emitted when the full resolution of a preview was loaded.
+            arg1: The full resolution QPixmap.
+
+        load_full_resolution: Emitted when the full resolution of a preview is needed.
     """
 
     # Emitted when new images should be loaded
@@ -52,6 +66,12 @@ class _SignalHandler(QObject):
     pixmap_loaded = pyqtSignal(QPixmap, bool)
     movie_loaded = pyqtSignal(QMovie, bool)
     svg_loaded = pyqtSignal(str, bool)
+    tiled_image_loaded = pyqtSignal(str, QSize, bool)
+    pixmap_preview_loaded = pyqtSignal(QPixmap, QSize, bool)
+    pixmap_updated = pyqtSignal(QPixmap)
+
+    # Emitted when the full resolution of the current preview should be loaded
+    load_full_resolution = pyqtSignal()
 
 
 _signal_handler = _SignalHandler()  # Instance of Qt signal handler to work with
@@ -65,3 +85,7 @@ image_changed = _signal_handler.image_changed
 pixmap_loaded = _signal_handler.pixmap_loaded
 movie_loaded = _signal_handler.movie_loaded
 svg_loaded = _signal_handler.svg_loaded
+tiled_image_loaded = _signal_handler.tiled_image_loaded
+pixmap_preview_loaded = _signal_handler.pixmap_preview_loaded
+pixmap_updated = _signal_handler.pixmap_updated
+load_full_resolution = _signal_handler.load_full_resolution
@@ -54,17 +54,26 @@ connect to these signals::
             print("Added images:", *added, sep="\n", end="\n\n")
             print("Removed images:", *removed, sep="\n", end="\n\n")
 
+Huge directories are scanned in chunks. The ``loaded`` signal is emitted once the first
+chunk was scanned, the remaining chunks are scanned in a background thread and added
+using the ``changed`` and ``images_changed`` signals. Changes of the directory are
+computed incrementally by comparing the entries with the known content. Only new files
+are checked for being an image. If the ``library.directory_index`` setting is enabled,
+the content of unmodified directories is taken from the
+:mod:`vimiv.utils.directory_index` instead of scanning them again.
+
 Module Attributes:
     handler: The initialized :class:`WorkingDirectoryHandler` object to interact with.
 """
 
+import heapq
 import os
-from typing import cast, List, Tuple
+from typing import cast, Dict, Iterator, List, Optional, Tuple
 
 from PyQt5.QtCore import pyqtSignal, QFileSystemWatcher
 
 from vimiv.api import settings, signals, status
-from vimiv.utils import files, slot, log, throttled
+from vimiv.utils import files, slot, log, throttled, asyncrun, Pool, directory_index
 
 
 _logger = log.module_logger(__name__)
@@ -86,29 +95,51 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
             arg1: List of images in the working directory.
             arg2: List of images added within the change.
             arg3: List of images removed within the change.
+        _scanned: Emitted by the background thread when a chunk was scanned.
+            arg1: Number of the scan the chunk belongs to.
+            arg2: List of images in the chunk.
+            arg3: List of directories in the chunk.
+            arg4: True if the scan has finished.
 
     Class Attributes:
+        CHUNK_SIZE: Number of entries scanned before the content is first displayed.
         WAIT_TIME_MS: Time in milliseconds to wait before emitting *_changed signals.
 
     Attributes:
         _dir: The current working directory.
         _images: Images in the current working directory.
         _directories: Directories in the current working directory.
+        _rejected: Dictionary mapping the names of files that are no image to their
+            inode, size and modification time when they were checked.
+        _reload_pending: True if the directory changed while it is being scanned.
+        _scan_id: Number of the current scan, incremented to stop any running scan.
+        _scanning: True while the remaining chunks of the directory are scanned.
     """
 
     loaded = pyqtSignal(list, list)
     changed = pyqtSignal(list, list)
     images_changed = pyqtSignal(list, list, list)
+    _scanned = pyqtSignal(int, list, list, bool)
 
+    CHUNK_SIZE = 1000
     WAIT_TIME_MS = 300
 
+    pool = Pool.get(globalinstance=False)
+
     def __init__(self) -> None:
         super().__init__()
         self._dir = ""
         self._images: List[str] = []
         self._directories: List[str] = []
+        self._rejected: Dict[str, Tuple[int, int, int]] = {}
+        self._reload_pending = self._scanning = False
+        self._scan_id = 0
 
+        self._scanned.connect(self._on_scanned)
         settings.monitor_fs.changed.connect(self._on_monitor_fs_changed)
+        settings.library.detect_by_extension.changed.connect(self._on_detection_changed)
+        settings.library.directory_index.changed.connect(self._on_index_changed)
+        self._on_index_changed(settings.library.directory_index.value)
         # TODO Fix upstream and open PR
         self.directoryChanged.connect(self._reload_directory)  # type: ignore
         self.fileChanged.connect(self._on_file_changed)  # type: ignore
@@ -119,6 +150,42 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
         """List of images in the current working directory."""
         return self._images
 
+    def content(
+        self, directory: str, show_hidden: Optional[bool] = None
+    ) -> Tuple[List[str], List[str]]:
+        """Return the supported content of directory.
+
+        The content is taken from the directory index if it is enabled and up-to-date.
+        Otherwise the directory is scanned and the index updated in the background.
+
+        Args:
+            directory: Directory to retrieve the content of.
+            show_hidden: Include hidden files and directories. Defaults to the
+                library.show_hidden setting.
+        Returns:
+            images: List of images inside the directory.
+            directories: List of directories inside the directory.
+        """
+        directory = os.path.abspath(os.path.expanduser(directory))
+        if show_hidden is None:
+            show_hidden = settings.library.show_hidden.value
+        by_extension = settings.library.detect_by_extension.value
+        content = directory_index.get(directory, show_hidden, by_extension)
+        if content is None:
+            chunks = files.scan(
+                directory, show_hidden=show_hidden, by_extension=by_extension
+            )
+            content = next(chunks)
+            asyncrun(
+                directory_index.put,
+                directory,
+                *content,
+                show_hidden,
+                by_extension,
+                pool=self.pool,
+            )
+        return content
+
     def chdir(self, directory: str, reload_current: bool = False) -> None:
         """Change the current working directory to directory."""
         directory = os.path.abspath(directory)
@@ -153,17 +220,197 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
             if self.directories() or self.files():
                 self.removePaths(self.directories() + self.files())
 
+    def _on_detection_changed(self, _value: bool) -> None:
+        """Reload the working directory with the new detection of images."""
+        if self._dir:
+            self.chdir(self._dir, reload_current=True)
+
+    @staticmethod
+    def _on_index_changed(value: bool) -> None:
+        if value:
+            directory_index.init()
+        else:
+            directory_index.close()
+
     def _load_directory(self, directory: str) -> None:
-        """Load supported files for new directory."""
+        """Load supported files for new directory.
+
+        Up-to-date content is taken from the directory index. Otherwise the first chunk
+        of the directory is scanned directly. Any remaining chunks are scanned in a
+        background thread to keep the user interface responsive.
+        """
         self._dir = directory
-        self._images, self._directories = self._get_content(directory)
+        self._scan_id += 1
+        self._rejected = {}
+        self._reload_pending = self._scanning = False
+        show_hidden = settings.library.show_hidden.value
+        by_extension = settings.library.detect_by_extension.value
+        content = directory_index.get(directory, show_hidden, by_extension)
+        if content is not None:
+            self._images, self._directories = content
+            self.loaded.emit(self._images, self._directories)
+            return
+        # Filled while scanning, the remaining chunks are scanned before it is read
+        chunks = files.scan(
+            directory,
+            show_hidden=show_hidden,
+            chunksize=self.CHUNK_SIZE,
+            by_extension=by_extension,
+            rejected=self._rejected,
+        )
+        self._images, self._directories = next(chunks)
         self.loaded.emit(self._images, self._directories)
+        self._scanning = True
+        asyncrun(
+            self._scan_remaining,
+            directory,
+            chunks,
+            self._scan_id,
+            show_hidden,
+            by_extension,
+            pool=self.pool,
+        )
+
+    def _scan_remaining(
+        self,
+        directory: str,
+        chunks: Iterator[Tuple[List[str], List[str]]],
+        scan_id: int,
+        show_hidden: bool,
+        by_extension: bool,
+    ) -> None:
+        """Scan the remaining chunks of a directory in a background thread.
+
+        Scanning stops once a different directory is loaded. The content of completely
+        scanned directories is stored in the directory index.
+        """
+        all_images, all_directories = list(self._images), list(self._directories)
+        try:
+            for images, directories in chunks:
+                if scan_id != self._scan_id:
+                    _logger.debug("Stopping outdated directory scan")
+                    return
+                if images or directories:
+                    self._scanned.emit(scan_id, images, directories, False)
+                    all_images.extend(images)
+                    all_directories.extend(directories)
+        except OSError as e:
+            _logger.debug("Error scanning directory: %s", e)
+            return
+        finally:
+            chunks.close()
+            self._scanned.emit(scan_id, [], [], True)
+        directory_index.put(
+            directory, all_images, all_directories, show_hidden, by_extension
+        )
+
+    def _on_scanned(
+        self, scan_id: int, images: List[str], directories: List[str], finished: bool
+    ) -> None:
+        """Add the content of a scanned chunk unless the scan is outdated.
+
+        Once the scan has finished, any changes made during the scan are applied.
+        """
+        if scan_id != self._scan_id:
+            return
+        if images or directories:
+            _logger.debug(
+                "Adding %d images and %d directories", len(images), len(directories)
+            )
+            self._apply_changes(images, [], directories, [])
+        if finished:
+            self._scanning = False
+            if self._reload_pending:
+                self._reload_pending = False
+                self._update_content()
 
     @throttled(delay_ms=WAIT_TIME_MS)
     def _reload_directory(self, _path: str) -> None:
-        """Load new supported files when directory content has changed."""
-        _logger.debug("Reloading working directory")
-        self._emit_changes(*self._get_content(self._dir))
+        """Update the supported files when directory content has changed."""
+        if self._scanning:
+            _logger.debug("Updating working directory once the scan has finished")
+            self._reload_pending = True
+        else:
+            self._update_content()
+
+    def _update_content(self) -> None:
+        """Update the content by the changes since the directory was last checked."""
+        _logger.debug("Updating working directory content")
+        try:
+            changes = self._diff()
+        except OSError as e:  # E.g. the directory was removed
+            _logger.debug("Cannot update working directory: %s", e)
+            return
+        self._apply_changes(*changes)
+
+    def _diff(self) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """Compute the changes of the content since the directory was last checked.
+
+        The entries of the directory are compared with the known images and
+        directories. This only requires the names and types of the entries which
+        os.scandir provides without additional system calls on most file systems.
+
+        Returns:
+            Sorted lists of the added images, removed images, added directories and
+            removed directories.
+        """
+        show_hidden = settings.library.show_hidden.value
+        by_extension = settings.library.detect_by_extension.value
+        # Any known path not found in the directory was removed
+        images, directories = set(self._images), set(self._directories)
+        added_images: List[str] = []
+        added_directories: List[str] = []
+        rejected: Dict[str, Tuple[int, int, int]] = {}
+        with os.scandir(self._dir) as entries:
+            for entry in entries:
+                if not show_hidden and entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir():
+                        if entry.path in directories:
+                            directories.remove(entry.path)
+                        else:
+                            added_directories.append(entry.path)
+                    elif entry.path in images:
+                        images.remove(entry.path)
+                    elif entry.is_file() and self._is_new_image(
+                        entry, by_extension, rejected
+                    ):
+                        added_images.append(entry.path)
+                except OSError:  # E.g. deleted in the meantime
+                    pass
+        self._rejected = rejected
+        return (
+            sorted(added_images),
+            sorted(images),
+            sorted(added_directories),
+            sorted(directories),
+        )
+
+    def _is_new_image(
+        self,
+        entry: "os.DirEntry[str]",
+        by_extension: bool,
+        rejected: Dict[str, Tuple[int, int, int]],
+    ) -> bool:
+        """Check whether a file that was not part of the known images is an image.
+
+        Files that were no image are only read again if their inode, size or
+        modification time changed, e.g. as they were still being written.
+
+        Args:
+            entry: The os.DirEntry of the file.
+            by_extension: Detect images by their extension.
+            rejected: Dictionary to add the file to if it is no image.
+        """
+        if by_extension:
+            return files.has_image_extension(entry.path)
+        stat = entry.stat()
+        signature = stat.st_ino, stat.st_size, stat.st_mtime_ns
+        if self._rejected.get(entry.name) != signature and files.is_image(entry.path):
+            return True
+        rejected[entry.name] = signature
+        return False
 
     @slot
     def _on_new_image(self, path: str) -> None:
@@ -172,10 +419,12 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
             _logger.debug("Clearing old images")
             self.removePaths(self.files())
         self.addPath(path)
+        directory_index.discard(path)  # May have been changed by other programs
 
     @slot
     def _on_file_changed(self, path: str) -> None:
         """Emit new_image_opened signal to reload the file on changes."""
+        directory_index.discard(path)
         if os.path.exists(path):  # Otherwise the path was deleted
             if path not in self.files():
                 self.addPath(path)
@@ -193,38 +442,40 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
         _logger.debug("Image file updated")
         status.update("image file changed")
 
-    def _emit_changes(self, images: List[str], directories: List[str]) -> None:
-        """Emit changed signals if the content in the directory has changed.
+    def _apply_changes(
+        self,
+        added_images: List[str],
+        removed_images: List[str],
+        added_directories: List[str],
+        removed_directories: List[str],
+    ) -> None:
+        """Apply changes to the content and emit the changed signals if required.
 
         Args:
-            images: Updated list of images in the working directory.
-            directories: Updated list of directories in the working directory.
+            added_images: Sorted list of images added to the working directory.
+            removed_images: Sorted list of images removed from the working directory.
+            added_directories: Sorted list of added directories.
+            removed_directories: Sorted list of removed directories.
         """
         # Image filelist has changed, relevant for thumbnail and image mode
-        if images != self._images:
-            new = set(images)
-            old = set(self._images)
-            added = sorted(new - old)
-            removed = sorted(old - new)
-            _logger.debug("Added images: %s", added)
-            _logger.debug("Removed images: %s", removed)
-            self.images_changed.emit(images, added, removed)
+        if added_images or removed_images:
+            self._images = _updated(self._images, added_images, removed_images)
+            _logger.debug("Added images: %s", added_images)
+            _logger.debug("Removed images: %s", removed_images)
+            self.images_changed.emit(self._images, added_images, removed_images)
+        if added_directories or removed_directories:
+            self._directories = _updated(
+                self._directories, added_directories, removed_directories
+            )
         # Total filelist has changed, relevant for the library
-        if images != self._images or directories != self._directories:
-            self._images = images
-            self._directories = directories
-            self.changed.emit(images, directories)
+        if added_images or removed_images or added_directories or removed_directories:
+            self.changed.emit(self._images, self._directories)
 
-    def _get_content(self, directory: str) -> Tuple[List[str], List[str]]:
-        """Get supported content of directory.
 
-        Returns:
-            images: List of images inside the directory.
-            directories: List of directories inside the directory.
-        """
-        show_hidden = settings.library.show_hidden.value
-        paths = files.listdir(directory, show_hidden=show_hidden)
-        return files.supported(paths)
+def _updated(paths: List[str], added: List[str], removed: List[str]) -> List[str]:
+    """Return a new sorted list of paths with added inserted and removed removed."""
+    removed_set = set(removed)
+    return list(heapq.merge((path for path in paths if path not in removed_set), added))
 
 
 handler = cast(WorkingDirectoryHandler, None)
@@ -0,0 +1,38 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Commands to maintain the thumbnail cache."""
+
+from vimiv import api
+from vimiv.utils import log, thumbnail_manager
+
+
+@api.commands.register()
+def thumbnail_clean_failed(retry: bool = False) -> None:
+    """Remove records of images for which creating the thumbnail failed.
+
+    **syntax:** ``:thumbnail-clean-failed [--retry]``
+
+    By default only the records of images that were deleted or modified are removed.
+
+    optional arguments:
+        * ``--retry``: Remove all records to retry creating every failed thumbnail.
+    """
+    removed = thumbnail_manager.clean_failed(retry=retry)
+    log.info("Removed %d records of failed thumbnails", removed)
+
+
+@api.commands.register()
+def thumbnail_clean() -> None:
+    """Remove outdated thumbnails and limit the size of the thumbnail cache.
+
+    **syntax:** ``:thumbnail-clean``
+
+    Thumbnails of deleted or modified images are removed. If the cache is larger than
+    the ``thumbnail.disk_cache_size`` setting, the least recently used thumbnails are
+    removed as well. Cleaning is done in the background.
+    """
+    thumbnail_manager.ThumbnailCleaner.instance.clean_async(report=True)
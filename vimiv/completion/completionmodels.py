@@ -112,7 +112,9 @@ class PathModel(api.completion.BaseModel):
         if not os.path.isdir(os.path.expanduser(directory)):
             return
         # Retrieve supported paths
-        images, directories = files.supported(files.listdir(directory))
+        images, directories = api.working_directory.handler.content(
+            directory, show_hidden=False
+        )
         # Format data
         self.set_data(
             self._create_row(os.path.join(directory, os.path.basename(path)))
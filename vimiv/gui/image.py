@@ -9,7 +9,7 @@
 import contextlib
 from typing import List, Union, Optional, Callable
 
-from PyQt5.QtCore import Qt, QRectF, pyqtSignal
+from PyQt5.QtCore import Qt, QRectF, QSize, pyqtSignal
 from PyQt5.QtWidgets import (
     QGraphicsView,
     QGraphicsScene,
@@ -24,7 +24,7 @@ from vimiv import api, imutils, utils
 from vimiv.imutils import slideshow
 from vimiv.commands.argtypes import Direction, ImageScale, ImageScaleFloat, Zoom
 from vimiv.config import styles
-from vimiv.gui import eventhandler
+from vimiv.gui import eventhandler, tiledimage
 from vimiv.utils import lazy
 
 QtSvg = lazy.import_module("PyQt5.QtSvg", optional=True)
@@ -47,6 +47,7 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         transformation_module: Function returning additional information on current
             more complex transformation such as straighten if any.
 
+        _preview: Pixmap item displaying a reduced-size preview if any.
         _scale: ImageScale defining how to scale image on resize.
 
     Signals:
@@ -72,6 +73,7 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         styles.apply(self)
 
         self._scale = ImageScaleFloat(1.0)
+        self._preview: Optional[QGraphicsPixmapItem] = None
         self.transformation_module: Optional[Callable[[], str]] = None
 
         self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
@@ -84,9 +86,12 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         self.setOptimizationFlags(QGraphicsView.DontSavePainterState)
 
         api.signals.pixmap_loaded.connect(self._load_pixmap)
+        api.signals.pixmap_preview_loaded.connect(self._load_preview)
+        api.signals.pixmap_updated.connect(self._on_pixmap_updated)
         api.signals.movie_loaded.connect(self._load_movie)
         if QtSvg is not None:
             api.signals.svg_loaded.connect(self._load_svg)
+        api.signals.tiled_image_loaded.connect(self._load_tiled)
         api.signals.all_images_cleared.connect(self._on_images_cleared)
 
     @staticmethod
@@ -116,6 +121,36 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         item.setTransformationMode(Qt.SmoothTransformation)
         self._update_scene(item, item.boundingRect(), keep_zoom)
 
+    def _load_preview(self, pixmap: QPixmap, size: QSize, keep_zoom: bool) -> None:
+        """Load reduced-size preview pixmap into the graphics scene.
+
+        The item is scaled up to the full size of the image so that zoom level and scene
+        rect are the same as for the full resolution.
+        """
+        item = QGraphicsPixmapItem()
+        item.setPixmap(pixmap)
+        item.setTransformationMode(Qt.SmoothTransformation)
+        item.setScale(size.width() / pixmap.width())
+        self._update_scene(item, QRectF(0, 0, size.width(), size.height()), keep_zoom)
+        self._preview = item
+        self._maybe_load_full_resolution()
+
+    def _on_pixmap_updated(self, pixmap: QPixmap) -> None:
+        """Replace the current preview with a pixmap of higher resolution."""
+        if self._preview is not None:
+            scale = self.sceneRect().width() / pixmap.width()
+            self._preview.setPixmap(pixmap)
+            self._preview.setScale(scale)
+            if scale <= 1:  # Full resolution
+                self._preview = None
+            else:
+                self._maybe_load_full_resolution()
+
+    def _maybe_load_full_resolution(self) -> None:
+        """Request the full resolution once the preview would be scaled up."""
+        if self._preview is not None and self.zoom_level * self._preview.scale() > 1:
+            api.signals.load_full_resolution.emit()
+
     def _load_movie(self, movie: QMovie, keep_zoom: bool) -> None:
         """Load new movie into the graphics scene."""
         movie.jumpToFrame(0)
@@ -130,10 +165,16 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         item = QtSvg.QGraphicsSvgItem(path)
         self._update_scene(item, item.boundingRect(), keep_zoom)
 
+    def _load_tiled(self, path: str, size: QSize, keep_zoom: bool) -> None:
+        """Load new huge image which is decoded in tiles into the graphics scene."""
+        item = tiledimage.TiledImage(path, size)
+        self._update_scene(item, item.boundingRect(), keep_zoom)
+
     def _update_scene(
         self, item: Union[QGraphicsItem, QLabel], rect: QRectF, keep_zoom: bool
     ) -> None:
         """Update the scene with the newly loaded item."""
+        self._preview = None
         self.scene().clear()
         if isinstance(item, QGraphicsItem):
             self.scene().addItem(item)
@@ -147,6 +188,7 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         self.centerOn(self.focalpoint)
 
     def _on_images_cleared(self) -> None:
+        self._preview = None
         self.scene().clear()
 
     @api.keybindings.register("k", "scroll up", mode=api.modes.IMAGE)
@@ -292,6 +334,7 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         super().scale(factor, factor)
         if factor < 1:
             self._update_focalpoint()
+        self._maybe_load_full_resolution()
 
     @property
     def zoom_level(self) -> float:
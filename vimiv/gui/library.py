@@ -8,17 +8,25 @@
 
 import contextlib
 import os
-from typing import List, Optional, Dict, NamedTuple
+from typing import List, Optional, Dict, NamedTuple, Tuple
 
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, QPointF, pyqtSlot, pyqtSignal
 from PyQt5.QtWidgets import QStyledItemDelegate, QSizePolicy, QStyle
-from PyQt5.QtGui import QStandardItemModel, QColor, QTextDocument, QStandardItem
+from PyQt5.QtGui import (
+    QStandardItemModel,
+    QColor,
+    QFont,
+    QFontMetrics,
+    QStandardItem,
+    QStaticText,
+    QTransform,
+)
 
 from vimiv import api, utils, widgets
 from vimiv.commands import argtypes, search, number_for_command
 from vimiv.config import styles
 from vimiv.gui import eventhandler, synchronize
-from vimiv.utils import files, strip_html, clamp, wrap_style_span, log
+from vimiv.utils import files, strip_html, clamp, log, asyncrun, Pool, lrucache, debug
 
 
 _logger = log.module_logger(__name__)
@@ -36,6 +44,22 @@ class Position(NamedTuple):
     row: int = 0
 
 
+class TextSegment(NamedTuple):
+    """Storage class for a part of the text of a library item ready to be drawn.
+
+    Attributes:
+        x: Horizontal offset of the segment within the item.
+        text: The prepared static text of the segment.
+        color: Color to draw the text with.
+        font: Font to draw the text with.
+    """
+
+    x: float
+    text: QStaticText
+    color: QColor
+    font: QFont
+
+
 class Library(eventhandler.EventHandlerMixin, widgets.FlatTreeView):
     """Library widget.
 
@@ -331,20 +355,49 @@ class LibraryModel(QStandardItemModel):
     """Model used for the library.
 
     The model stores the rows and populates the row content when the working directory
-    has changed.
+    has changed. When the content of the current directory changes, rows of removed
+    paths are removed and rows of new paths are inserted in contiguous blocks. The size
+    column displays a placeholder until the size was computed in a worker thread.
+
+    Class Attributes:
+        MAX_BLOCKS: Maximum number of blocks to update before re-creating all rows.
+        SIZE_CHUNK_SIZE: Number of sizes computed before they are displayed.
+        SIZE_PLACEHOLDER: Text of the size column until the size is known.
+        pool: Thread pool used to compute the sizes.
+
+    Signals:
+        _sizes_computed: Emitted by the worker thread when sizes were computed.
+            arg1: Number of the directory load the sizes belong to.
+            arg2: List of (path, size) tuples.
 
     Attributes:
         paths: List of currently open paths in the library.
 
         _highlighted: List of indices that are highlighted as search results.
         _library: Main library object to interact with.
+        _n_directories: Number of directories at the start of the paths.
+        _rows: Dictionary mapping paths to their row.
+        _size_id: Number of the current directory load, incremented to stop computing
+            sizes for previous content.
     """
 
+    MAX_BLOCKS = 64
+    SIZE_CHUNK_SIZE = 100
+    SIZE_PLACEHOLDER = "…"
+
+    _sizes_computed = pyqtSignal(int, list)
+
+    pool = Pool.get(globalinstance=False)
+
     def __init__(self, library: Library):
         super().__init__()
         self._highlighted: List[int] = []
         self._library = library
+        self._n_directories = 0
+        self._rows: Dict[str, int] = {}
+        self._size_id = 0
         self.paths: List[str] = []
+        self._sizes_computed.connect(self._on_sizes_computed)
         search.search.new_search.connect(self._on_new_search)
         search.search.cleared.connect(self._on_search_cleared)
         api.mark.marked.connect(self._mark_highlight)
@@ -360,19 +413,75 @@ class LibraryModel(QStandardItemModel):
             images: Images in the current directory.
             directories: Directories in the current directory.
         """
-        self.remove_all_rows()
-        self._add_rows(directories, are_directories=True)
-        self._add_rows(images, are_directories=False)
+        self._set_rows(images, directories)
         self._library.load_directory()
 
     @pyqtSlot(list, list)
     def _on_directory_changed(self, images: List[str], directories: List[str]):
-        """Reload library when directory content has changed.
+        """Update the rows of the library when directory content has changed.
 
-        In addition to _update_content() the position is stored.
+        In addition to _update_content() the position is stored and only the rows of
+        changed paths are updated if possible.
         """
         self._library.store_position()
-        self._update_content(images, directories)
+        if not self._update_rows(images, directories):
+            self._set_rows(images, directories)
+        self._library.load_directory()
+
+    def _set_rows(self, images: List[str], directories: List[str]):
+        """Re-create all rows for images and directories."""
+        self._size_id += 1
+        self.remove_all_rows()
+        self._insert_rows(0, directories, are_directories=True)
+        self._insert_rows(len(directories), images, are_directories=False)
+        self._n_directories = len(directories)
+        self._rows = {path: row for row, path in enumerate(self.paths)}
+
+    def _update_rows(self, images: List[str], directories: List[str]) -> bool:
+        """Remove the rows of removed paths and insert rows for new paths.
+
+        Args:
+            images: Images in the current directory.
+            directories: Directories in the current directory.
+        Returns:
+            False if the rows cannot be updated block by block as the kept paths changed
+            their order or type, or there are too many blocks.
+        """
+        paths = directories + images
+        new = set(paths)
+        kept = [path for path in self.paths if path in new]
+        kept_set = set(kept)
+        if [path for path in paths if path in kept_set] != kept:
+            return False
+        n_kept_directories = sum(path in kept_set for path in directories)
+        if n_kept_directories != sum(
+            path in new for path in self.paths[: self._n_directories]
+        ):
+            return False
+        removed = utils.blocks(
+            row for row, path in enumerate(self.paths) if path not in new
+        )
+        added = [row for row, path in enumerate(paths) if path not in kept_set]
+        n_directories = len(directories)
+        inserted = utils.blocks(row for row in added if row < n_directories)
+        inserted += utils.blocks(row for row in added if row >= n_directories)
+        if len(removed) + len(inserted) > self.MAX_BLOCKS:
+            return False
+        # Remove last block first so that the rows of the other blocks stay valid
+        for first, last in reversed(removed):
+            self.removeRows(first, last - first + 1)
+            del self.paths[first : last + 1]
+        # Insert first block first as the rows are given with respect to the new paths
+        for first, last in inserted:
+            self._insert_rows(
+                first, paths[first : last + 1], are_directories=first < n_directories
+            )
+        self._n_directories = n_directories
+        self._rows = {path: row for row, path in enumerate(self.paths)}
+        # Rows after the first changed row are numbered differently
+        if removed or inserted:
+            self._update_numbers(min(block[0] for block in removed + inserted))
+        return True
 
     @pyqtSlot(int, list, api.modes.Mode, bool)
     def _on_new_search(
@@ -405,11 +514,10 @@ class LibraryModel(QStandardItemModel):
             path: The (un-)marked path.
             marked: True if it was marked.
         """
-        try:
-            index = self.paths.index(path)
-        except ValueError:
+        row = self._rows.get(path)
+        if row is None:
             return
-        item = self.item(index, 1)
+        item = self.item(row, 1)
         item.setText(api.mark.highlight(item.text(), marked))
 
     def remove_all_rows(self):
@@ -420,52 +528,116 @@ class LibraryModel(QStandardItemModel):
         """
         self.removeRows(0, self.rowCount())
         self.paths.clear()
+        self._rows.clear()
 
     def is_highlighted(self, index):
         """Return True if the index is highlighted as search result."""
         return index.row() in self._highlighted
 
-    def _add_rows(self, paths: List[str], are_directories: bool = False):
-        """Generate a library row for each path and add it to the model.
+    def _insert_rows(self, row: int, paths: List[str], are_directories: bool):
+        """Generate a library row for each path and insert it into the model.
+
+        The sizes of the paths are computed in the worker thread.
 
         Args:
+            row: Row at which the first path is inserted.
             paths: List of paths to create a library row for.
             are_directories: Whether all paths are directories.
         """
-        get_size = files.get_size_directory if are_directories else files.get_size_file
         mark_prefix = api.mark.indicator + " "
-        for i, path in enumerate(paths, start=self.rowCount() + 1):
+        for i, path in enumerate(paths, start=row):
             name = os.path.basename(path)
             if are_directories:
                 name = utils.add_html(name + "/", "b")
             if path in api.mark.paths:
                 name = mark_prefix + name
-            with contextlib.suppress(FileNotFoundError):  # Deleted in the meantime
-                size = get_size(path)
-                self.appendRow(
-                    (QStandardItem(str(i)), QStandardItem(name), QStandardItem(size),)
-                )
-                self.paths.append(path)
+            self.insertRow(
+                i,
+                (
+                    QStandardItem(str(i + 1)),
+                    QStandardItem(name),
+                    QStandardItem(self.SIZE_PLACEHOLDER),
+                ),
+            )
+        self.paths[row:row] = paths
+        asyncrun(
+            self._compute_sizes,
+            self._size_id,
+            list(paths),
+            are_directories,
+            pool=self.pool,
+        )
+
+    def _update_numbers(self, first: int):
+        """Update the row numbers starting at row first."""
+        for row in range(first, self.rowCount()):
+            item = self.item(row, 0)
+            number = str(row + 1)
+            if item.text() != number:
+                item.setText(number)
+
+    def _compute_sizes(self, size_id: int, paths: List[str], are_directories: bool):
+        """Compute the sizes of paths in chunks and emit them for display.
+
+        This is run in the worker thread and stops once the rows were re-created.
+
+        Args:
+            size_id: Number of the directory load the paths belong to.
+            paths: List of paths to compute the size for.
+            are_directories: Whether all paths are directories.
+        """
+        get_size = files.get_size_directory if are_directories else files.get_size_file
+        for start in range(0, len(paths), self.SIZE_CHUNK_SIZE):
+            if size_id != self._size_id:
+                return
+            chunk = paths[start : start + self.SIZE_CHUNK_SIZE]
+            sizes = [(path, get_size(path)) for path in chunk]
+            self._sizes_computed.emit(size_id, sizes)
+
+    def _on_sizes_computed(self, size_id: int, sizes: List[Tuple[str, str]]):
+        """Display the computed sizes unless the rows were re-created since."""
+        if size_id != self._size_id:
+            return
+        for path, size in sizes:
+            row = self._rows.get(path)
+            if row is not None:
+                self.item(row, 2).setText(size)
 
 
 class LibraryDelegate(QStyledItemDelegate):
     """Delegate used for the library.
 
-    The delegate draws the items.
+    The delegate draws the items. The text of an item is split into segments of
+    equal color and font which are elided and prepared as static text once. These are
+    cached by the html text of the item, search highlighting and width. Marking,
+    searching and resizing thus change the key and the segments are created again
+    while scrolling only draws cached segments.
+
+    Attributes:
+        paint_time: TimeCounter of the time spent painting items.
+
+        _segments: LRUCache of the text segments by text, highlighting and width.
     """
 
+    # Maximum number of items of which the text segments are cached
+    SEGMENT_CACHE_SIZE = 4096
+    # Number of painted items after which the paint time is logged
+    PAINT_LOG_INTERVAL = 1000
+
     # Storing the styles makes the code more readable and faster IMHO
     # pylint: disable=too-many-instance-attributes
     def __init__(self):
         super().__init__()
-        self.doc = QTextDocument(self)
-        self.doc.setDocumentMargin(0)
+        self.paint_time = debug.TimeCounter()
+        self._segments: lrucache.LRUCache[List[TextSegment]] = lrucache.LRUCache(
+            maxsize=self.SEGMENT_CACHE_SIZE, sizefunc=lambda _segments: 1
+        )
 
-        # Named properties for html
-        self.font = styles.get("library.font")
-        self.fg = styles.get("library.fg")
-        self.dir_fg = styles.get("library.directory.fg")
-        self.search_fg = styles.get("library.search.highlighted.fg")
+        # QColor options for text drawing
+        self.fg = QColor(styles.get("library.fg"))
+        self.dir_fg = QColor(styles.get("library.directory.fg"))
+        self.search_fg = QColor(styles.get("library.search.highlighted.fg"))
+        self.mark_fg = QColor(styles.get("mark.color"))
 
         # QColor options for background drawing
         self.selection_bg = QColor(styles.get("library.selected.bg"))
@@ -488,15 +660,21 @@ class LibraryDelegate(QStyledItemDelegate):
             option: The QStyleOptionViewItem.
             index: The QModelIndex.
         """
-        self._draw_background(painter, option, index)
-        self._draw_text(painter, option, index)
+        with self.paint_time:
+            self._draw_background(painter, option, index)
+            self._draw_text(painter, option, index)
+        if self.paint_time.count >= self.PAINT_LOG_INTERVAL:
+            _logger.debug(
+                "Painting library items: %s, text cache hit rate: %.2f",
+                self.paint_time,
+                self._segments.hit_rate,
+            )
+            self.paint_time.reset()
 
     def _draw_text(self, painter, option, index):
         """Draw text for the library.
 
-        Sets the font and the foreground color using html. The foreground color
-        depends on whether the path is a directory and on whether it is
-        highlighted as search result or not.
+        The cached text segments are drawn vertically centered within the item.
 
         Args:
             painter: The QPainter.
@@ -504,16 +682,62 @@ class LibraryDelegate(QStyledItemDelegate):
             index: The QModelIndex.
         """
         text = index.model().data(index)
+        highlighted = index.model().is_highlighted(index)
+        rect = option.rect
+        key = (text, highlighted, rect.width())
+        segments = self._segments.get(key)
+        if segments is None:
+            segments = self.text_segments(text, highlighted, option.font, rect.width())
+            self._segments.put(key, segments)
         painter.save()
-        color = self._get_foreground_color(index, text)
-        text = self.elided(text, painter.fontMetrics(), option.rect.width() - 1)
-        text = wrap_style_span(f"color: {color}; font: {self.font}", text)
-        self.doc.setHtml(text)
-        self.doc.setTextWidth(option.rect.width() - 1)
-        painter.translate(option.rect.x(), option.rect.y())
-        self.doc.drawContents(painter)
+        for segment in segments:
+            painter.setFont(segment.font)
+            painter.setPen(segment.color)
+            y = rect.y() + (rect.height() - segment.text.size().height()) / 2
+            painter.drawStaticText(QPointF(rect.x() + segment.x, y), segment.text)
         painter.restore()
 
+    def text_segments(
+        self, text: str, highlighted: bool, font: QFont, width: int
+    ) -> List[TextSegment]:
+        """Split the html text of an item into elided segments ready to be drawn.
+
+        The text consists of an optional leading mark indicator followed by the name
+        which is displayed in bold for directories. The name is elided by replacing
+        characters from the middle by … if it is wider than the available width.
+
+        Args:
+            text: The html text of the item.
+            highlighted: True if the item is highlighted as search result.
+            font: The font of the item.
+            width: Width in pixels that the text may take.
+        Returns:
+            List of segments to draw.
+        """
+        segments = []
+        x = 0.0
+        if text.startswith(self.mark_str):
+            mark = self._static_text(strip_html(self.mark_str), font)
+            segments.append(TextSegment(x, mark, self.mark_fg, font))
+            x += mark.size().width()
+            text = text[len(self.mark_str) :]
+        if text.startswith("<b>"):
+            font = QFont(font)
+            font.setBold(True)
+        text = strip_html(text)
+        elided = QFontMetrics(font).elidedText(text, Qt.ElideMiddle, int(width - 1 - x))
+        color = self._get_foreground_color(highlighted, text)
+        segments.append(TextSegment(x, self._static_text(elided, font), color, font))
+        return segments
+
+    @staticmethod
+    def _static_text(text: str, font: QFont) -> QStaticText:
+        """Return static plain text prepared for drawing with font."""
+        static = QStaticText(text)
+        static.setTextFormat(Qt.PlainText)
+        static.prepare(QTransform(), font)
+        return static
+
     def _draw_background(self, painter, option, index):
         """Draw the background rectangle of the text.
 
@@ -532,17 +756,17 @@ class LibraryDelegate(QStyledItemDelegate):
         painter.drawRect(option.rect)
         painter.restore()
 
-    def _get_foreground_color(self, index, text):
+    def _get_foreground_color(self, highlighted, text):
         """Return the foreground color of an item.
 
         The color depends on highlighted as search result and whether it is a
         directory.
 
         Args:
-            index: Index of the element indicating even/odd/highlighted.
+            highlighted: True if the item is highlighted as search result.
             text: Text indicating directory or not.
         """
-        if index.model().is_highlighted(index):
+        if highlighted:
             return self.search_fg
         return self.dir_fg if text.endswith("/") else self.fg
 
@@ -566,31 +790,6 @@ class LibraryDelegate(QStyledItemDelegate):
             return self.odd_bg
         return self.even_bg
 
-    def elided(self, text, font_metrics, width):
-        """Return an elided text preserving html tags.
-
-        If the text is wider than width, it is elided by replacing characters from the
-        middle by …. Surrounding html tags are not included in the calculation and left
-        untouched.
-
-        Args:
-            text: The text to elide.
-            font_metrics: QFontMetrics to create elided text based on width.
-            width: Width in pixels that the text may take.
-        Returns:
-            Elided version of the text.
-        """
-        html_stripped = strip_html(text)
-        # Html only surrounds the leading mark indicator as directories are never marked
-        if text.startswith(self.mark_str):
-            mark_stripped = strip_html(self.mark_str)
-            elided = font_metrics.elidedText(html_stripped, Qt.ElideMiddle, width)
-            return elided.replace(mark_stripped, self.mark_str)
-        # Html surrounds the full text as the file may be a directory which is displayed
-        # in bold
-        elided = font_metrics.elidedText(html_stripped, Qt.ElideMiddle, width)
-        return text.replace(html_stripped, elided)
-
 
 def strip(path: str) -> str:
     """Strip html tags and mark indicator from a library path."""
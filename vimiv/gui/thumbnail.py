@@ -6,61 +6,64 @@
 
 """Thumbnail widget."""
 
-import contextlib
 import os
-from typing import List, Optional, Iterator, cast
+from typing import Dict, List, Optional, Set
 
-from PyQt5.QtCore import Qt, QSize, QRect, pyqtSlot
-from PyQt5.QtWidgets import QListWidget, QListWidgetItem, QStyle, QStyledItemDelegate
-from PyQt5.QtGui import QColor, QIcon
+from PyQt5.QtCore import Qt, QSize, QRect, QAbstractListModel, QModelIndex, pyqtSlot
+from PyQt5.QtWidgets import QListView, QStyle, QStyledItemDelegate
+from PyQt5.QtGui import QColor, QIcon, QPixmap
 
 from vimiv import api, utils, imutils, widgets
 from vimiv.commands import argtypes, search, number_for_command
 from vimiv.config import styles
 from vimiv.gui import eventhandler, synchronize
-from vimiv.utils import create_pixmap, thumbnail_manager, log
+from vimiv.utils import create_pixmap, thumbnail_manager, log, lrucache, debug
 
 
 _logger = log.module_logger(__name__)
 
 
 class ThumbnailView(
-    eventhandler.EventHandlerMixin, widgets.ScrollToCenterMixin, QListWidget
+    eventhandler.EventHandlerMixin, widgets.ScrollToCenterMixin, QListView
 ):
     """Thumbnail widget.
 
+    The view is backed by the ThumbnailModel and all items share the same size. Thus
+    only the thumbnails in the viewport are ever painted and laying out the items does
+    not depend on any per-item data.
+
     Attributes:
         _manager: ThumbnailManager class to create thumbnails asynchronously.
-        _paths: Last paths loaded to avoid duplicate loading.
+        _model: ThumbnailModel storing the paths and the state of all thumbnails.
     """
 
     STYLESHEET = """
-    QListWidget {
+    QListView {
         font: {thumbnail.font};
         background-color: {thumbnail.bg};
     }
 
-    QListWidget::item {
+    QListView::item {
         padding: {thumbnail.padding}px;
     }
 
-    QListWidget::item:selected {
+    QListView::item:selected {
         background: {thumbnail.selected.bg};
     }
 
-    QListWidget QScrollBar {
+    QListView QScrollBar {
         width: {library.scrollbar.width};
         background: {library.scrollbar.bg};
     }
 
-    QListWidget QScrollBar::handle {
+    QListView QScrollBar::handle {
         background: {library.scrollbar.fg};
         border: {library.scrollbar.padding} solid
                 {library.scrollbar.bg};
         min-height: 10px;
     }
 
-    QListWidget QScrollBar::sub-line, QScrollBar::add-line {
+    QListView QScrollBar::sub-line, QScrollBar::add-line {
         border: none;
         background: none;
     }
@@ -70,7 +73,8 @@ class ThumbnailView(
     @api.objreg.register
     def __init__(self):
         super().__init__()
-        self._paths: List[str] = []
+        self._model = ThumbnailModel(self)
+        self.setModel(self._model)
 
         fail_pixmap = create_pixmap(
             color=styles.get("thumbnail.error.bg"),
@@ -78,44 +82,45 @@ class ThumbnailView(
             size=256,
             frame_size=10,
         )
-        self._manager = thumbnail_manager.ThumbnailManager(fail_pixmap)
+        self._manager = thumbnail_manager.ThumbnailManager(
+            fail_pixmap, size=self._device_size(api.settings.thumbnail.size.value)
+        )
+        self._cleaner = thumbnail_manager.ThumbnailCleaner()
+        self._cleaner.schedule()
 
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setViewMode(QListWidget.IconMode)
+        self.setViewMode(QListView.IconMode)
         default_size = api.settings.thumbnail.size.value
         self.setIconSize(QSize(default_size, default_size))
-        self.setResizeMode(QListWidget.Adjust)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
 
         self.setItemDelegate(ThumbnailDelegate(self))
         self.setDragEnabled(False)
 
-        api.signals.all_images_cleared.connect(self.clear)
+        api.signals.all_images_cleared.connect(self._model.clear)
         api.signals.new_image_opened.connect(self._select_path)
         api.signals.new_images_opened.connect(self._on_new_images_opened)
         api.settings.thumbnail.size.changed.connect(self._on_size_changed)
         search.search.new_search.connect(self._on_new_search)
         search.search.cleared.connect(self._on_search_cleared)
         self._manager.created.connect(self._on_thumbnail_created)
+        self.verticalScrollBar().valueChanged.connect(self._prioritize_visible)
+        self.selectionModel().currentRowChanged.connect(self._prioritize_visible)
         self.activated.connect(self.open_selected)
         self.doubleClicked.connect(self.open_selected)
-        api.mark.marked.connect(self._mark_highlight)
-        api.mark.unmarked.connect(lambda path: self._mark_highlight(path, marked=False))
-        api.mark.markdone.connect(self.repaint)
+        api.mark.markdone.connect(self.viewport().update)
         synchronize.signals.new_library_path_selected.connect(self._select_path)
 
         styles.apply(self)
 
-    def __iter__(self) -> Iterator["ThumbnailItem"]:
-        for index in range(self.count()):
-            yield self.item(index)
+    def count(self) -> int:
+        """Return the number of thumbnails."""
+        return self._model.rowCount()
 
-    def item(self, index: int) -> "ThumbnailItem":
-        return cast(ThumbnailItem, super().item(index))
-
-    def clear(self):
-        """Override clear to also empty paths."""
-        self._paths = []
-        super().clear()
+    def currentRow(self) -> int:
+        """Return the row of the currently selected thumbnail or -1 if there is none."""
+        return self.currentIndex().row()
 
     @pyqtSlot(list)
     def _on_new_images_opened(self, paths: List[str]):
@@ -124,27 +129,49 @@ class ThumbnailView(
         Args:
             paths: List of new paths to load.
         """
-        if paths == self._paths:  # Nothing to do
+        if paths == self._model.paths:  # Nothing to do
             _logger.debug("No new images to load")
             return
         _logger.debug("Updating thumbnails...")
-        removed = set(self._paths) - set(paths)
-        for path in removed:
-            _logger.debug("Removing existing thumbnail '%s'", path)
-            idx = self._paths.index(path)
-            del self._paths[idx]  # Remove as the index also changes in the QListWidget
-            if not self.takeItem(idx):
-                _logger.error("Error removing thumbnail for '%s'", path)
-        size_hint = QSize(self.item_size(), self.item_size())
-        for i, path in enumerate(paths):
-            if path not in self._paths:  # Add new path
-                _logger.debug("Adding new thumbnail '%s'", path)
-                ThumbnailItem(self, i, size_hint=size_hint)
-            self.item(i).marked = path in api.mark.paths  # Ensure correct highlighting
-        self._paths = paths
+        current = self.current()
+        self._model.set_paths(paths)
+        if not self.currentIndex().isValid():  # Model was reset
+            self._select_path(current)
         self._manager.create_thumbnails_async(paths)
+        self._update_priorities()
         _logger.debug("... update completed")
 
+    @utils.throttled(delay_ms=50)
+    def _prioritize_visible(self, *_args):
+        """Update thumbnail priorities when scrolling or selecting another thumbnail."""
+        self._update_priorities()
+
+    def _update_priorities(self):
+        """Create visible thumbnails first, then the ones close to the current."""
+        self._manager.prioritize(self._visible_rows(), max(self.currentRow(), 0))
+
+    def _visible_rows(self) -> range:
+        """Return the range of rows that are currently displayed in the viewport.
+
+        As the items are laid out row by row, the first and last visible row are found
+        by bisection over the item rectangles.
+        """
+
+        def first_row(predicate):
+            low, high = 0, self.count()
+            while low < high:
+                middle = (low + high) // 2
+                if predicate(self.visualRect(self.model().index(middle, 0))):
+                    high = middle
+                else:
+                    low = middle + 1
+            return low
+
+        height = self.viewport().height()
+        first = first_row(lambda rect: rect.bottom() >= 0)
+        last = first_row(lambda rect: rect.top() > height)
+        return range(first, last)
+
     @utils.slot
     def _on_thumbnail_created(self, index: int, icon: QIcon):
         """Insert created thumbnail as soon as manager created it.
@@ -153,9 +180,7 @@ class ThumbnailView(
             index: Index of the created thumbnail as integer.
             icon: QIcon to insert.
         """
-        item = self.item(index)
-        if item is not None:  # Otherwise it has been deleted in the meanwhile
-            item.setIcon(icon)
+        self._model.set_icon(index, icon)
 
     @pyqtSlot(int, list, api.modes.Mode, bool)
     def _on_new_search(
@@ -169,33 +194,19 @@ class ThumbnailView(
             mode: Mode for which the search was performed.
             _incremental: True if incremental search was performed.
         """
-        if self._paths and mode == api.modes.THUMBNAIL:
+        if self._model.paths and mode == api.modes.THUMBNAIL:
             self._select_index(index)
-            for item, path in zip(self, self._paths):
-                item.highlighted = os.path.basename(path) in matches
-            self.repaint()
+            basenames = set(matches)
+            self._model.set_highlighted(
+                path
+                for path in self._model.paths
+                if os.path.basename(path) in basenames
+            )
 
     @utils.slot
     def _on_search_cleared(self):
-        """Reset highlighted and force repaint when search results cleared."""
-        for item in self:
-            item.highlighted = False
-        self.repaint()
-
-    def _mark_highlight(self, path: str, marked: bool = True):
-        """(Un-)Highlight a path if it was (un-)marked.
-
-        Args:
-            path: The (un-)marked path.
-            marked: True if it was marked.
-        """
-        try:
-            index = self._paths.index(path)
-        except ValueError:
-            _logger.debug("Ignoring mark as thumbnails have not been created")
-            return
-        item = self.item(index)
-        item.marked = marked
+        """Reset highlighted when search results cleared."""
+        self._model.set_highlighted(())
 
     @api.commands.register(mode=api.modes.THUMBNAIL)
     def open_selected(self):
@@ -284,37 +295,46 @@ class ThumbnailView(
         api.settings.thumbnail.size.step(up=direction == direction.In)
 
     def rescale_items(self):
-        """Reset item hint when item size has changed."""
-        for i in range(self.count()):
-            item = self.item(i)
-            item.setSizeHint(QSize(self.item_size(), self.item_size()))
+        """Re-layout the items when the item size has changed."""
+        self.doItemsLayout()
         self.scrollTo(self.currentIndex())
 
     @utils.slot
     def _select_path(self, path: str):
         """Select a specific path by name."""
-        with contextlib.suppress(ValueError):
-            self._select_index(self._paths.index(path), emit=False)
+        row = self._model.row(path)
+        if row is not None:
+            self._select_index(row, emit=False)
 
     def _select_index(self, index: int, emit: bool = True) -> None:
-        """Select specific item in the ListWidget.
+        """Select specific item in the ListView.
 
         Args:
             index: Number of the current item to select.
             emit: Emit the new_thumbnail_path_selected signal.
         """
-        if not self._paths:
+        if not self._model.paths:
             raise api.commands.CommandWarning("Thumbnail list is empty")
         _logger.debug("Selecting thumbnail number %d", index)
         model_index = self.model().index(index, 0)
         self.setCurrentIndex(model_index)
         if emit:
-            synchronize.signals.new_thumbnail_path_selected.emit(self._paths[index])
+            synchronize.signals.new_thumbnail_path_selected.emit(
+                self._model.paths[index]
+            )
 
     def _on_size_changed(self, value: int):
         _logger.debug("Setting size to %d", value)
         self.setIconSize(QSize(value, value))
         self.rescale_items()
+        if self._manager.set_size(self._device_size(value)):
+            _logger.debug("Re-creating thumbnails in tier of %d px", self._manager.size)
+            self._manager.create_thumbnails_async(self._model.paths)
+            self._update_priorities()
+
+    def _device_size(self, size: int) -> int:
+        """Return the size in device pixels required to display thumbnails of size."""
+        return int(size * self.devicePixelRatioF())
 
     def columns(self):
         """Return the number of columns."""
@@ -329,20 +349,14 @@ class ThumbnailView(
     @api.status.module("{thumbnail-name}")
     def _thumbnail_name(self):
         """Name of the currently selected thumbnail."""
-        try:
-            abspath = self._paths[self.currentRow()]
-            basename = os.path.basename(abspath)
-            name, _ = os.path.splitext(basename)
-            return name
-        except IndexError:
-            return ""
+        basename = os.path.basename(self.current())
+        name, _ = os.path.splitext(basename)
+        return name
 
     def current(self):
         """Current path for thumbnail mode."""
-        try:
-            return self._paths[self.currentRow()]
-        except IndexError:
-            return ""
+        row = self.currentRow()
+        return self._model.paths[row] if row >= 0 else ""
 
     @staticmethod
     def pathlist() -> List[str]:
@@ -369,16 +383,34 @@ class ThumbnailView(
         """Update resize event to keep selected thumbnail centered."""
         super().resizeEvent(event)
         self.scrollTo(self.currentIndex())
+        self._prioritize_visible()
 
 
 class ThumbnailDelegate(QStyledItemDelegate):
     """Delegate used for the thumbnail widget.
 
-    The delegate draws the items.
+    The delegate draws the items. Thumbnails scaled to the item size are cached so
+    that painting, e.g. when scrolling, does not rescale the thumbnails every time.
+
+    Attributes:
+        paint_time: TimeCounter of the time spent painting items.
+
+        _pixmaps: LRUCache of the scaled pixmaps by icon, size and pixel ratio.
     """
 
+    # Maximum memory used by the scaled pixmaps in bytes
+    PIXMAP_CACHE_SIZE = 32 * thumbnail_manager.MIB
+    # Number of painted items after which the paint time is logged
+    PAINT_LOG_INTERVAL = 1000
+
     def __init__(self, parent):
         super().__init__(parent)
+        self.paint_time = debug.TimeCounter()
+        self._pixmaps: lrucache.LRUCache[QPixmap] = lrucache.LRUCache(
+            maxsize=self.PIXMAP_CACHE_SIZE,
+            sizefunc=lambda pixmap: pixmap.width() * pixmap.height() * 4,
+        )
+        api.settings.thumbnail.size.changed.connect(self._on_size_changed)
 
         # QColor options for background drawing
         self.bg = QColor(styles.get("thumbnail.bg"))
@@ -396,11 +428,23 @@ class ThumbnailDelegate(QStyledItemDelegate):
             option: The QStyleOptionViewItem.
             model_index: The QModelIndex.
         """
-        item = self.parent().item(model_index.row())
-        self._draw_background(painter, option, item)
-        self._draw_pixmap(painter, option, item)
+        with self.paint_time:
+            self._draw_background(painter, option, model_index)
+            self._draw_pixmap(painter, option, model_index)
+        if self.paint_time.count >= self.PAINT_LOG_INTERVAL:
+            _logger.debug(
+                "Painting thumbnails: %s, pixmap cache hit rate: %.2f",
+                self.paint_time,
+                self._pixmaps.hit_rate,
+            )
+            self.paint_time.reset()
 
-    def _draw_background(self, painter, option, item):
+    def sizeHint(self, _option, _model_index):
+        """Return the size of the items which is equal for all thumbnails."""
+        size = self.parent().item_size()
+        return QSize(size, size)
+
+    def _draw_background(self, painter, option, model_index):
         """Draw the background rectangle of the thumbnail.
 
         The color depends on whether the item is selected and on whether it is
@@ -409,29 +453,27 @@ class ThumbnailDelegate(QStyledItemDelegate):
         Args:
             painter: The QPainter.
             option: The QStyleOptionViewItem.
-            item: The ThumbnailItem.
+            model_index: The QModelIndex.
         """
-        color = self._get_background_color(item, option.state)
+        color = self._get_background_color(model_index, option.state)
         painter.save()
         painter.setBrush(color)
         painter.setPen(Qt.NoPen)
         painter.drawRect(option.rect)
         painter.restore()
 
-    def _draw_pixmap(self, painter, option, item):
+    def _draw_pixmap(self, painter, option, model_index):
         """Draw the actual pixmap of the thumbnail.
 
-        This calculates the size of the pixmap, applies padding and
+        This retrieves the pixmap scaled to the size of the item, applies padding and
         appropriately centers the image.
 
         Args:
             painter: The QPainter.
             option: The QStyleOptionViewItem.
-            item: The ThumbnailItem.
+            model_index: The QModelIndex.
         """
         painter.save()
-        # Original thumbnail pixmap
-        pixmap = item.icon().pixmap(256)
         # Rectangle that can be filled by the pixmap
         rect = QRect(
             option.rect.x() + self.padding,
@@ -439,19 +481,46 @@ class ThumbnailDelegate(QStyledItemDelegate):
             option.rect.width() - 2 * self.padding,
             option.rect.height() - 2 * self.padding,
         )
-        # Size the pixmap should take
-        size = pixmap.size().scaled(rect.size(), Qt.KeepAspectRatio)
+        pixmap = self.scaled_pixmap(model_index.data(Qt.DecorationRole), rect.size())
+        # Size the pixmap takes in logical pixels
+        size = pixmap.size() / pixmap.devicePixelRatio()
         # Coordinates to center the pixmap
         diff_x = (rect.width() - size.width()) / 2.0
         diff_y = (rect.height() - size.height()) / 2.0
         x = int(option.rect.x() + self.padding + diff_x)
         y = int(option.rect.y() + self.padding + diff_y)
         # Draw
-        painter.drawPixmap(x, y, size.width(), size.height(), pixmap)
+        painter.drawPixmap(x, y, pixmap)
         painter.restore()
-        if item.marked:
+        if model_index.data(ThumbnailModel.MarkedRole):
             self._draw_mark(painter, option, x + size.width(), y + size.height())
 
+    def scaled_pixmap(self, icon: QIcon, size: QSize) -> QPixmap:
+        """Return the pixmap of icon scaled to fit into size.
+
+        The scaled pixmap is cached. A replaced icon has a different cache key and
+        therefore invalidates the cached pixmap of the previous icon.
+
+        Args:
+            icon: The QIcon of the thumbnail.
+            size: Size in logical pixels the pixmap must fit into.
+        """
+        ratio = self.parent().devicePixelRatioF()
+        key = icon.cacheKey(), size.width(), size.height(), ratio
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            original = icon.pixmap(thumbnail_manager.MAX_SIZE)
+            pixmap = original.scaled(
+                size * ratio, Qt.KeepAspectRatio, Qt.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(ratio)
+            self._pixmaps.put(key, pixmap)
+        return pixmap
+
+    def _on_size_changed(self, _value: int):
+        """Drop the pixmaps scaled to the previous thumbnail size."""
+        self._pixmaps.clear()
+
     def _draw_mark(self, painter, option, x, y):
         """Draw small rectangle as mark indicator if the image is marked.
 
@@ -470,34 +539,142 @@ class ThumbnailDelegate(QStyledItemDelegate):
         painter.drawRect(x - width // 2, y - width // 2, width, width)
         painter.restore()
 
-    def _get_background_color(self, item, state):
+    def _get_background_color(self, model_index, state):
         """Return the background color of an item.
 
         The color depends on selected and highlighted as search result.
 
         Args:
-            item: The ThumbnailItem storing highlight status.
+            model_index: The QModelIndex of the item.
             state: State of the model index indicating selected.
         """
         if state & QStyle.State_Selected:
             if api.modes.current() == api.modes.THUMBNAIL:
                 return self.selection_bg
             return self.selection_bg_unfocus
-        if item.highlighted:
+        if model_index.data(ThumbnailModel.HighlightedRole):
             return self.search_bg
         return self.bg
 
 
-class ThumbnailItem(QListWidgetItem):
-    """Item storing a single thumbnail and it's search and mark status."""
+class ThumbnailModel(QAbstractListModel):
+    """Model storing the paths of all thumbnails and their state.
+
+    The data of a row is only assembled once the view requests it. When the paths
+    change, rows of removed paths are removed and rows of new paths are inserted in
+    contiguous blocks. This keeps the view state such as the selection intact and
+    makes updating linear in the number of paths.
+
+    Attributes:
+        _highlighted: Set of paths highlighted as search result.
+        _icons: Dictionary mapping paths to their created thumbnail icon.
+        _marked: Set of marked paths.
+        _paths: List of the paths of all thumbnails.
+        _rows: Dictionary mapping paths to their row.
+    """
+
+    HighlightedRole = Qt.UserRole
+    MarkedRole = Qt.UserRole + 1
+    # Applying many scattered blocks is slower than resetting the complete model
+    MAX_BLOCKS = 64
 
     _default_icon = None
 
-    def __init__(self, parent, index, *, size_hint, highlighted=False, marked=False):
-        super().__init__(self.default_icon(), "", parent, index)
-        self.highlighted = highlighted
-        self.marked = marked
-        self.setSizeHint(size_hint)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._icons: Dict[str, QIcon] = {}
+        self._highlighted: Set[str] = set()
+        self._marked: Set[str] = set(api.mark.paths)
+
+        api.mark.marked.connect(self._on_marked)
+        api.mark.unmarked.connect(self._on_unmarked)
+
+    @property
+    def paths(self) -> List[str]:
+        """List of the paths of all thumbnails."""
+        return self._paths
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self._paths[index.row()]
+        if role == Qt.DecorationRole:
+            return self._icons.get(path, self.default_icon())
+        if role == self.HighlightedRole:
+            return path in self._highlighted
+        if role == self.MarkedRole:
+            return path in self._marked
+        return None
+
+    def row(self, path: str) -> Optional[int]:
+        """Return the row of path or None if it is not in the model."""
+        return self._rows.get(path)
+
+    def clear(self):
+        """Remove all thumbnails."""
+        self.beginResetModel()
+        self._paths = []
+        self._icons.clear()
+        self._update_rows()
+        self.endResetModel()
+
+    def set_paths(self, paths: List[str]) -> None:
+        """Update the model to contain paths.
+
+        If the paths that are kept remain in the same order, the rows of removed paths
+        are removed and the rows of new paths inserted block by block. Otherwise, e.g.
+        after re-ordering the paths, the model is reset.
+
+        Args:
+            paths: List of the new paths.
+        """
+        new = set(paths)
+        kept = [path for path in self._paths if path in new]
+        kept_set = set(kept)
+        if [path for path in paths if path in kept_set] != kept:
+            self._reset(paths)
+            return
+        removed = utils.blocks(
+            [row for row, path in enumerate(self._paths) if path not in new]
+        )
+        inserted = utils.blocks(
+            [row for row, path in enumerate(paths) if path not in kept_set]
+        )
+        if len(removed) + len(inserted) > self.MAX_BLOCKS:
+            self._reset(paths)
+            return
+        # Remove last block first so that the rows of the other blocks stay valid
+        for first, last in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for path in self._paths[first : last + 1]:
+                self._icons.pop(path, None)
+            del self._paths[first : last + 1]
+            self.endRemoveRows()
+        # Insert first block first as the rows are given with respect to the new paths
+        for first, last in inserted:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._paths[first:first] = paths[first : last + 1]
+            self.endInsertRows()
+        self._update_rows()
+
+    def set_icon(self, row: int, icon: QIcon) -> None:
+        """Set the created thumbnail icon of row."""
+        if 0 <= row < len(self._paths):
+            self._icons[self._paths[row]] = icon
+            self._emit_changed(row, Qt.DecorationRole)
+
+    def set_highlighted(self, paths) -> None:
+        """Highlight paths as search results and remove any previous highlighting."""
+        self._highlighted = set(paths)
+        if self._paths:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self._paths) - 1), [self.HighlightedRole]
+            )
 
     @classmethod
     def default_icon(cls):
@@ -520,3 +697,32 @@ class ThumbnailItem(QListWidgetItem):
                 frame_size=10,
             )
         )
+
+    def _reset(self, paths: List[str]) -> None:
+        """Reset the model to contain paths keeping the icons of existing paths."""
+        self.beginResetModel()
+        self._icons = {path: self._icons[path] for path in paths if path in self._icons}
+        self._paths = list(paths)
+        self._update_rows()
+        self.endResetModel()
+
+    def _update_rows(self) -> None:
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+
+    def _emit_changed(self, row: int, role: int) -> None:
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [role])
+
+    @utils.slot
+    def _on_marked(self, path: str):
+        self._marked.add(path)
+        row = self.row(path)
+        if row is not None:
+            self._emit_changed(row, self.MarkedRole)
+
+    @utils.slot
+    def _on_unmarked(self, path: str):
+        self._marked.discard(path)
+        row = self.row(path)
+        if row is not None:
+            self._emit_changed(row, self.MarkedRole)
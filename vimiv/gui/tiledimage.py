@@ -0,0 +1,239 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Graphics item to display huge images by decoding tiles on demand."""
+
+import math
+from typing import Iterator, Optional, Set, Tuple
+
+from PyQt5.QtCore import QObject, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import (
+    QImage,
+    QImageIOHandler,
+    QImageReader,
+    QPainter,
+    QPixmap,
+    QTransform,
+)
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsObject
+
+from vimiv import utils
+from vimiv.utils import log, lrucache
+
+
+_logger = log.module_logger(__name__)
+
+TileKey = Tuple[int, int, int]  # level, column, row
+
+TILE_SIZE = 512
+OVERVIEW_SIZE = 2048
+CACHE_SIZE = 256 * 2 ** 20
+
+_pool = utils.Pool.get(globalinstance=False)
+
+
+class TiledImage(QGraphicsObject):
+    """Graphics item displaying huge images by decoding the visible tiles on demand.
+
+    The image is organized as resolution pyramid in which level n is scaled down by a
+    factor of 2**n. Every level is split into tiles of TILE_SIZE pixels which are
+    decoded lazily in a thread pool using QImageReader.setClipRect and setScaledSize.
+    Only the tiles of the level matching the current zoom level are requested and
+    decoded tiles are kept in a cache of bounded size. The coarsest level fits into
+    OVERVIEW_SIZE pixels and consists of a single tile which is drawn scaled up wherever
+    the tiles of the current level are not available yet.
+
+    Attributes:
+        _cache: LRU cache of the decoded tiles.
+        _level: The pyramid level requested during the last paint event.
+        _loader: Object emitting the decoded tiles from the thread pool.
+        _overview_level: The coarsest level of the pyramid.
+        _path: Path to the image file.
+        _pending: Keys of the tiles queued for decoding.
+        _size: Size of the full resolution image.
+    """
+
+    def __init__(self, path: str, size: QSize):
+        super().__init__()
+        self._path = path
+        self._size = size
+        self._overview_level = max(
+            0, math.ceil(math.log2(max(size.width(), size.height()) / OVERVIEW_SIZE))
+        )
+        self._level = self._overview_level
+        self._cache: lrucache.LRUCache[QPixmap] = lrucache.LRUCache(
+            CACHE_SIZE, sizefunc=lambda pixmap: pixmap.width() * pixmap.height() * 4
+        )
+        self._pending: Set[TileKey] = set()
+        self._loader = TileLoader()
+        self._loader.decoded.connect(self._on_tile_decoded)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        _pool.clear()  # Tiles of any previous image are no longer required
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self._size.width(), self._size.height())
+
+    def paint(self, painter, option, _widget=None):
+        """Draw the exposed tiles of the level matching the current zoom level."""
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = self._level_for(lod)
+        if level != self._level:  # Queued tiles of the previous level are obsolete
+            _pool.clear()
+            self._pending.clear()
+            self._level = level
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        overview = self._get_tile((self._overview_level, 0, 0))
+        for key in self._tiles(level, option.exposedRect):
+            target = QRectF(self._image_rect(key))
+            pixmap = self._get_tile(key)
+            if pixmap is not None:
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+            elif overview is not None:
+                scale = overview.width() / self._size.width()
+                source = QRectF(
+                    target.x() * scale,
+                    target.y() * scale,
+                    target.width() * scale,
+                    target.height() * scale,
+                )
+                painter.drawPixmap(target, overview, source)
+        painter.restore()
+
+    def _level_for(self, lod: float) -> int:
+        """Return the pyramid level to use for the level of detail lod."""
+        if lod >= 1:
+            return 0
+        return min(math.floor(math.log2(1 / lod)), self._overview_level)
+
+    def _extent(self, level: int) -> int:
+        """Return the tile size of level in full resolution image coordinates."""
+        if level == self._overview_level:
+            return max(self._size.width(), self._size.height())
+        return TILE_SIZE * 2 ** level
+
+    def _tiles(self, level: int, rect: QRectF) -> Iterator[TileKey]:
+        """Yield the keys of all tiles in level intersecting rect."""
+        rect = rect & self.boundingRect()
+        if rect.isEmpty():
+            return
+        extent = self._extent(level)
+        for row in range(int(rect.top() // extent), math.ceil(rect.bottom() / extent)):
+            for col in range(
+                int(rect.left() // extent), math.ceil(rect.right() / extent)
+            ):
+                yield level, col, row
+
+    def _image_rect(self, key: TileKey) -> QRect:
+        """Return the rectangle of the tile in full resolution image coordinates."""
+        level, col, row = key
+        extent = self._extent(level)
+        rect = QRect(col * extent, row * extent, extent, extent)
+        return rect & QRect(0, 0, self._size.width(), self._size.height())
+
+    def _get_tile(self, key: TileKey) -> Optional[QPixmap]:
+        """Return the decoded tile from the cache or request decoding it."""
+        pixmap = self._cache.get(key)
+        if pixmap is None and key not in self._pending:
+            self._pending.add(key)
+            rect = self._image_rect(key)
+            factor = 2 ** key[0]
+            size = QSize(
+                math.ceil(rect.width() / factor), math.ceil(rect.height() / factor)
+            )
+            utils.asyncrun(
+                read_tile, self._loader, self._path, key, rect, size, pool=_pool
+            )
+        return pixmap
+
+    @utils.slot
+    def _on_tile_decoded(self, key: TileKey, image: QImage):
+        """Store the decoded tile and repaint the corresponding region."""
+        self._pending.discard(key)
+        self._cache.put(key, QPixmap.fromImage(image))
+        self.update(QRectF(self._image_rect(key)))
+
+
+class TileLoader(QObject):
+    """Helper object to emit decoded tiles from the thread pool.
+
+    Signals:
+        decoded: Emitted once a tile was decoded.
+            arg1: The key of the tile.
+            arg2: The decoded QImage.
+    """
+
+    decoded = pyqtSignal(tuple, QImage)
+
+
+def read_tile(
+    loader: TileLoader, path: str, key: TileKey, rect: QRect, size: QSize
+) -> None:
+    """Decode a single tile of the image at path.
+
+    Clipping is done in the full resolution coordinates before scaling down. This
+    allows the image handler to decode the region directly at reduced size without
+    ever holding the complete scaled image in memory. Images with an exif orientation
+    are clipped in the stored coordinates and each tile is transformed individually.
+
+    Args:
+        loader: The object used to emit the decoded tile.
+        path: Path to the image file.
+        key: The key of the tile.
+        rect: Rectangle of the tile in full resolution image coordinates.
+        size: Size to scale the tile to.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(False)  # Tiles are transformed individually
+    transformation = reader.transformation()
+    reader.setClipRect(stored_rect(rect, reader.size(), transformation))
+    if size != rect.size():
+        if transformation & QImageIOHandler.TransformationRotate90:
+            size = size.transposed()
+        reader.setScaledSize(size)
+    image = reader.read()
+    if image.isNull():
+        _logger.debug(
+            "Error reading tile %s of '%s': %s", key, path, reader.errorString()
+        )
+        return
+    loader.decoded.emit(key, transform_tile(image, transformation))
+
+
+def stored_rect(
+    rect: QRect, size: QSize, transformation: QImageIOHandler.Transformations
+) -> QRect:
+    """Return the rectangle of the stored image which is displayed at rect.
+
+    The transformation mirrors the stored image first and rotates it clockwise by 90
+    degrees afterwards, equivalent to QImageReader with auto transform.
+
+    Args:
+        rect: Rectangle in displayed image coordinates.
+        size: Size of the stored image.
+        transformation: Transformation applied to display the stored image.
+    """
+    x, y, width, height = rect.x(), rect.y(), rect.width(), rect.height()
+    if transformation & QImageIOHandler.TransformationRotate90:
+        x, y, width, height = y, size.height() - x - width, height, width
+    if transformation & QImageIOHandler.TransformationMirror:
+        x = size.width() - x - width
+    if transformation & QImageIOHandler.TransformationFlip:
+        y = size.height() - y - height
+    return QRect(x, y, width, height)
+
+
+def transform_tile(
+    image: QImage, transformation: QImageIOHandler.Transformations
+) -> QImage:
+    """Return the tile of the stored image transformed for display."""
+    mirror = bool(transformation & QImageIOHandler.TransformationMirror)
+    flip = bool(transformation & QImageIOHandler.TransformationFlip)
+    if mirror or flip:
+        image = image.mirrored(mirror, flip)
+    if transformation & QImageIOHandler.TransformationRotate90:
+        image = image.transformed(QTransform().rotate(90))
+    return image
@@ -36,16 +36,29 @@ widget has been created, the file handler emits one of:
 
 The image widget in ``vimiv.gui.image`` connects to these signals and displays
 the appropriate Qt widget.
+
+In parallel, the prefetcher in ``vimiv.imutils._prefetch`` decodes the images
+surrounding the current one in the filelist into a cache of decoded images. Standard
+images found in this cache are displayed without reading them from disk again.
 """
 
+from PyQt5.QtGui import QPixmap
+
 from vimiv.imutils import exif
 from vimiv.imutils.edit_handler import EditHandler
 from vimiv.imutils.filelist import current, pathlist
 from vimiv.imutils.filelist import SignalHandler as _FilelistSignalHandler
 from vimiv.imutils._file_handler import ImageFileHandler as _ImageFileHandler
+from vimiv.imutils._prefetch import Prefetcher as _Prefetcher
 
 
 def init():
     """Initialize the classes needed for imutils."""
     _FilelistSignalHandler()
     _ImageFileHandler()
+    _Prefetcher()
+
+
+def pixmap() -> QPixmap:
+    """Return the current pixmap, decoding the full resolution if needed."""
+    return _ImageFileHandler.instance.pixmap
@@ -6,15 +6,17 @@
 
 """Classes to deal with the actual image file."""
 
+import functools
 import os
 import shutil
 import tempfile
-from typing import List
+from typing import List, Optional
 
-from PyQt5.QtCore import QObject, QCoreApplication
-from PyQt5.QtGui import QPixmap, QImageReader, QMovie
+from PyQt5.QtCore import QObject, QCoreApplication, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QImageReader, QMovie
 
 from vimiv import api, utils, imutils
+from vimiv.imutils import _prefetch, filelist
 from vimiv.utils import files, log, asyncrun, lazy, imagereader
 
 QtSvg = lazy.import_module("PyQt5.QtSvg", optional=True)
@@ -33,21 +35,75 @@ class ImageFileHandler(QObject):
     command and is able to automatically write changes from transform or
     manipulate to file if wanted.
 
+    Regular images which are not in the cache of decoded images are decoded
+    asynchronously in the loader pool. Every new load request supersedes any previous
+    one, i.e. queued requests are removed from the pool and the results of running
+    requests are dropped once they finish. Thus only the newest image is ever emitted
+    with pixmap_loaded.
+
+    If the image.display_resolution setting is enabled, large images are first decoded
+    at screen resolution and emitted with pixmap_preview_loaded. The full resolution is
+    decoded once the image requests it via load_full_resolution, or synchronously as
+    soon as the pixmap is required for editing or writing. Huge images above the
+    image.tiling_threshold setting are never decoded as a whole but only emitted by
+    path with tiled_image_loaded. If the image.embedded_preview setting is enabled, the
+    preview embedded in the exif data is emitted with pixmap_preview_loaded while the
+    image is decoded. Once decoding is done, it is swapped in with pixmap_updated.
+
+    Class Attributes:
+        asynchronous: Decode regular images in the loader pool. Disabled for testing.
+        pool: QThreadPool used to decode regular images.
+
     Attributes:
         _edit_handler: Handler to interact with any changes to the current image.
+        _embedded_preview: True if the embedded preview of the image currently being
+            decoded is displayed.
+        _full_resolution_requested: True if the full resolution of the current preview
+            is being decoded.
+        _load_id: Identifier of the newest load request.
         _path: Path to the currently loaded QObject.
+
+    Signals:
+        _image_read: Emitted from the loader pool once an image was decoded.
+            arg1: Identifier of the load request.
+            arg2: Path to the decoded image.
+            arg3: The decoded QImage.
+            arg4: Full size of the image if only a preview was decoded, invalid else.
+            arg5: True if the zoom level should be kept.
+        _full_resolution_read: Emitted from the loader pool once the full resolution of
+                a preview was decoded.
+            arg1: Identifier of the load request.
+            arg2: The decoded QImage.
     """
 
+    asynchronous = True
+    pool = utils.Pool.get(globalinstance=False)
+    pool.setMaxThreadCount(1)  # Only the newest image is relevant
+
+    _image_read = pyqtSignal(int, str, QImage, QSize, bool)
+    _full_resolution_read = pyqtSignal(int, QImage)
+
     @api.objreg.register
     def __init__(self):
         super().__init__()
         self._path = ""
         self._edit_handler = imutils.EditHandler()
+        self._load_id = 0
+        self._full_resolution_requested = False
+        self._embedded_preview = False
 
         api.signals.new_image_opened.connect(self._on_new_image_opened)
         api.signals.all_images_cleared.connect(self._on_images_cleared)
         api.signals.image_changed.connect(self.reload)
         QCoreApplication.instance().aboutToQuit.connect(self._on_quit)
+        self._image_read.connect(self._on_image_read)
+        self._full_resolution_read.connect(self._on_full_resolution_read)
+        api.signals.load_full_resolution.connect(self._on_load_full_resolution)
+
+    @property
+    def pixmap(self) -> QPixmap:
+        """The current pixmap, decoding the full resolution if needed."""
+        return self._edit_handler.pixmap
 
     @utils.slot
     def _on_new_image_opened(self, path: str, keep_zoom: bool):
@@ -58,6 +114,7 @@ class ImageFileHandler(QObject):
     @utils.slot
     def _on_images_cleared(self):
         """Reset to default when all images were cleared."""
+        self._cancel_pending()
         self._path = ""
         self._edit_handler.clear()
 
@@ -86,18 +143,23 @@ class ImageFileHandler(QObject):
     @utils.slot
     def _on_quit(self):
         """Possibly write changes to disk on quit."""
+        self._cancel_pending()
         self._maybe_write(self._path, parallel=False)
 
     def _load(self, path: str, keep_zoom: bool):
         """Load proper displayable QWidget for a path.
 
         This reads the image using QImageReader and then emits the appropriate
-        *_loaded signal to tell the image to display a new object.
+        *_loaded signal to tell the image to display a new object. Regular images are
+        decoded by _load_image.
         """
+        self._cancel_pending()
         try:
             reader = imagereader.get_reader(path)
         except ValueError as e:
             log.error(str(e))
+            # E.g. a file with the extension of an image when detecting by extension
+            QTimer.singleShot(0, functools.partial(filelist.discard, path))
             return
         # SVG
         if reader.is_vectorgraphic and QtSvg is not None:
@@ -113,17 +175,207 @@ class ImageFileHandler(QObject):
                 return
             api.signals.movie_loaded.emit(movie, keep_zoom)
             self._edit_handler.clear()
+        # Huge image
+        elif self._is_huge(reader):
+            api.signals.tiled_image_loaded.emit(path, reader.size, keep_zoom)
+            self._edit_handler.clear()
         # Regular image
         else:
+            self._load_image(reader, keep_zoom)
+            return
+        self._path = path
+
+    def _load_image(self, reader: imagereader.BaseReader, keep_zoom: bool) -> None:
+        """Load a regular image from the cache, asynchronously or directly."""
+        self._embedded_preview = False
+        preview_size = _prefetch.preview_size(reader, _prefetch.display_size())
+        image = preview = None
+        # Only look up once so the hit rate of the cache is not biased
+        if preview_size is None or _prefetch.is_cached(reader.path):
+            image = _prefetch.get_cached(reader.path)
+        else:
+            preview = _prefetch.get_cached(reader.path, preview_size)
+        if image is not None:
+            _logger.debug("Loading '%s' from cache", reader.path)
+            self._load_pixmap(reader.path, QPixmap.fromImage(image), keep_zoom)
+        elif preview is not None:
+            _logger.debug("Loading preview of '%s' from cache", reader.path)
+            self._load_preview(
+                reader.path, QPixmap.fromImage(preview), reader.size, keep_zoom
+            )
+        elif not _prefetch.is_cacheable(reader):
             try:
                 pixmap = reader.get_pixmap()
             except ValueError as e:
                 log.error("%s", e)
                 return
-            self._edit_handler.pixmap = pixmap
-            api.signals.pixmap_loaded.emit(pixmap, keep_zoom)
+            self._load_pixmap(reader.path, pixmap, keep_zoom)
+        elif self.asynchronous:
+            _logger.debug("Loading '%s' asynchronously", reader.path)
+            if api.settings.image.embedded_preview.value:
+                self._load_embedded_preview(reader, keep_zoom)
+            utils.asyncrun(
+                self._read_image,
+                self._load_id,
+                reader,
+                preview_size,
+                keep_zoom,
+                pool=self.pool,
+            )
+        else:
+            self._read_image(self._load_id, reader, preview_size, keep_zoom)
+
+    @staticmethod
+    def _is_huge(reader: imagereader.BaseReader) -> bool:
+        """Return True if the image of reader should be displayed in tiles."""
+        threshold = api.settings.image.tiling_threshold.value
+        if not threshold or not reader.is_tileable:
+            return False
+        size = reader.size
+        return size.width() * size.height() >= threshold * 1e6
+
+    def _load_pixmap(self, path: str, pixmap: QPixmap, keep_zoom: bool) -> None:
+        """Update the current path and pixmap and emit the pixmap_loaded signal."""
+        self._edit_handler.pixmap = pixmap
+        api.signals.pixmap_loaded.emit(pixmap, keep_zoom)
+        self._path = path
+
+    def _load_preview(
+        self, path: str, pixmap: QPixmap, size: QSize, keep_zoom: bool
+    ) -> None:
+        """Update the current path and preview and emit pixmap_preview_loaded."""
+        self._full_resolution_requested = False
+        loader = functools.partial(self._load_full_resolution, path)
+        self._edit_handler.set_preview(pixmap, loader)
+        api.signals.pixmap_preview_loaded.emit(pixmap, size, keep_zoom)
         self._path = path
 
+    def _load_embedded_preview(
+        self, reader: imagereader.BaseReader, keep_zoom: bool
+    ) -> None:
+        """Display the preview embedded in the exif data of reader if there is one."""
+        preview = imutils.exif.read_embedded_preview(reader.path)
+        size = reader.size
+        if not preview.isNull() and size.isValid():
+            _logger.debug("Displaying embedded preview of '%s'", reader.path)
+            self._load_preview(reader.path, QPixmap.fromImage(preview), size, keep_zoom)
+            self._embedded_preview = True
+
+    def _update_preview(self, path: str, pixmap: QPixmap, size: QSize) -> None:
+        """Replace the embedded preview once the image has been decoded.
+
+        In case the pixmap has been loaded already as it was required for editing, the
+        decoded image is obsolete.
+        """
+        self._embedded_preview = False
+        if not self._edit_handler.is_preview:
+            return
+        if size.isValid():
+            loader = functools.partial(self._load_full_resolution, path)
+            self._edit_handler.set_preview(pixmap, loader)
+        else:
+            self._edit_handler.pixmap = pixmap
+        api.signals.pixmap_updated.emit(pixmap)
+
+    def _load_full_resolution(self, path: str) -> QPixmap:
+        """Synchronously decode the full resolution of the current preview."""
+        _logger.debug("Loading full resolution of '%s'", path)
+        try:
+            image = _prefetch.read_image(imagereader.get_reader(path))
+        except ValueError as e:
+            log.error("%s", e)
+            return QPixmap()
+        pixmap = QPixmap.fromImage(image)
+        api.signals.pixmap_updated.emit(pixmap)
+        return pixmap
+
+    def _cancel_pending(self) -> None:
+        """Supersede any load request that is queued or running."""
+        self._load_id += 1
+        self.pool.clear()
+
+    def _read_image(
+        self,
+        load_id: int,
+        reader: imagereader.BaseReader,
+        preview_size: Optional[int],
+        keep_zoom: bool,
+    ) -> None:
+        """Decode the image of reader in the loader pool.
+
+        Requests that were superseded before the decoding started are skipped.
+
+        Args:
+            load_id: Identifier of the load request.
+            reader: Image reader of the image to decode.
+            preview_size: Size to decode a preview at, None to decode the full image.
+            keep_zoom: True if the zoom level should be kept.
+        """
+        if load_id != self._load_id:
+            return
+        try:
+            image = _prefetch.read_image(reader, preview_size)
+            size = reader.size if preview_size is not None else QSize()
+        except ValueError as e:
+            if load_id == self._load_id:
+                log.error("%s", e)
+            return
+        self._image_read.emit(load_id, reader.path, image, size, keep_zoom)
+
+    @utils.slot
+    def _on_image_read(
+        self, load_id: int, path: str, image: QImage, size: QSize, keep_zoom: bool
+    ):
+        """Display the decoded image unless the request has been superseded."""
+        if load_id != self._load_id:
+            _logger.debug("Dropping superseded image '%s'", path)
+            return
+        pixmap = QPixmap.fromImage(image)
+        if self._embedded_preview:
+            self._update_preview(path, pixmap, size)
+        elif size.isValid():
+            self._load_preview(path, pixmap, size, keep_zoom)
+        else:
+            self._load_pixmap(path, pixmap, keep_zoom)
+
+    @utils.slot
+    def _on_load_full_resolution(self):
+        """Decode the full resolution of the current preview if it is required."""
+        if (
+            not self._edit_handler.is_preview
+            or self._full_resolution_requested
+            or self._embedded_preview  # The image is being decoded already
+        ):
+            return
+        self._full_resolution_requested = True
+        if self.asynchronous:
+            utils.asyncrun(
+                self._read_full_resolution, self._load_id, self._path, pool=self.pool
+            )
+        else:  # Accessing the pixmap of the preview loads the full resolution
+            self._edit_handler.pixmap  # pylint: disable=pointless-statement
+
+    def _read_full_resolution(self, load_id: int, path: str) -> None:
+        """Decode the full resolution of the current preview in the loader pool."""
+        if load_id != self._load_id:
+            return
+        try:
+            image = _prefetch.read_image(imagereader.get_reader(path))
+        except ValueError as e:
+            if load_id == self._load_id:
+                log.error("%s", e)
+            return
+        self._full_resolution_read.emit(load_id, image)
+
+    @utils.slot
+    def _on_full_resolution_read(self, load_id: int, image: QImage):
+        """Replace the current preview unless it was superseded or loaded already."""
+        if load_id != self._load_id or not self._edit_handler.is_preview:
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._edit_handler.pixmap = pixmap
+        api.signals.pixmap_updated.emit(pixmap)
+
     @api.commands.register(mode=api.modes.IMAGE)
     def write(self, path: List[str]):
         """Save the current image to disk.
@@ -192,6 +444,8 @@ def _can_write(pixmap, path):
     """
     if not isinstance(pixmap, QPixmap):
         raise WriteError("Cannot write animations")
+    if pixmap.isNull():
+        raise WriteError("Cannot write empty image")
     if os.path.exists(path):  # Override current path
         reader = QImageReader(path)
         if not reader.canRead():
@@ -0,0 +1,187 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Prefetch images around the current image into a cache of decoded images.
+
+Whenever a new image is opened, the images before and after it in the filelist are
+decoded in parallel and stored as QImage in a least-recently-used cache. The file
+handler checks this cache before reading an image from disk, so navigating through the
+filelist is served from memory. The number of neighbours is defined by the
+``image.prefetch`` setting, the memory available to the cache by ``image.cache_size``.
+
+Only images that can be read outside of the main thread are prefetched, i.e. neither
+animations, vector graphics nor formats provided by external handlers. If the
+``image.display_resolution`` setting is enabled, large images are prefetched and cached
+at screen resolution only.
+
+Module Attributes:
+    cache: The LRUCache instance storing decoded images.
+"""
+
+import os
+from typing import Hashable, Optional
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+
+from vimiv import api, utils
+from vimiv.imutils import filelist
+from vimiv.utils import files, imagereader, log, lrucache
+
+
+MIB = 1024 ** 2
+
+_logger = log.module_logger(__name__)
+
+cache: lrucache.LRUCache[QImage] = lrucache.LRUCache(
+    maxsize=api.settings.image.cache_size.value * MIB,
+    sizefunc=lambda image: image.byteCount(),
+)
+
+
+def cache_key(path: str, size: Optional[int] = None) -> Hashable:
+    """Return the key of path in the cache.
+
+    The modification time is part of the key so images changed on disk are re-read.
+
+    Args:
+        path: Path to the image.
+        size: Size of the preview, None for the full resolution.
+    Raises:
+        OSError if the path cannot be accessed.
+    """
+    return path, os.path.getmtime(path), size
+
+
+def get_cached(path: str, size: Optional[int] = None) -> Optional[QImage]:
+    """Return the cached image or preview of size for path if any."""
+    try:
+        return cache.get(cache_key(path, size))
+    except OSError:
+        return None
+
+
+def is_cached(path: str, size: Optional[int] = None) -> bool:
+    """True if the full resolution or the preview of size for path is cached."""
+    try:
+        return cache_key(path) in cache or (
+            size is not None and cache_key(path, size) in cache
+        )
+    except OSError:
+        return False
+
+
+def display_size() -> Optional[int]:
+    """Return the size to decode previews at, None if display resolution is disabled.
+
+    This must be called from the main thread.
+    """
+    if not api.settings.image.display_resolution.value:
+        return None
+    screen = QApplication.desktop().screenGeometry()
+    ratio = QApplication.instance().devicePixelRatio()
+    return int(max(screen.width(), screen.height()) * ratio)
+
+
+def preview_size(reader: imagereader.BaseReader, size: Optional[int]) -> Optional[int]:
+    """Return the size to decode a preview at, None if the full image is needed.
+
+    Args:
+        reader: Image reader of the image to decode.
+        size: Size to decode previews at as returned by display_size.
+    """
+    if size is None:
+        return None
+    full_size = reader.size
+    if not full_size.isValid() or max(full_size.width(), full_size.height()) <= size:
+        return None
+    return size
+
+
+def is_cacheable(reader: imagereader.BaseReader) -> bool:
+    """True if the image of reader can be decoded into the cache."""
+    return (
+        reader.is_threadsafe and not reader.is_animation and not reader.is_vectorgraphic
+    )
+
+
+def read_image(reader: imagereader.BaseReader, size: Optional[int] = None) -> QImage:
+    """Read the image using reader and store it in the cache.
+
+    Args:
+        reader: Image reader of the image to read.
+        size: Size to read a preview at, None for the full resolution.
+    Raises:
+        ValueError if the image cannot be read.
+    """
+    try:
+        key = cache_key(reader.path, size)
+    except OSError as e:
+        raise ValueError(f"Error reading image '{reader.path}': {e}")
+    image = reader.get_image(size)
+    cache.put(key, image)
+    return image
+
+
+@api.status.module("{image-cache-hit-rate}")
+def hit_rate() -> str:
+    """Percentage of images loaded from the cache of decoded images."""
+    return f"{cache.hit_rate * 100:.0f}%"
+
+
+@api.status.module("{image-cache-memory}")
+def memory() -> str:
+    """Memory used by the cache of decoded images."""
+    return files.sizeof_fmt(cache.size)
+
+
+class Prefetcher(QObject):
+    """Decode the neighbours of the current image in parallel.
+
+    Class Attributes:
+        pool: QThreadPool used to decode the images.
+    """
+
+    pool = utils.Pool.get(globalinstance=False)
+
+    @api.objreg.register
+    def __init__(self):
+        super().__init__()
+        api.signals.new_image_opened.connect(self._on_new_image_opened)
+        api.signals.all_images_cleared.connect(self.pool.clear)
+        # The cache is created before the configuration is read
+        self._on_cache_size_changed(api.settings.image.cache_size.value)
+        api.settings.image.cache_size.changed.connect(self._on_cache_size_changed)
+
+    @utils.slot
+    def _on_new_image_opened(self, _path: str, _keep_zoom: bool):
+        """Start decoding the neighbours of the new image that are not cached yet."""
+        self.pool.clear()  # Neighbours of the previous image are no longer relevant
+        size = display_size()
+        for path in filelist.neighbours(api.settings.image.prefetch.value):
+            if not is_cached(path, size):
+                _logger.debug("Prefetching '%s'", path)
+                utils.asyncrun(self._prefetch, path, size, pool=self.pool)
+
+    @staticmethod
+    def _prefetch(path: str, size: Optional[int]) -> None:
+        """Decode a single image into the cache ignoring any errors.
+
+        Args:
+            path: Path to the image to decode.
+            size: Size to decode large images at as returned by display_size.
+        """
+        try:
+            reader = imagereader.get_reader(path)
+            if is_cacheable(reader):
+                read_image(reader, preview_size(reader, size))
+        except ValueError as e:
+            _logger.debug("Not prefetching '%s': %s", path, e)
+
+    @staticmethod
+    def _on_cache_size_changed(value: int) -> None:
+        cache.maxsize = value * MIB
@@ -6,6 +6,8 @@
 
 """Storage class for the current pixmap."""
 
+from typing import Callable, Optional
+
 from PyQt5.QtGui import QPixmap
 
 
@@ -16,14 +18,48 @@ class CurrentPixmap:
     classes that wish to access the pixmap simultaneously. Like this they can all share
     this class and access the pixmap through it.
 
+    In case only a reduced-size preview of the image was loaded, the full resolution is
+    loaded as soon as the pixmap is accessed. This ensures edits are always applied to
+    the full resolution.
+
     Attributes:
-        pixmap: The current, possibly edited, pixmap.
+        _pixmap: The current, possibly edited, pixmap.
+        _loader: Function to load the full resolution if _pixmap is a preview.
     """
 
     def __init__(self):
-        self.pixmap = QPixmap()
+        self._pixmap = QPixmap()
+        self._loader: Optional[Callable[[], QPixmap]] = None
+
+    @property
+    def pixmap(self) -> QPixmap:
+        """The current pixmap, loading the full resolution if needed."""
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            self._pixmap = loader()
+        return self._pixmap
+
+    @pixmap.setter
+    def pixmap(self, pixmap: QPixmap) -> None:
+        self._pixmap = pixmap
+        self._loader = None
+
+    def set_preview(self, pixmap: QPixmap, loader: Callable[[], QPixmap]) -> None:
+        """Store a preview of the current image.
+
+        Args:
+            pixmap: The reduced-size preview.
+            loader: Function returning the full resolution pixmap once it is needed.
+        """
+        self._pixmap = pixmap
+        self._loader = loader
+
+    @property
+    def is_preview(self) -> bool:
+        """True if only a preview of the full resolution image is stored."""
+        return self._loader is not None
 
     @property
     def editable(self) -> bool:
         """True if the currently opened image is transformable/manipulatable."""
-        return not self.pixmap.isNull()
+        return not self._pixmap.isNull()
@@ -52,6 +52,20 @@ class EditHandler(QObject):
     def pixmap(self, pixmap):
         self._current_pixmap.pixmap = self.transform.original = pixmap
 
+    @property
+    def is_preview(self):
+        """True if only a preview of the current image has been loaded."""
+        return self._current_pixmap.is_preview
+
+    def set_preview(self, pixmap, loader):
+        """Set a preview pixmap, the full resolution is retrieved from loader on demand.
+
+        The original of transform is retrieved from the current pixmap once it is
+        needed and therefore also has full resolution.
+        """
+        self._current_pixmap.set_preview(pixmap, loader)
+        self.transform.original = None
+
     def reset(self):
         self.transform.reset()
         self._manipulated = False
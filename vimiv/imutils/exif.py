@@ -16,6 +16,9 @@ import contextlib
 import itertools
 from typing import Any, Dict, Tuple, NoReturn, Sequence, Iterable
 
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QImageIOHandler, QImageReader, QTransform
+
 from vimiv.utils import log, lazy, is_hex
 
 pyexiv2 = lazy.import_module("pyexiv2", optional=True)
@@ -63,6 +66,10 @@ class _ExifHandlerBase:
         """Retrieve the name of all exif keys available."""
         self.raise_exception("Getting exif keys")
 
+    def get_embedded_preview(self) -> bytes:
+        """Retrieve the encoded preview image embedded in the exif data if any."""
+        self.raise_exception("Retrieving the embedded preview")
+
     @classmethod
     def raise_exception(cls, operation: str) -> NoReturn:
         """Raise an exception for a not implemented exif operation."""
@@ -141,6 +148,11 @@ class _ExifHandlerPiexif(_ExifHandlerBase):
             for tag in self._metadata[ifd]
         )
 
+    def get_embedded_preview(self) -> bytes:
+        if self._metadata is None:
+            return b""
+        return self._metadata.get("thumbnail") or b""
+
     def copy_exif(self, dest: str, reset_orientation: bool = True) -> None:
         try:
             if reset_orientation:
@@ -239,6 +251,12 @@ class ExifHandler(_ExifHandlerBase):
     def get_keys(self) -> Iterable[str]:
         return (key for key in self._metadata if not is_hex(key.rpartition(".")[2]))
 
+    def get_embedded_preview(self) -> bytes:
+        previews = self._metadata.previews  # Sorted by increasing size
+        if not previews:
+            return b""
+        return previews[-1].data
+
     def copy_exif(self, dest: str, reset_orientation: bool = True) -> None:
         if reset_orientation:
             with contextlib.suppress(KeyError):
@@ -270,6 +288,53 @@ class ExifHandler(_ExifHandlerBase):
 has_exif_support = ExifHandler != _ExifHandlerBase
 
 
+def read_embedded_preview(path: str, min_size: int = 0) -> QImage:
+    """Read the preview image embedded in the exif data of path.
+
+    The preview is transformed according to the orientation of the image. Previews
+    smaller than min_size or with an aspect ratio different from the image, e.g. due to
+    black bars, are not usable as replacement of the image and are therefore ignored.
+
+    Args:
+        path: Path to the image to read the preview from.
+        min_size: Minimum size of the longer side of the preview.
+    Returns:
+        The preview as QImage which is null if there is no usable preview.
+    """
+    try:
+        data = ExifHandler(path).get_embedded_preview()
+    except (UnsupportedExifOperation, ValueError, OSError) as e:
+        _logger.debug("No embedded preview in '%s': %s", path, e)
+        return QImage()
+    preview = QImage.fromData(data)
+    if preview.isNull() or max(preview.width(), preview.height()) < min_size:
+        return QImage()
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    preview = _transformed(preview, reader.transformation())
+    size = reader.size()
+    if reader.transformation() & QImageIOHandler.TransformationRotate90:
+        size.transpose()
+    if size.isEmpty():
+        return QImage()
+    ratio = size.width() / size.height()
+    if abs(preview.width() / preview.height() - ratio) > 0.01 * ratio:
+        _logger.debug("Ignoring embedded preview in '%s' due to aspect ratio", path)
+        return QImage()
+    return preview
+
+
+def _transformed(image: QImage, transformation: int) -> QImage:
+    """Apply the QImageIOHandler transformation to image like QImageReader does."""
+    if transformation & QImageIOHandler.TransformationMirror:
+        image = image.mirrored(True, False)
+    if transformation & QImageIOHandler.TransformationFlip:
+        image = image.mirrored(False, True)
+    if transformation & QImageIOHandler.TransformationRotate90:
+        image = image.transformed(QTransform().rotate(90), Qt.SmoothTransformation)
+    return image
+
+
 class ExifOrientation:
     """Namespace for exif orientation tags.
 
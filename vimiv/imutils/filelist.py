@@ -10,6 +10,7 @@ The module provides methods to navigate and update the current image filelist. O
 new image in the filelist is selected, it is passed on to the file handler to open it.
 """
 
+import heapq
 import os
 import random
 from typing import List, Iterable, Optional
@@ -133,6 +134,22 @@ def pathlist() -> List[str]:
     return _paths
 
 
+def neighbours(count: int) -> List[str]:
+    """Return up to count paths before and after the current path.
+
+    The paths are ordered by their distance to the current path starting with the next
+    one. Wrapping around at the end of the filelist is taken into account like in
+    next_path and prev_path.
+    """
+    paths: List[str] = []
+    for distance in range(1, min(count, len(_paths) // 2) + 1):
+        for index in _index + distance, _index - distance:
+            path = _paths[index % len(_paths)]
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
 class SignalHandler(QObject):
     """Class required to interact with Qt signals.
 
@@ -205,12 +222,15 @@ class SignalHandler(QObject):
         """React when images were changed by another process.
 
         Any removed paths are cleared from the image filelist. In case we had the
-        complete directory loaded, any added paths are also added to the filelist.
+        complete directory loaded, any added paths are also added to the filelist. This
+        includes chunks of huge directories that are added once they were scanned.
         """
         paths = [path for path in _paths if path not in removed]
-        if set(paths + added) == set(new_paths):
+        if added and _contains_directory(paths, new_paths, added):
             _logger.debug("Adding %s to image filelist", added)
-            paths = new_paths
+            # Explicitly opened images of chunks that have not been scanned yet
+            pending = sorted(set(paths).difference(new_paths))
+            paths = list(heapq.merge(new_paths, pending))
         if not paths:
             _clear()
             api.status.update("Image filelist cleared")
@@ -219,6 +239,38 @@ class SignalHandler(QObject):
             api.status.update("Image filelist changed")
 
 
+def _contains_directory(
+    paths: List[str], new_paths: List[str], added: List[str]
+) -> bool:
+    """Return True if paths contain all images the directory had before the change.
+
+    Args:
+        paths: Paths of the filelist with any removed paths cleared.
+        new_paths: All images in the directory after the change.
+        added: Images added to the directory within the change.
+    """
+    directory = os.path.dirname(added[0])
+    if any(os.path.dirname(path) != directory for path in paths):
+        return False
+    return set(new_paths).difference(added) <= set(paths)
+
+
+def discard(path: str) -> None:
+    """Remove path from the filelist as it cannot be read as image.
+
+    The image at the same index is opened instead if path is the current image.
+    """
+    if path not in _paths:
+        return
+    _logger.debug("Removing '%s' from image filelist", path)
+    paths = [other for other in _paths if other != path]
+    if paths:
+        _load_paths(paths, current())
+    else:
+        _clear()
+        api.status.update("Image filelist cleared")
+
+
 def _set_index(index: int, previous: str = None, *, keep_zoom: bool = False) -> None:
     """Set the global _index to index."""
     global _index
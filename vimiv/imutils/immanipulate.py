@@ -20,14 +20,18 @@ includes components of the previous class in the hierarchy.
 
 Adding new manipulations is done by implementing a new :class:`ManipulationGroup` and
 adding it to the ``Manipulations``.
+
+Groups implemented in the C-extension can additionally describe their changes as an
+operation of the fused pipeline. If all groups to apply support this, the operations are
+applied in a single pass over the image data instead of one pass per group.
 """
 
 import abc
 import copy
-from typing import Optional, NamedTuple, List
+from typing import Any, Callable, Optional, NamedTuple, List, Tuple, Union
 
-from PyQt5.QtCore import QObject, pyqtSignal, Qt, QSignalBlocker, QTimer
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import QObject, pyqtSignal, Qt, QSignalBlocker, QThread, QTimer
+from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QLabel, QApplication
 
 from vimiv import api, utils, widgets
@@ -39,6 +43,13 @@ from vimiv.imutils import _c_manipulate  # type: ignore
 
 _logger = utils.log.module_logger(__name__)
 
+# Operation of the fused pipeline of the C-extension, either a lookup table of 256
+# channel values or a tuple of hue, saturation and lightness
+Operation = Union[bytes, Tuple[float, float, float]]
+
+# Image data smaller than this in bytes is not split into bands processed in parallel
+MIN_BANDSIZE = 1024 * 1024
+
 
 class Limits(NamedTuple):
     """Storage class for manipulation value limits."""
@@ -171,14 +182,25 @@ class ManipulationGroup(abc.ABC):
                 return True
         return False
 
-    def apply(self, data: bytes) -> bytes:
+    def apply(self, data: memoryview) -> None:
         """Apply manipulation function to image data if any manipulation changed.
 
         Wraps the abstract :func:`_apply` with a common setup and finalize part.
         """
+        if self.changed:
+            self._apply(data, *self.manipulations)
+
+    def operations(self) -> Optional[List[Operation]]:
+        """Return the operations of the fused pipeline to apply this group.
+
+        Returns:
+            An empty list if no manipulation changed, None if the group does not
+            support the fused pipeline.
+        """
         if not self.changed:
-            return data
-        return self._apply(data, *self.manipulations)
+            return []
+        operation = self._operation(*self.manipulations)
+        return [operation] if operation is not None else None
 
     @property
     @abc.abstractmethod
@@ -189,22 +211,27 @@ class ManipulationGroup(abc.ABC):
         """
 
     @abc.abstractmethod
-    def _apply(self, data: bytes, *manipulations: Manipulation) -> bytes:
+    def _apply(self, data: memoryview, *manipulations: Manipulation) -> None:
         """Apply all manipulations of this group.
 
-        Takes the image data as raw bytes, applies the changes according the current
-        manipulation values and returns the updated bytes. In general this is associated
-        with a call to a function implemented in the C-extension which manipulates the
-        raw data.
+        Takes the image data as writable buffer and applies the changes according the
+        current manipulation values in place. In general this is associated with a call
+        to a function implemented in the C-extension which manipulates the raw data
+        without holding the global interpreter lock.
 
         Must be implemented by the child class.
 
         Args:
-            data: The raw image data in bytes to manipulate.
-        Returns:
-            The updated raw image data in bytes.
+            data: Writable buffer of the raw image data to manipulate.
         """
 
+    def _operation(self, *_manipulations: Manipulation) -> Optional[Operation]:
+        """Return the operation of the fused pipeline equivalent to :func:`_apply`.
+
+        May be implemented by the child class to support the fused pipeline.
+        """
+        return None
+
 
 class BriConGroup(ManipulationGroup):
     """Manipulation group for brightness and contrast."""
@@ -220,8 +247,12 @@ class BriConGroup(ManipulationGroup):
         return "Bri | Con"
 
     def _apply(self, data, brightness, contrast):
-        return _c_manipulate.brightness_contrast(
-            data, brightness.value / 255, contrast.value / 255
+        lut = self._operation(brightness, contrast)
+        run_in_bands(_c_manipulate.apply_lut_inplace, data, lut)
+
+    def _operation(self, brightness, contrast):
+        return _c_manipulate.brightness_contrast_lut(
+            brightness.value / 255, contrast.value / 255
         )
 
 
@@ -243,23 +274,86 @@ class HSLGroup(ManipulationGroup):
         return "Hue | Sat | Light"
 
     def _apply(self, data, hue, saturation, lightness):
-        return _c_manipulate.hue_saturation_lightness(
+        run_in_bands(
+            _c_manipulate.hue_saturation_lightness_inplace,
             data,
+            *self._operation(hue, saturation, lightness),
+        )
+
+    def _operation(self, hue, saturation, lightness):
+        return (
             hue.value,
             saturation.value / saturation.limits.upper,
             lightness.value / lightness.limits.upper,
         )
 
 
+class BandRunnable(utils.GenericRunnable):
+    """Runnable processing one band of image data storing any raised exception.
+
+    Attributes:
+        exception: The exception raised when running the function if any.
+    """
+
+    def __init__(self, function: Callable[..., None], *args: Any):
+        super().__init__(function, *args)
+        self.setAutoDelete(False)
+        self.exception: Optional[Exception] = None
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as e:  # pylint: disable=broad-except  # Re-raised in caller
+            self.exception = e
+
+
+def run_in_bands(function: Callable[..., None], data: memoryview, *args: Any) -> None:
+    """Run a manipulate function of the C-extension on bands of data in parallel.
+
+    The functions of the C-extension release the global interpreter lock, so the
+    bands are processed in parallel by the threads of the band pool. Every band
+    contains a whole number of pixels.
+
+    Args:
+        function: The function to run on each band in place.
+        data: Writable buffer of the raw image data to manipulate.
+        args: Further arguments passed to the function.
+    """
+    n_bands = band_pool.maxThreadCount()
+    bandsize = -(-len(data) // (4 * n_bands)) * 4  # Ceil to whole pixels
+    if n_bands == 1 or bandsize < MIN_BANDSIZE:
+        function(data, *args)
+        return
+    runnables = [
+        BandRunnable(function, data[start : start + bandsize], *args)
+        for start in range(0, len(data), bandsize)
+    ]
+    for runnable in runnables:
+        band_pool.start(runnable)
+    band_pool.waitForDone()
+    for runnable in runnables:
+        if runnable.exception is not None:
+            raise runnable.exception
+
+
+def _on_threads_changed(value: int) -> None:
+    band_pool.setMaxThreadCount(value if value > 0 else QThread.idealThreadCount())
+
+
+band_pool = utils.Pool.get(globalinstance=False)
+_on_threads_changed(api.settings.manipulate.threads.value)
+api.settings.manipulate.threads.changed.connect(_on_threads_changed)
+
+
 class ManipulationChange(NamedTuple):
     """Storage class for a manipulation change.
 
     Attributes:
-        pixmap: The manipulated pixmap.
+        pixmap: The manipulated pixmap, None if it is still being computed.
         manipulations: The manipulation group associated to these changes.
     """
 
-    pixmap: QPixmap
+    pixmap: Optional[QPixmap]
     manipulations: ManipulationGroup
 
 
@@ -271,7 +365,8 @@ class Manipulations(list):
     manipulations.
 
     Applying manipulations can be done for a single manipulation using apply and for
-    multiple groups using apply_groups.
+    multiple groups using apply_groups. If all groups support the fused pipeline, their
+    operations are applied in a single pass.
 
     Attributes:
         groups: Tuple of all manipulation groups.
@@ -298,30 +393,47 @@ class Manipulations(list):
             The manipulated pixmap.
         """
         _logger.debug("Manipulate: applying %d groups", len(groups))
-        # Convert original pixmap to python bytes
+        # Access the data of a detached image of the pixmap as writable buffer
         image = pixmap.toImage()
-        bits = image.constBits()
+        bits = image.bits()
         bits.setsize(image.byteCount())
-        data = bits.asstring()
-        # Apply changes on the byte-level
+        data = memoryview(bits)
+        # Apply changes on the byte-level in place
+        operations = self.operations(*groups)
+        if operations is None:  # Some group does not support the fused pipeline
+            for group in groups:
+                self._apply_group(group, data)
+        elif operations:
+            _logger.debug("Manipulate: applying %d fused operations", len(operations))
+            run_in_bands(_c_manipulate.apply_pipeline_inplace, data, operations)
+        data.release()
+        return QPixmap.fromImage(image)
+
+    @staticmethod
+    def operations(*groups: Optional[ManipulationGroup]) -> Optional[List[Operation]]:
+        """Return the operations of the fused pipeline to apply all groups in series.
+
+        Returns:
+            The list of operations or None if any group does not support the pipeline.
+        """
+        operations: List[Operation] = []
         for group in groups:
-            data = self._apply_group(group, data)
-        # Convert updated bytes back to pixmap
-        image = QImage(
-            data, image.width(), image.height(), image.bytesPerLine(), image.format()
-        )
-        return QPixmap(image.copy())  # copy ensures correct data storage via Qt
+            if group is not None:
+                group_operations = group.operations()
+                if group_operations is None:
+                    return None
+                operations.extend(group_operations)
+        return operations
 
     def apply(self, pixmap: QPixmap, manipulation: Manipulation) -> QPixmap:
         """Manipulate pixmap according to single manipulation."""
         return self.apply_groups(pixmap, self.group(manipulation))
 
-    def _apply_group(self, group: Optional[ManipulationGroup], data: bytes) -> bytes:
-        """Apply manipulations of a single group to image."""
-        if group is None:
-            return data
-        _logger.debug("Manipulate: applying group %r", group)
-        return group.apply(data)
+    def _apply_group(self, group: Optional[ManipulationGroup], data: memoryview):
+        """Apply manipulations of a single group to image data in place."""
+        if group is not None:
+            _logger.debug("Manipulate: applying group %r", group)
+            group.apply(data)
 
 
 class Manipulator(QObject):
@@ -330,8 +442,17 @@ class Manipulator(QObject):
     Provides commands for more complex manipulations like brightness and
     contrast. Acts as binding link between the manipulations and the gui interface.
 
+    The preview is rendered progressively. Every change of a manipulation is applied to
+    a low resolution proxy right away. The preview at display resolution follows once
+    the input pauses. Saved changes are applied to the proxy and, if the preview at
+    display resolution is outdated, to the pixmap in the thread pools as well. As each
+    pool runs one thread, following previews are applied on top of the saved changes.
+
     Class Attributes:
-        pool: QThreadPool to apply manipulations in parallel.
+        PROXY_SCALE: Factor by which the proxy is smaller than the display resolution.
+        REFINE_DELAY_MS: Time without input before the preview is refined.
+        pool: QThreadPool to apply manipulations at display resolution in parallel.
+        proxy_pool: QThreadPool to apply manipulations to the proxy in parallel.
 
     Attributes:
         manipulations: Manipulations class storing all manipulations.
@@ -339,21 +460,35 @@ class Manipulator(QObject):
         _changes: List of applied ManipulationChanges.
         _current_manipulation: Currently edited/focused manipulation.
         _current_pixmap: Class to access the currently displayed pixmap.
-        _pixmap: Pixmap to apply current manipulation to.
-        _manipulated: Pixmap after applying current manipulation.
+        _generation: Number of the current manipulation update, incremented to drop
+            outdated previews.
+        _manipulated: Last preview at display resolution.
+        _pixmap: Pixmap at display resolution to apply current manipulation to.
+        _proxy: Low resolution proxy of the pixmap to apply current manipulation to.
+        _refined: Number of the last manipulation update shown at display resolution.
 
     Signals:
         accepted: Emitted when the applied manipulations where accepted.
             arg1: The manipulated pixmap with the accepted changes.
         updated: Emitted when the manipulated pixmap was changed.
             arg1: The new manipulated QPixmap.
+        _computed: Emitted by the thread pools when a preview was computed.
+            arg1: Number of the manipulation update the preview belongs to.
+            arg2: True if the preview is at display resolution.
+            arg3: The manipulated QPixmap.
     """
 
+    PROXY_SCALE = 4
+    REFINE_DELAY_MS = 150
+
     pool = utils.Pool.get(globalinstance=False)
     pool.setMaxThreadCount(1)  # Only one manipulation is run in parallel
+    proxy_pool = utils.Pool.get(globalinstance=False)
+    proxy_pool.setMaxThreadCount(1)
 
     accepted = pyqtSignal(QPixmap)
     updated = pyqtSignal(QPixmap)
+    _computed = pyqtSignal(int, bool, QPixmap)
 
     @api.objreg.register
     def __init__(self, current_pixmap):
@@ -365,31 +500,28 @@ class Manipulator(QObject):
         self._current_manipulation = self.manipulations[0]  # Default manipulation
         self._current_manipulation.focus()
         self._current_pixmap = current_pixmap
-        self._pixmap = self._manipulated = None
+        self._pixmap: Optional[QPixmap] = None
+        self._proxy: Optional[QPixmap] = None
+        self._manipulated: Optional[QPixmap] = None
+        self._generation = self._refined = 0
 
         api.modes.MANIPULATE.entered.connect(self._enter)
         api.modes.MANIPULATE.closed.connect(self._reset)
-        self.updated.connect(self._on_updated)
+        self._computed.connect(self._on_computed)
         for manipulation in self.manipulations:
             manipulation.updated.connect(self._apply_manipulation)
 
-    @property
-    def _changed(self):
-        """True if anything was edited."""
-        for manipulation in self.manipulations:
-            if manipulation.changed:
-                return True
-        return False
-
     @api.keybindings.register("<return>", "accept", mode=api.modes.MANIPULATE)
     @api.commands.register(mode=api.modes.MANIPULATE)
     def accept(self):
         """Leave manipulate accepting the applied changes."""
-        if self._changed:  # Only run the expensive part when needed
-            self._save_changes()  # For the current manipulation
+        groups = [change.manipulations for change in self._changes]
+        current_group = self.manipulations.group(self._current_manipulation)
+        if current_group.changed:  # The current manipulation is not saved
+            groups.append(current_group)
+        if groups:  # Only run the expensive part when needed
             pixmap = self.manipulations.apply_groups(
-                self._current_pixmap.pixmap,
-                *[change.manipulations for change in self._changes],
+                self._current_pixmap.pixmap, *groups
             )  # Apply all changes to the full-scale pixmap
             self.accepted.emit(pixmap)
         api.modes.MANIPULATE.close()
@@ -431,7 +563,8 @@ class Manipulator(QObject):
         """Reset manipulations to default."""
         for manipulation in self.manipulations:
             manipulation.reset()
-        self._pixmap = self._manipulated = None
+        self._pixmap = self._proxy = self._manipulated = None
+        self._generation += 1  # Drop any running preview
         self._changes.clear()
 
     @api.keybindings.register(("K", "L"), "increase 10", mode=api.modes.MANIPULATE)
@@ -480,24 +613,64 @@ class Manipulator(QObject):
         self._current_manipulation.value = count if count is not None else value
 
     def _apply_manipulation(self, manipulation: Manipulation):
-        """Apply changes to displayed image according to an updated manipulation."""
+        """Apply changes to displayed image according to an updated manipulation.
+
+        The proxy is manipulated right away, the preview at display resolution is
+        refined once the input pauses.
+        """
         self._focus(manipulation)
-        self.pool.clear()
-        self._run_manipulation_thread(manipulation)
+        self._generation += 1
+        utils.asyncrun(
+            self._preview, manipulation, self._generation, False, pool=self.proxy_pool
+        )
+        self._refine(manipulation, self._generation)
         api.status.update("manipulate processing")
 
-    @utils.throttled(delay_ms=300)
-    @utils.asyncfunc(pool=pool)
-    def _run_manipulation_thread(self, manipulation):
-        """Run manipulation in the thread pool.
+    @utils.throttled(delay_ms=REFINE_DELAY_MS)
+    def _refine(self, manipulation: Manipulation, generation: int):
+        """Apply manipulation at display resolution in the thread pool.
 
         The function is throttled to keep the number of manipulations done reasonable in
         case of dragging the slider or keeping a key repeat.
         """
-        # self._pixmap is None if manipulate mode has been left
-        if self._pixmap is not None:
-            pixmap = self.manipulations.apply(self._pixmap, manipulation)
-            self.updated.emit(pixmap)
+        utils.asyncrun(self._preview, manipulation, generation, True, pool=self.pool)
+
+    def _preview(self, manipulation: Manipulation, generation: int, refined: bool):
+        """Apply manipulation to the pixmap or proxy unless the preview is outdated.
+
+        This is run in one of the thread pools. Outdated previews are skipped instead of
+        clearing the pools as saved changes must be applied in order.
+
+        Args:
+            manipulation: The manipulation to apply.
+            generation: Number of the manipulation update of this preview.
+            refined: True to manipulate the pixmap at display resolution.
+        """
+        pixmap = self._pixmap if refined else self._proxy
+        # pixmap is None if manipulate mode has been left
+        if pixmap is not None and generation == self._generation:
+            pixmap = self.manipulations.apply(pixmap, manipulation)
+            self._computed.emit(generation, refined, pixmap)
+
+    def _rebase(self, group: ManipulationGroup, generation: int, refined: bool):
+        """Apply saved changes to the pixmap or proxy which following previews use.
+
+        This is run in one of the thread pools.
+
+        Args:
+            group: Copy of the manipulation group with the saved changes.
+            generation: Number of the manipulation update when the changes were saved.
+            refined: True to manipulate the pixmap at display resolution.
+        """
+        pixmap = self._pixmap if refined else self._proxy
+        if pixmap is None:  # Manipulate mode has been left
+            return
+        manipulated = self.manipulations.apply_groups(pixmap, group)
+        if refined and pixmap is self._pixmap:
+            self._pixmap = manipulated
+            self._computed.emit(generation, refined, manipulated)
+        elif not refined and pixmap is self._proxy:
+            self._proxy = manipulated
 
     @utils.slot
     def focus_group_index(self, index: int):
@@ -517,7 +690,7 @@ class Manipulator(QObject):
     @api.status.module("{processing}")
     def _processing_indicator(self):
         """Print ``processing...`` if manipulations are running."""
-        if self.pool.activeThreadCount():
+        if self.pool.activeThreadCount() or self.proxy_pool.activeThreadCount():
             return "processing..."
         return ""
 
@@ -536,31 +709,54 @@ class Manipulator(QObject):
             return
         screen_geometry = QApplication.desktop().screenGeometry()
         self._pixmap = self._current_pixmap.pixmap.scaled(
-            screen_geometry.width(),
-            screen_geometry.height(),
+            screen_geometry.width() // 2,
+            screen_geometry.height() // 2,
+            aspectRatioMode=Qt.KeepAspectRatio,
+            transformMode=Qt.SmoothTransformation,
+        )
+        self._proxy = self._pixmap.scaled(
+            max(1, self._pixmap.width() // self.PROXY_SCALE),
+            max(1, self._pixmap.height() // self.PROXY_SCALE),
             aspectRatioMode=Qt.KeepAspectRatio,
             transformMode=Qt.SmoothTransformation,
         )
         self.updated.emit(self._pixmap)
 
-    def _on_updated(self, pixmap):
-        """Set manipulated and update status when pixmap was updated.
+    def _on_computed(self, generation: int, refined: bool, pixmap: QPixmap):
+        """Display a computed preview unless it is outdated.
 
-        This is done with signal handling as the ManipulateRunner runs in another
-        thread and finally emits the signal.
+        This is done with signal handling as the preview is computed in another thread.
+        A proxy is not displayed once the preview at display resolution is shown.
         """
-        self._manipulated = pixmap
+        if generation == self._generation and self._refined != generation:
+            if refined:
+                self._refined = generation
+                self._manipulated = pixmap
+            self.updated.emit(pixmap)
         api.status.update("manipulate pixmap updated")
 
     def _save_changes(self):
-        """Save changes according to the current manipulation."""
-        if self._manipulated is None:  # Nothing changed
-            return
+        """Save changes according to the current manipulation.
+
+        The last preview at display resolution becomes the base for any following
+        manipulation if it is up-to-date. Otherwise the changes are applied in the
+        thread pool, as they are for the proxy.
+        """
         current_group = self.manipulations.group(self._current_manipulation)
-        self._changes.append(
-            ManipulationChange(self._manipulated, copy.copy(current_group))
+        if self._pixmap is None or not current_group.changed:  # Nothing changed
+            return
+        group = copy.copy(current_group)
+        pixmap = self._manipulated if self._refined == self._generation else None
+        self._generation += 1  # Drop pending previews of the saved changes
+        if pixmap is not None:
+            self._pixmap = pixmap
+        else:
+            utils.asyncrun(self._rebase, group, self._generation, True, pool=self.pool)
+        utils.asyncrun(
+            self._rebase, group, self._generation, False, pool=self.proxy_pool
         )
+        self._changes.append(ManipulationChange(pixmap, group))
+        self._manipulated = None
         # Reset to avoid double application of the changes
         for manipulation in current_group:
             manipulation.reset()
-        self._pixmap, self._manipulated = self._manipulated, None
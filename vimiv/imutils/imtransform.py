@@ -71,6 +71,13 @@ class Transform(QTransform):
 
     @property
     def original(self):
+        """The original, untransformed, pixmap.
+
+        In case this is not set as only a preview was loaded, the full resolution is
+        retrieved from the current pixmap.
+        """
+        if self._original is None:
+            self._original = self._current.pixmap
         return self._original
 
     @original.setter
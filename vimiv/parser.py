@@ -82,6 +82,26 @@ def get_argparser() -> argparse.ArgumentParser:
         "paths", nargs="*", type=existing_path, metavar="PATH", help="Paths to open"
     )
 
+    thumbnails = parser.add_argument_group("thumbnail generation arguments")
+    thumbnails.add_argument(
+        "--generate-thumbnails",
+        type=existing_directory,
+        metavar="DIRECTORY",
+        help="Create thumbnails for all images in DIRECTORY without starting the "
+        "user interface and exit. Formats provided by plugins are not supported",
+    )
+    thumbnails.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Also create thumbnails for images in subdirectories",
+    )
+    thumbnails.add_argument(
+        "--jobs",
+        type=positive_int,
+        metavar="N",
+        help="Number of processes used to create thumbnails, default: number of cpus",
+    )
+
     devel = parser.add_argument_group("development arguments")
     devel.add_argument(
         "--debug",
@@ -138,6 +158,20 @@ def existing_file(value: str) -> str:
     return path
 
 
+def existing_directory(value: str) -> str:
+    """Check if an argument value is an existing directory.
+
+    Args:
+        value: Value given to commandline option as string.
+    Returns:
+        Path to the directory as string if it exists.
+    """
+    path = os.path.abspath(os.path.expanduser(value))
+    if not os.path.isdir(path):
+        raise argparse.ArgumentTypeError(f"No directory called '{value}'")
+    return path
+
+
 def existing_path(value: str) -> str:
     """Check if an argument value is an existing path.
 
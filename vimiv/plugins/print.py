@@ -13,7 +13,7 @@ from PyQt5.QtCore import QObject, Qt, QSize, pyqtSignal
 from PyQt5.QtGui import QPixmap, QMovie, QPainter
 from PyQt5.QtPrintSupport import QPrintDialog, QPrintPreviewDialog, QPrinter
 
-from vimiv import api
+from vimiv import api, imutils
 from vimiv.utils import slot, log, lazy
 
 QtSvg = lazy.import_module("PyQt5.QtSvg", optional=True)
@@ -40,8 +40,10 @@ class PrintHandler(QObject):
         self._widget: Optional[PrintWidget] = None
 
         api.signals.pixmap_loaded.connect(self._on_pixmap_loaded)
+        api.signals.pixmap_preview_loaded.connect(self._on_pixmap_preview_loaded)
         api.signals.movie_loaded.connect(self._on_movie_loaded)
         api.signals.svg_loaded.connect(self._on_svg_loaded)
+        api.signals.tiled_image_loaded.connect(self._on_tiled_image_loaded)
 
     @api.commands.register(mode=api.modes.IMAGE)
     def print(self, preview: bool = False) -> None:
@@ -83,10 +85,18 @@ class PrintHandler(QObject):
     def _on_pixmap_loaded(self, pixmap: QPixmap) -> None:
         self._widget = PrintPixmap(pixmap)
 
+    @slot
+    def _on_pixmap_preview_loaded(self, _preview: QPixmap, size: QSize) -> None:
+        self._widget = PrintFullResolution(size)
+
     @slot
     def _on_svg_loaded(self, path: str) -> None:
         self._widget = PrintSvg(QtSvg.QSvgWidget(path))
 
+    @slot
+    def _on_tiled_image_loaded(self) -> None:
+        self._widget = None  # Huge images are never decoded as a whole
+
     @slot
     def _on_movie_loaded(self, movie: QMovie) -> None:
         self._widget = PrintMovie(movie)
@@ -136,6 +146,27 @@ class PrintPixmap(PrintWidget):
         return self._widget.size()
 
 
+class PrintFullResolution(PrintPixmap):
+    """Print class for images of which only a reduced-size preview is displayed.
+
+    The full resolution is retrieved from imutils and thus only decoded once the image
+    is actually printed.
+    """
+
+    def __init__(self, size: QSize):
+        super().__init__(QPixmap())
+        self._size = size
+
+    def paint(self, printer: QPrinter) -> None:
+        """Retrieve the full resolution and paint it like any other pixmap."""
+        self._widget = imutils.pixmap()
+        super().paint(printer)
+
+    @property
+    def size(self) -> QSize:
+        return self._size
+
+
 class PrintSvg(PrintWidget):
     """Print class for svg vector graphics."""
 
@@ -24,13 +24,22 @@ from vimiv import app, api, parser, imutils, plugins
 from vimiv.commands import runners, search
 from vimiv.config import configfile, keyfile, styles
 from vimiv.gui import mainwindow
-from vimiv.utils import xdg, crash_handler, log, trash_manager, customtypes, migration
+from vimiv.utils import (
+    xdg,
+    crash_handler,
+    log,
+    trash_manager,
+    customtypes,
+    migration,
+    thumbnail_manager,
+)
 
 # Must be imported to create the commands using the decorators
 from vimiv.commands import (  # pylint: disable=unused-import
     misccommands,
     delete_command,
     help_command,
+    thumbnail_command,
 )
 from vimiv.config import configcommands  # pylint: disable=unused-import
 
@@ -72,6 +81,9 @@ def setup_pre_app(argv: List[str]) -> argparse.Namespace:
     log.setup_logging(args.log_level, *args.debug)
     _logger.debug("Start: vimiv %s", " ".join(argv))
     update_settings(args)
+    if args.generate_thumbnails is not None:
+        generate_thumbnails(args)
+        sys.exit(customtypes.Exit.success)
     trash_manager.init()
     return args
 
@@ -159,6 +171,22 @@ def update_settings(args: argparse.Namespace) -> None:
     styles.parse()
 
 
+def generate_thumbnails(args: argparse.Namespace) -> None:
+    """Create thumbnails in the tier of the thumbnail.size setting and print a summary.
+
+    Args:
+        args: Arguments returned from parser.parse_args().
+    """
+    print(f"Generating thumbnails for '{args.generate_thumbnails}'...")
+    result = thumbnail_manager.generate(
+        args.generate_thumbnails,
+        recursive=args.recursive,
+        jobs=args.jobs,
+        size=api.settings.thumbnail.size.value,
+    )
+    print(result)
+
+
 def run_startup_commands(*commands: str) -> None:
     """Run commands given via --command at startup.
 
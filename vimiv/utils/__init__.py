@@ -323,6 +323,17 @@ def split(a: typing.List[AnyT], n: int) -> typing.Iterator[typing.List[AnyT]]:
     return (a[i * k + min(i, m) : (i + 1) * k + min(i + 1, m)] for i in range(n))
 
 
+def blocks(rows: typing.Iterable[int]) -> typing.List[typing.Tuple[int, int]]:
+    """Split sorted rows into blocks of consecutive rows given as (first, last)."""
+    result: typing.List[typing.Tuple[int, int]] = []
+    for row in rows:
+        if result and result[-1][1] == row - 1:
+            result[-1] = (result[-1][0], row)
+        else:
+            result.append((row, row))
+    return result
+
+
 def recursive_split(
     text: str, separator: str, updater: typing.Callable[[str], str]
 ) -> typing.List[str]:
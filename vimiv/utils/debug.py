@@ -11,7 +11,7 @@ import cProfile
 import functools
 import pstats
 import time
-from typing import Any, Iterator
+from typing import Any, Iterator, Optional
 
 from vimiv.utils.customtypes import FuncT
 
@@ -55,3 +55,55 @@ def profile(amount: int = 15) -> Iterator[None]:
     stats = pstats.Stats(cprofile)
     stats.sort_stats("cumulative").print_stats(amount)
     stats.sort_stats("time").print_stats(amount)
+
+
+class TimeCounter:
+    """Context manager accumulating the number of calls and time of code sections.
+
+    In contrast to timed, nothing is printed for the individual calls. This allows
+    timing code sections that are executed very often, e.g. painting.
+
+    Usage:
+        counter = TimeCounter()
+        with counter:
+            # your code to time here
+            ...
+        print(counter)
+
+    Attributes:
+        count: Number of timed sections.
+        seconds: Total time spent in the timed sections in seconds.
+
+        _start: Start time of the current section if any.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self._start: Optional[float] = None
+
+    def __enter__(self) -> "TimeCounter":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_args: Any) -> None:
+        assert self._start is not None, "Section was not started"
+        self.seconds += time.perf_counter() - self._start
+        self.count += 1
+        self._start = None
+
+    def __str__(self) -> str:
+        return (
+            f"{self.count} calls took {self.seconds * 1000:.3f} ms "
+            f"({self.mean * 1000:.3f} ms per call)"
+        )
+
+    @property
+    def mean(self) -> float:
+        """Mean time per timed section in seconds."""
+        return self.seconds / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        """Reset the number of calls and the total time."""
+        self.count = 0
+        self.seconds = 0.0
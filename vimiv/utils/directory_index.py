@@ -0,0 +1,336 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Persistent index of the supported content of directories.
+
+The images and subdirectories found when scanning a directory are stored in an SQLite
+database in the cache directory together with the modification time of the directory.
+Adding, removing or renaming entries updates the modification time of the directory.
+Thus the stored content can be used instead of scanning the directory again as long as
+the modification time is unchanged. Directories modified shortly before they are stored
+are skipped, as further changes within the timestamp resolution of the file system
+would go unnoticed.
+
+In addition, the size and modification time of every image as well as the number of
+entries of every directory are stored. These are used to display the size of images
+and directories without reading them again. The sizes of images are only used while
+the modification times of their directory and of the image itself are unchanged, e.g.
+as the image was rewritten in place by another program.
+
+The index is enabled using init and disabled using close. All module functions are
+no-ops while the index is disabled.
+
+Module Attributes:
+    _index: The DirectoryIndex if the index is enabled, None otherwise.
+"""
+
+import contextlib
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import sqlite3
+except ImportError:  # Python built without sqlite support
+    sqlite3 = None  # type: ignore
+
+from vimiv.utils import xdg, log
+
+
+# Directories modified within this time before storing them are not stored
+RACY_NS = 2 * 10 ** 9
+
+# Number of directories for which the sizes of the images are kept in memory
+MAX_SIZE_DIRECTORIES = 8
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    n_entries INTEGER NOT NULL,
+    show_hidden INTEGER NOT NULL,
+    by_extension INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    PRIMARY KEY (directory, name)
+) WITHOUT ROWID;
+"""
+
+_logger = log.module_logger(__name__)
+
+
+class DirectoryIndex:
+    """SQLite database storing the supported content of scanned directories.
+
+    The database is accessed from the main thread and from the threads scanning
+    directories. Access is therefore serialized using a lock.
+
+    Attributes:
+        path: Path to the database file.
+
+        _connection: The sqlite3 connection to the database.
+        _lock: Lock to access the database and the sizes.
+        _sizes: Dictionary mapping the recently used directories to their modification
+            time and a dictionary mapping their images to the size in bytes and the
+            modification time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, Tuple[int, Dict[str, Tuple[int, int]]]] = {}
+        xdg.makedirs(os.path.dirname(path))
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            _logger.debug("Creating directory index schema version %d", SCHEMA_VERSION)
+            with self._connection:
+                self._connection.execute("DROP TABLE IF EXISTS directories")
+                self._connection.execute("DROP TABLE IF EXISTS entries")
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def get(
+        self, directory: str, show_hidden: bool, by_extension: bool
+    ) -> Optional[Tuple[List[str], List[str]]]:
+        """Return the stored content of directory if it was not modified since.
+
+        Args:
+            directory: Absolute path to the directory.
+            show_hidden: True if hidden files and directories are included.
+            by_extension: True if images are detected by their extension.
+        Returns:
+            Sorted lists of the images and directories or None if the directory was not
+            stored with the same options or was modified since.
+        """
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime_ns, show_hidden, by_extension FROM directories "
+                "WHERE path = ?",
+                (directory,),
+            ).fetchone()
+            if row != (mtime_ns, show_hidden, by_extension):
+                return None
+            entries = self._connection.execute(
+                "SELECT name, is_dir, size, mtime_ns FROM entries WHERE directory = ?",
+                (directory,),
+            ).fetchall()
+            images: List[str] = []
+            directories: List[str] = []
+            sizes: Dict[str, Tuple[int, int]] = {}
+            for name, is_dir, size, file_mtime_ns in entries:
+                path = os.path.join(directory, name)
+                if is_dir:
+                    directories.append(path)
+                else:
+                    images.append(path)
+                    sizes[path] = size, file_mtime_ns
+            self._store_sizes(directory, mtime_ns, sizes)
+        _logger.debug("Using indexed content of '%s'", directory)
+        return sorted(images), sorted(directories)
+
+    def put(
+        self,
+        directory: str,
+        images: Iterable[str],
+        directories: Iterable[str],
+        show_hidden: bool,
+        by_extension: bool,
+    ) -> None:
+        """Store the content of directory.
+
+        The content is not stored if the directory was modified shortly before or while
+        retrieving the attributes of its content.
+
+        Args:
+            directory: Absolute path to the directory.
+            images: Paths to all images in the directory.
+            directories: Paths to all subdirectories in the directory.
+            show_hidden: True if hidden files and directories are included.
+            by_extension: True if images were detected by their extension.
+        """
+        mtime_ns = os.stat(directory).st_mtime_ns
+        if int(time.time() * 10 ** 9) - mtime_ns < RACY_NS:
+            _logger.debug("Not indexing recently modified '%s'", directory)
+            self._discard_sizes(directory)
+            return
+        n_entries = len(os.listdir(directory))
+        entries = [(os.path.basename(path), 1, None, None) for path in directories]
+        sizes: Dict[str, Tuple[int, int]] = {}
+        for path in images:
+            with contextlib.suppress(OSError):  # Deleted in the meantime
+                stat = os.stat(path)
+                name = os.path.basename(path)
+                entries.append((name, 0, stat.st_size, stat.st_mtime_ns))
+                sizes[path] = stat.st_size, stat.st_mtime_ns
+        if os.stat(directory).st_mtime_ns != mtime_ns:
+            _logger.debug("Not indexing '%s' modified while indexing", directory)
+            self._discard_sizes(directory)
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM entries WHERE directory = ?", (directory,)
+            )
+            self._connection.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?)",
+                ((directory, *entry) for entry in entries),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?)",
+                (directory, mtime_ns, n_entries, show_hidden, by_extension),
+            )
+            self._store_sizes(directory, mtime_ns, sizes)
+        _logger.debug("Indexed %d entries of '%s'", len(entries), directory)
+
+    def file_size(self, path: str) -> Optional[int]:
+        """Return the stored size of the image at path if known and up-to-date."""
+        directory = os.path.dirname(path)
+        with self._lock:
+            if directory not in self._sizes:
+                return None
+        mtime_ns = os.stat(directory).st_mtime_ns
+        file_mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            stored_mtime_ns, sizes = self._sizes.get(directory, (None, {}))
+            if stored_mtime_ns != mtime_ns:
+                self._sizes.pop(directory, None)
+                return None
+            size, stored_file_mtime_ns = sizes.get(path, (None, None))
+            if stored_file_mtime_ns != file_mtime_ns:
+                sizes.pop(path, None)
+                return None
+            return size
+
+    def discard(self, path: str) -> None:
+        """Forget the stored size of the image at path as it was changed."""
+        with self._lock:
+            _, sizes = self._sizes.get(os.path.dirname(path), (None, {}))
+            sizes.pop(path, None)
+
+    def n_entries(self, directory: str) -> Optional[int]:
+        """Return the stored number of entries of directory if it was not modified."""
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT n_entries FROM directories WHERE path = ? AND mtime_ns = ?",
+                (directory, mtime_ns),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def _store_sizes(
+        self, directory: str, mtime_ns: int, sizes: Dict[str, Tuple[int, int]]
+    ) -> None:
+        """Keep the sizes of the images in directory for the most recent directories.
+
+        Must be called with the lock held.
+        """
+        self._sizes.pop(directory, None)
+        self._sizes[directory] = mtime_ns, sizes
+        while len(self._sizes) > MAX_SIZE_DIRECTORIES:
+            del self._sizes[next(iter(self._sizes))]
+
+    def _discard_sizes(self, directory: str) -> None:
+        with self._lock:
+            self._sizes.pop(directory, None)
+
+
+_index: Optional[DirectoryIndex] = None
+
+
+def default_path() -> str:
+    """Return the path to the database file of the index."""
+    return xdg.vimiv_cache_dir("directories.sqlite")
+
+
+def init(path: Optional[str] = None) -> None:
+    """Enable the index using the database at path, defaults to the default path."""
+    global _index
+    if _index is not None:
+        return
+    if sqlite3 is None:
+        _logger.warning("Directory index requires python built with sqlite support")
+        return
+    try:
+        _index = DirectoryIndex(path if path is not None else default_path())
+    except (OSError, sqlite3.Error) as e:
+        log.error("Cannot open directory index: %s", e)
+
+
+def close() -> None:
+    """Disable the index."""
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
+
+
+def get(
+    directory: str, show_hidden: bool, by_extension: bool
+) -> Optional[Tuple[List[str], List[str]]]:
+    """Return the stored content of directory if available, see DirectoryIndex.get."""
+    if _index is None:
+        return None
+    try:
+        return _index.get(directory, show_hidden, by_extension)
+    except (OSError, sqlite3.Error) as e:
+        _logger.debug("Error reading index of '%s': %s", directory, e)
+        return None
+
+
+def put(
+    directory: str,
+    images: Iterable[str],
+    directories: Iterable[str],
+    show_hidden: bool,
+    by_extension: bool,
+) -> None:
+    """Store the content of directory if enabled, see DirectoryIndex.put."""
+    if _index is None:
+        return
+    try:
+        _index.put(directory, images, directories, show_hidden, by_extension)
+    except (OSError, sqlite3.Error) as e:
+        _logger.debug("Error indexing '%s': %s", directory, e)
+
+
+def file_size(path: str) -> Optional[int]:
+    """Return the stored size of the image at path if known and up-to-date."""
+    if _index is None:
+        return None
+    try:
+        return _index.file_size(path)
+    except OSError as e:
+        _logger.debug("Error reading size of '%s': %s", path, e)
+        return None
+
+
+def discard(path: str) -> None:
+    """Forget the stored size of the image at path as it was changed."""
+    if _index is not None:
+        _index.discard(path)
+
+
+def n_entries(directory: str) -> Optional[int]:
+    """Return the stored number of entries of directory if known and up-to-date."""
+    if _index is None:
+        return None
+    try:
+        return _index.n_entries(directory)
+    except (OSError, sqlite3.Error) as e:
+        _logger.debug("Error reading index of '%s': %s", directory, e)
+        return None
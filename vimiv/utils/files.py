@@ -8,14 +8,33 @@
 
 import imghdr
 import functools
+import mimetypes
 import os
-from typing import List, Tuple, Optional, BinaryIO, Iterable, Callable
+from typing import (
+    Dict,
+    List,
+    Tuple,
+    Optional,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    Callable,
+    FrozenSet,
+)
 
 from PyQt5.QtGui import QImageReader
 
-from vimiv.utils import imagereader
+from vimiv.utils import imagereader, directory_index
 
 
+# Common extensions of image formats that are not known to the mimetypes module
+EXTENSION_ALIASES = {
+    "jpeg": ("jpe", "jfif"),
+    "tiff": ("tif",),
+    "heif": ("heic",),
+    "heic": ("heif",),
+}
+
 def listdir(directory: str, show_hidden: bool = False) -> List[str]:
     """Wrapper around os.listdir.
 
@@ -52,6 +71,65 @@ def supported(paths: Iterable[str]) -> Tuple[List[str], List[str]]:
     return images, directories
 
 
+def scan(
+    directory: str,
+    show_hidden: bool = False,
+    chunksize: int = 0,
+    by_extension: bool = False,
+    rejected: Optional[Dict[str, Tuple[int, int, int]]] = None,
+) -> Iterator[Tuple[List[str], List[str]]]:
+    """Scan a directory for supported images and directories.
+
+    In contrast to listdir followed by supported, the type information provided by
+    os.scandir is used. Thus no additional stat call is required for most entries and
+    only regular files are opened to check if they are an image.
+
+    Args:
+        directory: Directory to scan.
+        show_hidden: Include hidden files and directories.
+        chunksize: Number of entries after which the content found is yielded, doubled
+            for every following chunk. If 0, all content is yielded at once.
+        by_extension: Detect images by their extension instead of opening the files.
+            See has_image_extension for details.
+        rejected: Dictionary to add the names of files that are no image to together
+            with their inode, size and modification time if given.
+    Yields:
+        Tuples of the images and directories found since the previous chunk as sorted
+        lists of absolute paths. The last chunk may be empty.
+    """
+    directory = os.path.abspath(os.path.expanduser(directory))
+    images: List[str] = []
+    directories: List[str] = []
+    n_entries = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not show_hidden and entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir():
+                    directories.append(entry.path)
+                elif entry.is_file():
+                    if (
+                        has_image_extension(entry.path)
+                        if by_extension
+                        else imghdr.what(entry.path) is not None
+                    ):
+                        images.append(entry.path)
+                    elif rejected is not None:
+                        stat = entry.stat()
+                        signature = stat.st_ino, stat.st_size, stat.st_mtime_ns
+                        rejected[entry.name] = signature
+            except OSError:  # E.g. deleted in the meantime or no permission
+                pass
+            n_entries += 1
+            if n_entries == chunksize:
+                yield sorted(images), sorted(directories)
+                images, directories = [], []
+                n_entries = 0
+                chunksize *= 2
+    yield sorted(images), sorted(directories)
+
+
 def get_size(path: str) -> str:
     """Get the size of a path in human readable format.
 
@@ -73,6 +151,9 @@ def get_size(path: str) -> str:
 
 def get_size_file(path: str) -> str:
     """Retrieve the size of a file as formatted byte number in human-readable format."""
+    size = directory_index.file_size(path)
+    if size is not None:
+        return sizeof_fmt(size)
     try:
         return sizeof_fmt(os.path.getsize(path))
     except OSError:
@@ -105,6 +186,9 @@ def get_size_directory(path: str) -> str:
     Returns:
         Size as formatted string.
     """
+    size = directory_index.n_entries(path)
+    if size is not None:
+        return str(size)
     try:
         return str(len(os.listdir(path)))
     except OSError:
@@ -123,6 +207,55 @@ def is_image(filename: str) -> bool:
         return False
 
 
+def has_image_extension(filename: str) -> bool:
+    """Check whether a file is an image according to its extension.
+
+    In contrast to is_image, the file is only opened if it has no extension. Files with
+    the extension of an image format that do not contain an image are detected once
+    they are read. Any other format than the one of the extension is detected from the
+    header when reading.
+
+    Args:
+        filename: Path to the file to check.
+    """
+    _, extension = os.path.splitext(filename)
+    if not extension:
+        try:
+            return imghdr.what(filename) is not None
+        except OSError:
+            return False
+    external_formats = frozenset(imagereader.external_handler)
+    return extension[1:].lower() in image_extensions(external_formats)
+
+
+@functools.lru_cache(maxsize=None)
+def image_extensions(external_formats: FrozenSet[str] = frozenset()) -> FrozenSet[str]:
+    """Return the file extensions of all supported image formats.
+
+    Format names are not necessarily file extensions. Therefore the extensions of the
+    mime types of the formats are added as well as common extensions neither defined
+    by the format name nor the mime type.
+
+    Args:
+        external_formats: Names of the formats supported by external handlers.
+    """
+    formats = {
+        bytes(fmt).decode().lower() for fmt in QImageReader.supportedImageFormats()
+    }
+    formats.update(external_formats)
+    mime_types = {bytes(mime).decode() for mime in QImageReader.supportedMimeTypes()}
+    mime_types.update(f"image/{fmt}" for fmt in formats)
+    extensions = set(formats)
+    for mimetype in mime_types:
+        extensions.update(
+            extension[1:] for extension in mimetypes.guess_all_extensions(mimetype)
+        )
+    for fmt, aliases in EXTENSION_ALIASES.items():
+        if fmt in formats:
+            extensions.update(aliases)
+    return frozenset(extensions)
+
+
 def listfiles(directory: str, abspath: bool = False) -> List[str]:
     """Return list of all files in directory traversing the directory recursively.
 
@@ -7,10 +7,10 @@
 """Image reader classes to read images from file to Qt objects."""
 
 import abc
-from typing import Dict, Callable
+from typing import Dict, Callable, Optional
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QImageReader, QPixmap, QImage
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImageIOHandler, QImageReader, QPixmap, QImage
 
 from .files import imghdr
 
@@ -24,7 +24,8 @@ class BaseReader(abc.ABC):
     which reads the file from disk and returns a QPixmap. In addition, the classmethod
     supports must be implemented to define the supported image formats. For
     optimization, the get_image method can also be provided. This method is called when
-    retrieving thumbnails.
+    retrieving thumbnails and when prefetching images. Readers which implement get_image
+    without creating a QPixmap should set is_threadsafe to True.
     """
 
     def __init__(self, path: str, file_format: str):
@@ -39,13 +40,30 @@ class BaseReader(abc.ABC):
     def is_animation(self) -> bool:
         return False
 
+    @property
+    def is_threadsafe(self) -> bool:
+        """True if get_image can be called outside of the main thread."""
+        return False
+
+    @property
+    def is_tileable(self) -> bool:
+        """True if regions of the image can be decoded individually by QImageReader."""
+        return False
+
+    @property
+    def size(self) -> QSize:
+        """Size of the image without reading it, invalid if this is not possible."""
+        return QSize()
+
     @abc.abstractmethod
     def get_pixmap(self) -> QPixmap:
         """Read self.path from disk and return a QPixmap."""
 
-    def get_image(self, size: int) -> QImage:
-        """Read self.path from disk and return a scaled QImage."""
-        pixmap = self.get_pixmap().scaled(size, size, Qt.KeepAspectRatio)
+    def get_image(self, size: Optional[int] = None) -> QImage:
+        """Read self.path from disk and return a QImage scaled to size if given."""
+        pixmap = self.get_pixmap()
+        if size is not None:
+            pixmap = pixmap.scaled(size, size, Qt.KeepAspectRatio)
         return pixmap.toImage()
 
     @classmethod
@@ -73,6 +91,21 @@ class QtReader(BaseReader):
     def is_animation(self) -> bool:
         return self._handler.supportsAnimation()
 
+    @property
+    def is_threadsafe(self) -> bool:
+        return True
+
+    @property
+    def is_tileable(self) -> bool:
+        return self._handler.supportsOption(QImageIOHandler.ClipRect)
+
+    @property
+    def size(self) -> QSize:
+        size = self._handler.size()
+        if self._handler.transformation() & QImageIOHandler.TransformationRotate90:
+            size.transpose()
+        return size
+
     def get_pixmap(self) -> QPixmap:
         """Retrieve the pixmap directly from the image reader."""
         pixmap = QPixmap.fromImageReader(self._handler)
@@ -82,12 +115,18 @@ class QtReader(BaseReader):
             )
         return pixmap
 
-    def get_image(self, size: int) -> QImage:
-        """Retrieve the down-scaled image directly from the image reader."""
-        qsize = self._handler.size()
-        qsize.scale(size, size, Qt.KeepAspectRatio)
-        self._handler.setScaledSize(qsize)
-        return self._handler.read()
+    def get_image(self, size: Optional[int] = None) -> QImage:
+        """Retrieve the possibly down-scaled image directly from the image reader."""
+        if size is not None:
+            qsize = self._handler.size()
+            qsize.scale(size, size, Qt.KeepAspectRatio)
+            self._handler.setScaledSize(qsize)
+        image = self._handler.read()
+        if image.isNull():
+            raise ValueError(
+                f"Error reading image '{self.path}': {self._handler.errorString()}"
+            )
+        return image
 
 
 class ExternalReader(BaseReader):
@@ -0,0 +1,137 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+# This file is part of vimiv.
+# Copyright 2017-2020 Christian Karl (karlch) <karlch at protonmail dot com>
+# License: GNU GPL v3, see the "LICENSE" and "AUTHORS" files for details.
+
+"""Least-recently-used cache limited by the total size of its values in bytes.
+
+In contrast to functools.lru_cache the cache is not bound to a single function and the
+size limit is given by the memory the stored values require, not by the number of
+values. This is useful to store decoded images which vary greatly in size.
+
+The cache is thread-safe, values can therefore be added from a QThreadPool while the
+main thread reads them.
+"""
+
+import collections
+import threading
+from typing import Callable, Generic, Hashable, Optional, TypeVar, Tuple
+
+from vimiv.utils import log
+
+
+ValueT = TypeVar("ValueT")
+
+
+_logger = log.module_logger(__name__)
+
+
+class LRUCache(Generic[ValueT]):
+    """Least-recently-used cache limited by the total size of its values in bytes.
+
+    Attributes:
+        hits: Number of successful lookups using get.
+        misses: Number of failed lookups using get.
+
+        _data: Ordered dictionary mapping keys to the value and its size.
+        _lock: Lock to allow accessing the cache from multiple threads.
+        _maxsize: Maximum total size of all values in bytes.
+        _size: Current total size of all values in bytes.
+        _sizefunc: Function returning the size of a value in bytes.
+    """
+
+    def __init__(self, maxsize: int, sizefunc: Callable[[ValueT], int]):
+        self.hits = self.misses = 0
+        self._data: "collections.OrderedDict[Hashable, Tuple[ValueT, int]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._size = 0
+        self._sizefunc = sizefunc
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if key is cached without updating the statistics or the order."""
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size(self) -> int:
+        """Total size of all values in the cache in bytes."""
+        return self._size
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum total size of all values in bytes.
+
+        Upon setting, the least recently used values are evicted until the cache fits.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict(0)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of successful lookups in the range 0 to 1."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: Hashable) -> Optional[ValueT]:
+        """Return the value stored for key if any and mark it as recently used."""
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: ValueT) -> None:
+        """Store value for key evicting least recently used values as needed.
+
+        Values larger than the maximum size of the cache are not stored at all.
+        """
+        size = self._sizefunc(value)
+        with self._lock:
+            self._remove(key)
+            if size > self._maxsize:
+                _logger.debug("Not caching %s, size %d exceeds limit", key, size)
+                return
+            self._evict(size)
+            self._data[key] = value, size
+            self._size += size
+
+    def pop(self, key: Hashable) -> None:
+        """Remove the value stored for key if any."""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all values and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove key from the cache, the lock must be held by the caller."""
+        with_size = self._data.pop(key, None)
+        if with_size is not None:
+            self._size -= with_size[1]
+
+    def _evict(self, required: int) -> None:
+        """Evict least recently used values until required bytes are available."""
+        while self._data and self._size + required > self._maxsize:
+            key, (_, size) = self._data.popitem(last=False)
+            self._size -= size
+            _logger.debug("Evicted %s from cache", key)
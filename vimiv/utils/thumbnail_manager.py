@@ -9,20 +9,63 @@
 The ThumbnailManager class uses the Creator classes to create thumbnails for a
 list of paths. When one thumbnail was created, the 'created' signal is emitted
 with the index and the QPixmap of the generated thumbnail for the thumbnail
-widget to update.
+widget to update. The order in which thumbnails are created is defined by the
+ThumbnailQueue which prefers visible thumbnails and the ones close to the current
+thumbnail. Thumbnails are stored in the tier of the freedesktop thumbnail cache
+matching the size they are displayed at. Decoded thumbnails are kept in a process-wide
+cache limited by the ``thumbnail.cache_size`` setting so that loading them again does
+not require any disk access.
+
+Images for which creating the thumbnail failed are recorded in the fail directory as
+defined by the thumbnail specification and are not read again unless they are modified.
+
+The ThumbnailCleaner removes thumbnails of deleted or modified images and keeps the
+size of the thumbnail cache within the ``thumbnail.disk_cache_size`` setting. The
+generate function creates thumbnails for complete directories without any user
+interface using multiple processes. The same worker processes are used by the
+ThumbnailManager if the ``thumbnail.processes`` setting is positive.
 """
 
+import collections
 import contextlib
 import hashlib
+import multiprocessing
+import multiprocessing.pool
 import os
+import struct
 import tempfile
-from typing import Dict, List
+import threading
+import time
+import zlib
+from typing import (
+    Collection,
+    Dict,
+    Hashable,
+    List,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from PyQt5.QtCore import QRunnable, pyqtSignal, QObject
+from PyQt5.QtCore import (
+    Qt,
+    QCoreApplication,
+    QRunnable,
+    QThread,
+    QTimer,
+    QUrl,
+    pyqtSignal,
+    QObject,
+)
 from PyQt5.QtGui import QIcon, QPixmap, QImage
 
 import vimiv
-from vimiv.utils import xdg, imagereader, Pool
+from vimiv import api
+from vimiv.imutils import exif
+from vimiv.utils import files, xdg, imagereader, lrucache, log, asyncrun, slot, Pool
 
 
 KEY_URI = "Thumb::URI"
@@ -32,54 +75,330 @@ KEY_WIDTH = "Thumb::Image::Width"
 KEY_HEIGHT = "Thumb::Image::Height"
 KEY_SOFTWARE = "Software"
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_CHUNK_HEADER = struct.Struct(">I4s")  # Length and type of a chunk
+
+MIB = 1024 ** 2
+
+# Directory name and size of the tiers defined by the thumbnail specification
+TIERS = (("normal", 128), ("large", 256), ("x-large", 512), ("xx-large", 1024))
+MAX_SIZE = TIERS[-1][1]
+
+# Result of generating a single thumbnail without user interface
+CREATED, SKIPPED, FAILED, IGNORED = "created", "skipped", "failed", "ignored"
+
+# Time in s to wait for a worker process before creating the thumbnail in the thread
+PROCESS_TIMEOUT = 60
+
+# Time in ms to wait before retrying to start a creator if no thread was available
+RETRY_DELAY_MS = 10
+
+_logger = log.module_logger(__name__)
+
+cache: lrucache.LRUCache[QImage] = lrucache.LRUCache(
+    maxsize=api.settings.thumbnail.cache_size.value * MIB,
+    sizefunc=lambda image: image.byteCount(),
+)
+
 
 class ThumbnailManager(QObject):
     """Manager to create thumbnails for the thumbnail widgets asynchronously.
 
-    Starts the ThumbnailsAsyncCreator class for a list of paths in an extra
-    thread.
+    Starts the ThumbnailCreator class for the pending paths of highest priority in
+    extra threads. Only as many creators as the pool has threads are started at once
+    and every finished creator runs the next one in its thread. Thus the remaining work
+    can be re-prioritized using prioritize and is cancelled once new paths are loaded.
+    Creators never wait in the queue of the pool, as clearing the pool would drop them
+    without notice.
+
+    If the ``thumbnail.processes`` setting is positive, the creators hand decoding,
+    scaling and saving the thumbnail to a pool of worker processes and only load the
+    saved thumbnail. This avoids contention of the GIL when many cores are available.
+    If the worker processes cannot be started, thumbnails are created in the threads.
 
     Attributes:
-        directory: Directory to store generated thumbnails in.
+        base_directory: Directory containing the directories of all tiers, defaults to
+            thumbnails in the user cache directory.
+        directory: Directory of the current tier to store generated thumbnails in.
         fail_directory: Directory to store information on failed thumbnails in.
-        fail_pixmap: QPixmap to display when thumbnail generation failed.
+        fail_pixmap: QPixmap to display when thumbnail generation failed. Not required
+            when generating thumbnails without user interface.
+        size: Size of the thumbnails in the current tier.
 
-        _large: Create large thumbnails.
+        _lock: Lock to access the queue, the process pool and the number of running
+            creators.
+        _processes: Pool of worker processes or None to create thumbnails in threads.
+        _queue: ThumbnailQueue of the pending thumbnails.
+        _running: Number of threads running creators.
 
     Signals:
         created: Emitted with index and pixmap when a thumbnail was created.
+        _created: Emitted by the creators with the queue generation in addition.
     """
 
     created = pyqtSignal(int, QIcon)
+    _created = pyqtSignal(int, int, QIcon)
     pool = Pool.get(globalinstance=False)
 
-    def __init__(self, fail_pixmap: QPixmap, large: bool = True):
+    def __init__(
+        self,
+        fail_pixmap: Optional[QPixmap],
+        size: int = 256,
+        base_directory: Optional[str] = None,
+    ):
         super().__init__()
-        self.large = large
         # Thumbnail creation should take no longer than 1 s
         self.pool.setExpiryTimeout(1000)
 
-        directory = os.path.join(xdg.user_cache_dir(), "thumbnails")
-        self.directory = (
-            os.path.join(directory, "large")
-            if large
-            else os.path.join(directory, "normal")
-        )
-        self.fail_directory = os.path.join(
-            directory, "fail", f"vimiv-{vimiv.__version__}"
+        self.base_directory = (
+            base_directory if base_directory is not None else default_directory()
         )
-        xdg.makedirs(self.directory, self.fail_directory)
+        self.fail_directory = fail_directory(self.base_directory)
+        xdg.makedirs(self.fail_directory)
         self.fail_pixmap = fail_pixmap
+        self.size = 0
+        self.directory = ""
+        self.set_size(size)
+
+        self._lock = threading.Lock()
+        self._queue = ThumbnailQueue()
+        self._running = 0
+        self._processes: Optional[multiprocessing.pool.Pool] = None
+        self._created.connect(self._on_created)
+        # The cache is created before the configuration is read
+        self._on_cache_size_changed(api.settings.thumbnail.cache_size.value)
+        api.settings.thumbnail.cache_size.changed.connect(self._on_cache_size_changed)
+        api.settings.thumbnail.processes.changed.connect(self._restart_processes)
+        api.settings.thumbnail.embedded_preview.changed.connect(self._restart_processes)
+        self._restart_processes()
+
+    def set_size(self, size: int) -> bool:
+        """Select the smallest tier providing thumbnails of at least size pixels.
+
+        Args:
+            size: Size in device pixels the thumbnails are displayed at.
+        Returns:
+            True if the tier changed and the thumbnails should be re-created.
+        """
+        name, tier_size = next((tier for tier in TIERS if tier[1] >= size), TIERS[-1])
+        if tier_size == self.size:
+            return False
+        self.size = tier_size
+        self.directory = os.path.join(self.base_directory, name)
+        xdg.makedirs(self.directory)
+        return True
 
     def create_thumbnails_async(self, paths: List[str]) -> None:
-        """Start ThumbnailsCreator for each path to create thumbnails.
+        """Create thumbnails for paths replacing any pending work.
 
         Args:
             paths: Paths to create thumbnails for.
         """
-        self.pool.clear()
-        for i, path in enumerate(paths):
-            self.pool.start(ThumbnailCreator(i, path, self))
+        with self._lock:
+            self._queue.reset(paths)
+        self._start_creators()
+
+    def prioritize(self, visible: Iterable[int], current: int) -> None:
+        """Update the order in which the pending thumbnails are created.
+
+        Args:
+            visible: Indices of the thumbnails that are currently visible.
+            current: Index of the currently selected thumbnail.
+        """
+        with self._lock:
+            self._queue.prioritize(visible, current)
+
+    def creator_finished(self, run_next: bool = True) -> Optional["ThumbnailCreator"]:
+        """Return the creator to run next in the thread of a finished creator.
+
+        Args:
+            run_next: False if the thread cannot run another creator.
+        Returns:
+            The creator for the pending thumbnail of highest priority or None if the
+            thread is no longer required.
+        """
+        with self._lock:
+            if run_next and self._running <= self.pool.maxThreadCount():
+                creator = self._next_creator()
+                if creator is not None:
+                    return creator
+            self._running -= 1
+        return None
+
+    def generate_in_process(
+        self, path: str, size: int, directory: str
+    ) -> Optional[str]:
+        """Create the thumbnail of path in a worker process and wait for the result.
+
+        Args:
+            path: Path to the image for which the thumbnail is created.
+            size: Size of the thumbnails in the tier to create the thumbnail in.
+            directory: Directory of the tier to create the thumbnail in.
+        Returns:
+            CREATED, SKIPPED, FAILED or IGNORED as returned by the worker process. None
+            if no worker process is available or it did not respond in time.
+        """
+        with self._lock:
+            processes = self._processes
+        if processes is None:
+            return None
+        try:
+            result = processes.apply_async(_generate_thumbnail, (path, size, directory))
+            return result.get(PROCESS_TIMEOUT)
+        except ValueError:  # Pool was closed as the settings changed in the meantime
+            return None
+        except multiprocessing.TimeoutError:
+            _logger.debug("Worker process creating thumbnail for '%s' timed out", path)
+            return None
+
+    def _restart_processes(self, _value: object = None) -> None:
+        """Replace the pool of worker processes according to the current settings.
+
+        Thumbnails being created by the previous pool are finished before its worker
+        processes exit. The number of threads is adapted so that every running creator
+        is served by one worker process.
+        """
+        with self._lock:
+            previous, self._processes = self._processes, None
+        if previous is not None:
+            QCoreApplication.instance().aboutToQuit.disconnect(previous.terminate)
+            previous.close()
+        n_processes = api.settings.thumbnail.processes.value
+        processes = None
+        if n_processes:
+            initargs = (
+                self.base_directory,
+                self.size,
+                api.settings.thumbnail.embedded_preview.value,
+            )
+            try:
+                context = multiprocessing.get_context("spawn")
+                processes = context.Pool(
+                    n_processes, initializer=_init_generator, initargs=initargs
+                )
+            except (ImportError, NotImplementedError, OSError) as e:
+                log.warning(
+                    "Cannot create thumbnails in processes, using threads instead: %s",
+                    e,
+                )
+            else:
+                _logger.debug("Creating thumbnails in %d processes", n_processes)
+                QCoreApplication.instance().aboutToQuit.connect(processes.terminate)
+        with self._lock:
+            self._processes = processes
+        self.pool.setMaxThreadCount(
+            n_processes if processes is not None else QThread.idealThreadCount()
+        )
+        self._start_creators()
+
+    def _start_creators(self) -> None:
+        """Start creators for the pending thumbnails of highest priority.
+
+        If the thread of a finished creator is not available yet, starting the creator
+        is retried shortly instead of queuing it in the pool.
+        """
+        with self._lock:
+            while self._running < self.pool.maxThreadCount():
+                creator = self._next_creator()
+                if creator is None:
+                    return
+                if not self.pool.tryStart(creator):
+                    self._queue.push(creator.index)
+                    break
+                self._running += 1
+            else:
+                return
+        QTimer.singleShot(RETRY_DELAY_MS, self._start_creators)
+
+    def _next_creator(self) -> Optional["ThumbnailCreator"]:
+        """Return the creator for the pending thumbnail of highest priority if any.
+
+        Must be called with the lock held.
+        """
+        item = self._queue.pop()
+        if item is None:
+            return None
+        index, path = item
+        return ThumbnailCreator(index, path, self, self._queue.generation)
+
+    def _on_created(self, generation: int, index: int, icon: QIcon) -> None:
+        """Emit the created signal unless the paths have changed in the meantime."""
+        if generation == self._queue.generation:
+            self.created.emit(index, icon)
+
+    @staticmethod
+    def _on_cache_size_changed(value: int) -> None:
+        cache.maxsize = value * MIB
+
+
+class ThumbnailQueue:
+    """Queue of pending thumbnails ordered by priority.
+
+    Visible thumbnails are popped first in the order they were given. Afterwards the
+    thumbnails closest to the current one are popped. The queue is not thread-safe,
+    access is guarded by the lock of the ThumbnailManager.
+
+    Attributes:
+        generation: Number incremented whenever new paths are loaded.
+
+        _current: Index of the currently selected thumbnail.
+        _lower: Lowest index below current which may still be pending.
+        _paths: List of all paths to create thumbnails for.
+        _pending: Set of indices of the thumbnails that have not been popped.
+        _upper: Lowest index above current which may still be pending.
+        _visible: Reversed list of visible indices that may still be pending.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._paths: List[str] = []
+        self._pending: Set[int] = set()
+        self._visible: List[int] = []
+        self._current = self._lower = self._upper = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def reset(self, paths: List[str]) -> None:
+        """Replace all pending thumbnails with the thumbnails for paths."""
+        self.generation += 1
+        self._paths = list(paths)
+        self._pending = set(range(len(paths)))
+        self.prioritize((), min(self._current, max(len(paths) - 1, 0)))
+
+    def prioritize(self, visible: Iterable[int], current: int) -> None:
+        """Update the visible thumbnails and the current thumbnail."""
+        self._visible = [index for index in visible if index in self._pending]
+        self._visible.reverse()
+        self._current = current
+        self._lower = current - 1
+        self._upper = current
+
+    def pop(self) -> Optional[Tuple[int, str]]:
+        """Remove and return index and path of the pending thumbnail of top priority."""
+        while self._visible:
+            index = self._visible.pop()
+            if index in self._pending:
+                return self._take(index)
+        while self._upper < len(self._paths) and self._upper not in self._pending:
+            self._upper += 1
+        while self._lower >= 0 and self._lower not in self._pending:
+            self._lower -= 1
+        upper_valid = self._upper < len(self._paths)
+        if self._lower < 0:
+            return self._take(self._upper) if upper_valid else None
+        if upper_valid and self._upper - self._current <= self._current - self._lower:
+            return self._take(self._upper)
+        return self._take(self._lower)
+
+    def push(self, index: int) -> None:
+        """Add the popped thumbnail at index back with top priority."""
+        self._pending.add(index)
+        self._visible.append(index)
+
+    def _take(self, index: int) -> Tuple[int, str]:
+        self._pending.remove(index)
+        return index, self._paths[index]
 
 
 class ThumbnailCreator(QRunnable):
@@ -89,35 +408,96 @@ class ThumbnailCreator(QRunnable):
     https://specifications.freedesktop.org/thumbnail-spec/thumbnail-spec-latest.html
 
     Attributes:
-        _index: Index of the thumbnail in the thumbnail widget.
+        index: Index of the thumbnail in the thumbnail widget.
+
+        _directory: Directory of the tier the thumbnail is created in.
+        _generation: Generation of the manager queue this creator was started for.
         _path: Path to the original image.
         _manager: The ThumbnailManager object used for callback.
+        _size: Size of the thumbnails in the tier.
     """
 
-    def __init__(self, index: int, path: str, manager: ThumbnailManager):
+    def __init__(
+        self, index: int, path: str, manager: ThumbnailManager, generation: int
+    ):
         super().__init__()
-        self._index = index
+        self.index = index
         self._path = path
         self._manager = manager
+        self._generation = generation
+        self._directory = manager.directory
+        self._size = manager.size
 
     def run(self) -> None:
-        """Create thumbnail and emit the managers created signal."""
+        """Create thumbnail, emit the managers created signal and run the next."""
+        creator: Optional[ThumbnailCreator] = self
+        try:
+            while creator is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    # pylint: disable=protected-access
+                    creator._emit(creator._get_icon())
+                creator = self._manager.creator_finished()
+        finally:
+            if creator is not None:  # Unexpected error, release the thread
+                self._manager.creator_finished(run_next=False)
+
+    def generate(self) -> str:
+        """Create the thumbnail on disk unless it is up-to-date.
+
+        Returns:
+            CREATED, SKIPPED, FAILED or IGNORED depending on the action taken.
+        """
+        if self._is_thumbnail():
+            return IGNORED
+        thumbnail_path = self._get_thumbnail_path(self._path)
+        try:
+            if self._is_up_to_date(thumbnail_path, self._get_source_mtime(self._path)):
+                return SKIPPED
+            image = self._create_thumbnail(self._path, thumbnail_path)
+        except FileNotFoundError:
+            return FAILED
+        return FAILED if image is None else CREATED
+
+    def _get_icon(self) -> QIcon:
         # Do not create thumbnails for thumbnails
-        if os.path.dirname(self._path) == self._manager.directory:
-            self._manager.created.emit(self._index, QIcon(self._path))
-        else:
+        if self._is_thumbnail():
+            return QIcon(self._path)
+        mtime = os.stat(self._path).st_mtime
+        key = self._get_cache_key(self._path, mtime)
+        image = cache.get(key)
+        if image is None:
             thumbnail_path = self._get_thumbnail_path(self._path)
-            with contextlib.suppress(FileNotFoundError):
-                pixmap = (
-                    self._maybe_recreate_thumbnail(self._path, thumbnail_path)
-                    if os.path.exists(thumbnail_path)
-                    else self._create_thumbnail(self._path, thumbnail_path)
-                )
-                self._manager.created.emit(self._index, QIcon(pixmap))
+            # Only the attributes are read to check if the thumbnail is up-to-date,
+            # the pixel data is decoded once it is known to be displayed
+            image = (
+                QImage(thumbnail_path)
+                if self._is_up_to_date(thumbnail_path, int(mtime))
+                else self._create(self._path, thumbnail_path)
+            )
+            if image is None:
+                return QIcon(self._manager.fail_pixmap)
+            cache.put(key, image)
+        return QIcon(QPixmap.fromImage(image))
+
+    def _is_thumbnail(self) -> bool:
+        tier_directory = os.path.dirname(self._path)
+        return os.path.dirname(tier_directory) == self._manager.base_directory
+
+    def _emit(self, icon: QIcon) -> None:
+        # pylint: disable=protected-access
+        self._manager._created.emit(self._generation, self.index, icon)
 
     def _get_thumbnail_path(self, path: str) -> str:
         filename = self._get_thumbnail_filename(path)
-        return os.path.join(self._manager.directory, filename)
+        return os.path.join(self._directory, filename)
+
+    def _get_cache_key(self, path: str, mtime: float) -> Hashable:
+        """Return the key of the thumbnail of path in the in-memory cache.
+
+        The modification time is part of the key so thumbnails of images changed on disk
+        are re-created.
+        """
+        return self._get_source_uri(path), mtime, self._size
 
     @staticmethod
     def _get_source_uri(path: str) -> str:
@@ -131,37 +511,123 @@ class ThumbnailCreator(QRunnable):
     def _get_source_mtime(path: str) -> int:
         return int(os.path.getmtime(path))
 
-    def _create_thumbnail(self, path: str, thumbnail_path: str) -> QPixmap:
+    def _create(self, path: str, thumbnail_path: str) -> Optional[QImage]:
+        """Create thumbnail in a worker process if available, in this thread otherwise.
+
+        Worker processes do not load plugins and thus ignore formats provided by
+        plugins. These thumbnails are also created in this thread.
+
+        Args:
+            path: Path to the image for which the thumbnail is created.
+            thumbnail_path: Path to which the thumbnail is stored.
+        Returns:
+            The created QImage or None if creating the thumbnail failed.
+        """
+        result = self._manager.generate_in_process(path, self._size, self._directory)
+        if result in (CREATED, SKIPPED):
+            return QImage(thumbnail_path)
+        if result == FAILED:
+            return None
+        return self._create_thumbnail(path, thumbnail_path)
+
+    def _create_thumbnail(self, path: str, thumbnail_path: str) -> Optional[QImage]:
         """Create thumbnail for an image.
 
         Args:
             path: Path to the image for which the thumbnail is created.
             thumbnail_path: Path to which the thumbnail is stored.
         Returns:
-            The created QPixmap.
+            The created QImage or None if creating the thumbnail failed.
         """
-        size = 256 if self._manager.large else 128
-        try:
-            reader = imagereader.get_reader(path)
-            image = reader.get_image(size)
-        except ValueError:
-            return self._manager.fail_pixmap
+        fail_path = os.path.join(
+            self._manager.fail_directory, self._get_thumbnail_filename(path)
+        )
+        if self._is_up_to_date(fail_path, self._get_source_mtime(path)):
+            return None  # Failed before and not modified since
+        image = self._downscale_larger_tier(path)
+        if image is None:
+            try:
+                image = self._read_image(path, self._size)
+            except ValueError:
+                self._save_fail_marker(path, fail_path)
+                return None
         # Image was deleted in the time between reader.read() and now
         try:
             attributes = self._get_thumbnail_attributes(path, image)
         except FileNotFoundError:
-            return self._manager.fail_pixmap
+            return None
+        self._save(image, thumbnail_path, attributes)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(fail_path)
+        return image
+
+    def _save_fail_marker(self, path: str, fail_path: str) -> None:
+        """Record that creating the thumbnail of path failed.
+
+        The marker is an empty image with the attributes required to check if the
+        original image was modified since.
+        """
+        _logger.debug("Failed to create thumbnail for '%s'", path)
+        attributes = {
+            KEY_URI: self._get_source_uri(path),
+            KEY_MTIME: str(self._get_source_mtime(path)),
+            KEY_SOFTWARE: f"vimiv-{vimiv.__version__}",
+        }
+        marker = QImage(1, 1, QImage.Format_ARGB32)
+        marker.fill(Qt.transparent)
+        self._save(marker, fail_path, attributes)
+
+    @staticmethod
+    def _save(image: QImage, path: str, attributes: Dict[str, str]) -> None:
+        """Save image with the attributes as png to path."""
         for key, value in attributes.items():
             image.setText(key, value)
         # First create temporary file and then move it. This avoids
         # problems with concurrent access of the thumbnail cache, since
         # "move" is an atomic operation
-        handle, tmp_filename = tempfile.mkstemp(dir=self._manager.directory)
+        handle, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(path))
         os.close(handle)
         os.chmod(tmp_filename, 0o600)
         image.save(tmp_filename, format="png")
-        os.replace(tmp_filename, thumbnail_path)
-        return QPixmap(image)
+        os.replace(tmp_filename, path)
+
+    def _downscale_larger_tier(self, path: str) -> Optional[QImage]:
+        """Return the thumbnail downscaled from the largest up-to-date larger tier.
+
+        This avoids decoding the original image again if the thumbnail was already
+        created at a larger size, e.g. on a different screen.
+
+        Args:
+            path: Path to the image for which the thumbnail is created.
+        Returns:
+            The downscaled QImage or None if no larger tier contains the thumbnail.
+        """
+        filename = self._get_thumbnail_filename(path)
+        mtime = self._get_source_mtime(path)
+        for name, size in reversed(TIERS):
+            if size <= self._size:
+                break
+            thumbnail_path = os.path.join(self._manager.base_directory, name, filename)
+            if self._is_up_to_date(thumbnail_path, mtime):
+                return QImage(thumbnail_path).scaled(
+                    self._size, self._size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                )
+        return None
+
+    @staticmethod
+    def _read_image(path: str, size: int) -> QImage:
+        """Read the image at path scaled to size.
+
+        If enabled, a large enough preview embedded in the exif data is used to avoid
+        decoding the full image.
+        """
+        if api.settings.thumbnail.embedded_preview.value:
+            preview = exif.read_embedded_preview(path, min_size=size)
+            if not preview.isNull():
+                return preview.scaled(
+                    size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+                )
+        return imagereader.get_reader(path).get_image(size)
 
     def _get_thumbnail_attributes(self, path: str, image: QImage) -> Dict[str, str]:
         """Return a dictionary filled with thumbnail attributes.
@@ -181,18 +647,385 @@ class ThumbnailCreator(QRunnable):
             KEY_SOFTWARE: f"vimiv-{vimiv.__version__}",
         }
 
-    def _maybe_recreate_thumbnail(self, path: str, thumbnail_path: str) -> QPixmap:
-        """Recreate thumbnail if image has been changed since creation.
+    @staticmethod
+    def _is_up_to_date(thumbnail_path: str, mtime: int) -> bool:
+        """Return True if the thumbnail exists and was created for modification time.
+
+        Only the text chunks of the thumbnail are read, the pixel data is not decoded.
+        """
+        return read_png_text(thumbnail_path, (KEY_MTIME,)).get(KEY_MTIME) == str(mtime)
+
+
+class GenerationResult(NamedTuple):
+    """Summary of generating thumbnails without user interface."""
+
+    created: int
+    skipped: int
+    failed: int
+    ignored: int
+    seconds: float
+
+    def __str__(self) -> str:
+        total = self.created + self.skipped + self.failed
+        rate = total / self.seconds if self.seconds else 0.0
+        summary = (
+            f"Processed {total} images in {self.seconds:.1f} s ({rate:.1f} images/s): "
+            f"{self.created} created, {self.skipped} up-to-date, {self.failed} failed"
+        )
+        if self.ignored:
+            summary += (
+                f"\nIgnored {self.ignored} files which are not images in a format "
+                "supported without plugins"
+            )
+        return summary
+
+
+def default_directory() -> str:
+    """Return the directory containing all thumbnail tiers."""
+    return xdg.user_cache_dir("thumbnails")
+
+
+def fail_directory(base_directory: Optional[str] = None) -> str:
+    """Return the directory in which images failing to create a thumbnail are recorded.
+
+    Args:
+        base_directory: Directory containing all thumbnail tiers, defaults to the
+            default directory.
+    """
+    if base_directory is None:
+        base_directory = default_directory()
+    return os.path.join(base_directory, "fail", f"vimiv-{vimiv.__version__}")
+
+
+def clean_failed(retry: bool = False) -> int:
+    """Remove records of images failing to create a thumbnail.
+
+    Args:
+        retry: Remove all records so that creating the thumbnail is retried for every
+            image. Otherwise only records of images that were deleted or modified are
+            removed.
+    Returns:
+        The number of removed records.
+    """
+    directory = fail_directory()
+    removed = 0
+    with contextlib.suppress(FileNotFoundError):
+        for entry in os.scandir(directory):
+            if retry or _is_stale(entry.path):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(entry.path)
+                    removed += 1
+    _logger.debug("Removed %d records of failed thumbnails", removed)
+    return removed
+
+
+class CleanupResult(NamedTuple):
+    """Summary of cleaning the thumbnail cache."""
+
+    removed: int
+    freed: int
+    size: int
+
+    def __str__(self) -> str:
+        freed, size = files.sizeof_fmt(self.freed), files.sizeof_fmt(self.size)
+        return (
+            f"Removed {self.removed} thumbnails freeing {freed}, "
+            f"thumbnail cache size: {size}"
+        )
+
+
+def clean(budget: int = 0, base_directory: Optional[str] = None) -> CleanupResult:
+    """Remove outdated thumbnails and the least recently used ones exceeding budget.
+
+    All tiers and the fail directories of all applications are scanned. Thumbnails of
+    images that were deleted or modified are removed. Afterwards the least recently
+    accessed thumbnails are removed until the total size fits into budget.
+
+    Args:
+        budget: Maximum total size of all thumbnails in bytes, 0 for unlimited.
+        base_directory: Directory containing all thumbnail tiers, defaults to the
+            default directory.
+    """
+    if base_directory is None:
+        base_directory = default_directory()
+    directories = [os.path.join(base_directory, name) for name, _ in TIERS]
+    with contextlib.suppress(OSError):
+        directories.extend(
+            entry.path
+            for entry in os.scandir(os.path.join(base_directory, "fail"))
+            if entry.is_dir()
+        )
+    removed = freed = 0
+    entries: List[Tuple[float, int, str]] = []
+    for directory in directories:
+        try:
+            directory_entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in directory_entries:
+            if not entry.name.endswith(".png"):  # E.g. temporary file being written
+                continue
+            try:
+                stat = entry.stat()
+                if _is_stale(entry.path):
+                    os.remove(entry.path)
+                    removed += 1
+                    freed += stat.st_size
+                else:
+                    entries.append((stat.st_atime, stat.st_size, entry.path))
+            except OSError as e:
+                _logger.debug("Error cleaning '%s': %s", entry.path, e)
+    size = sum(entry[1] for entry in entries)
+    if budget:
+        for _, filesize, path in sorted(entries):
+            if size <= budget:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+                removed += 1
+                freed += filesize
+                size -= filesize
+    return CleanupResult(removed, freed, size)
+
+
+def read_png_text(path: str, keys: Collection[str]) -> Dict[str, str]:
+    """Read the values of the text chunks keys from the png at path.
+
+    In contrast to QImage, only the chunk headers are read while the image data is
+    skipped. Reading stops once all keys were found. Supports tEXt, zTXt and iTXt
+    chunks as Qt writes iTXt for values that are not latin-1.
+
+    Args:
+        path: Path to the png file.
+        keys: Keywords of the text chunks to read.
+    Returns:
+        Dictionary of the keys found mapped to their value, empty for invalid files.
+    """
+    wanted = set(keys)
+    text: Dict[str, str] = {}
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+                return {}
+            while wanted:
+                header = f.read(_PNG_CHUNK_HEADER.size)
+                if len(header) < _PNG_CHUNK_HEADER.size:
+                    break
+                length, chunk_type = _PNG_CHUNK_HEADER.unpack(header)
+                if chunk_type == b"IEND":
+                    break
+                if chunk_type not in (b"tEXt", b"zTXt", b"iTXt"):
+                    f.seek(length + 4, os.SEEK_CUR)  # Skip data and crc
+                    continue
+                keyword, _, data = f.read(length + 4)[:length].partition(b"\0")
+                key = keyword.decode("latin-1")
+                if key in wanted:
+                    text[key] = _decode_png_text(chunk_type, data)
+                    wanted.remove(key)
+    except (OSError, IndexError, ValueError, zlib.error) as e:
+        _logger.debug("Error reading text of '%s': %s", path, e)
+        return {}
+    return text
+
+
+def _decode_png_text(chunk_type: bytes, data: bytes) -> str:
+    """Decode the data following the keyword of a png text chunk."""
+    if chunk_type == b"tEXt":
+        return data.decode("latin-1")
+    if chunk_type == b"zTXt":  # Compression method followed by compressed text
+        return zlib.decompress(data[1:]).decode("latin-1")
+    # iTXt: compression flag and method, language tag, translated keyword and text
+    compressed = data[0]
+    _language, _translated, value = data[2:].split(b"\0", 2)
+    if compressed:
+        value = zlib.decompress(value)
+    return value.decode()
+
+
+def _is_stale(thumbnail_path: str) -> bool:
+    """Return True if the image of the thumbnail was deleted or modified since.
+
+    Thumbnails without URI are invalid and therefore stale. Thumbnails of images that
+    are not local files cannot be checked and are never stale.
+    """
+    attributes = read_png_text(thumbnail_path, (KEY_URI, KEY_MTIME))
+    uri = attributes.get(KEY_URI, "")
+    if not uri.startswith("file://"):
+        return not uri
+    path = uri[len("file://") :]
+    if not os.path.exists(path):  # Other applications may percent-encode the uri
+        path = QUrl(uri).toLocalFile()
+    try:
+        mtime = str(int(os.path.getmtime(path)))
+    except OSError:
+        return True
+    return attributes.get(KEY_MTIME) != mtime
+
+
+class ThumbnailCleaner(QObject):
+    """Clean the thumbnail cache in a background thread of lowest priority.
+
+    The cache is cleaned automatically once per INTERVAL and on request using the
+    ``:thumbnail-clean`` command of the thumbnail commands module.
+
+    Attributes:
+        _report: Display the result of cleaning in the statusbar.
+        _running: True while the cache is cleaned.
+
+    Signals:
+        finished: Emitted with the CleanupResult once cleaning has finished.
+    """
+
+    DELAY = 60 * 1000  # Delay of the automatic cleaning in ms to not slow down startup
+    INTERVAL = 24 * 60 * 60  # Interval between automatic cleaning in s
+
+    finished = pyqtSignal(object)
+    pool = Pool.get(globalinstance=False)
+    instance: "ThumbnailCleaner"  # Set by the object registry
+
+    @api.objreg.register
+    def __init__(self):
+        super().__init__()
+        self.pool.setMaxThreadCount(1)
+        self._report = self._running = False
+        self.finished.connect(self._on_finished)
+
+    def schedule(self) -> None:
+        """Clean the cache after DELAY if it was not cleaned within INTERVAL."""
+        QTimer.singleShot(self.DELAY, self._clean_if_due)
+
+    def clean_async(self, report: bool = False) -> None:
+        """Clean the cache in the background unless it is already being cleaned.
 
         Args:
-            path: Path to the image for which the thumbnail is created.
-            thumbnail_path: Path to which the thumbnail is stored.
-        Returns:
-            The created QPixmap.
+            report: Display the result in the statusbar.
         """
-        path_mtime = str(int(os.path.getmtime(path)))
-        image = QImage(thumbnail_path)
-        thumb_mtime = image.text(KEY_MTIME)
-        if path_mtime == thumb_mtime:
-            return QPixmap(image)
-        return self._create_thumbnail(path, thumbnail_path)
+        self._report |= report
+        if self._running:
+            return
+        self._running = True
+        budget = api.settings.thumbnail.disk_cache_size.value * MIB
+        asyncrun(self._clean, budget, pool=self.pool)
+
+    @staticmethod
+    def stamp_path() -> str:
+        """Path to the file whose modification time is the last time of cleaning."""
+        return xdg.vimiv_cache_dir("thumbnail-clean")
+
+    def _clean_if_due(self) -> None:
+        try:
+            last = os.path.getmtime(self.stamp_path())
+        except OSError:
+            last = 0
+        if time.time() - last >= self.INTERVAL:
+            self.clean_async()
+
+    def _clean(self, budget: int) -> None:
+        QThread.currentThread().setPriority(QThread.LowestPriority)
+        _logger.debug("Cleaning thumbnail cache with budget of %d bytes", budget)
+        result = clean(budget)
+        try:
+            xdg.makedirs(os.path.dirname(self.stamp_path()))
+            with open(self.stamp_path(), "w"):  # Update modification time
+                pass
+        except OSError as e:
+            _logger.debug("Error updating thumbnail clean stamp: %s", e)
+        self.finished.emit(result)
+
+    @slot
+    def _on_finished(self, result: CleanupResult):
+        if self._report:
+            log.info(str(result))
+        else:
+            _logger.debug(str(result))
+        self._report = self._running = False
+
+
+def generate(
+    directory: str,
+    *,
+    recursive: bool = False,
+    jobs: Optional[int] = None,
+    size: int = 256,
+) -> GenerationResult:
+    """Create thumbnails for all images in directory using multiple processes.
+
+    Thumbnails that are up-to-date are skipped. Files are checked for being an image in
+    the worker processes as this requires reading the file header. The worker processes
+    are spawned instead of forked as forking a process running Qt threads is not safe.
+    Thus any state they require is passed explicitly. Plugins are not loaded, files in
+    formats provided by plugins are therefore counted as ignored.
+
+    Args:
+        directory: Directory containing the images.
+        recursive: Also create thumbnails for images in all subdirectories.
+        jobs: Number of processes to use, defaults to the number of cpus.
+        size: Size in pixels the thumbnails are displayed at which defines the tier.
+    """
+    _logger.debug("Generating thumbnails for '%s' using %s processes", directory, jobs)
+    start = time.perf_counter()
+    counts: Dict[str, int] = collections.Counter()
+    initargs = (
+        default_directory(),
+        size,
+        api.settings.thumbnail.embedded_preview.value,
+    )
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(jobs, initializer=_init_generator, initargs=initargs) as pool:
+        for result in pool.imap_unordered(
+            _generate_thumbnail, _walk(directory, recursive), chunksize=16
+        ):
+            counts[result] += 1
+    return GenerationResult(
+        counts[CREATED],
+        counts[SKIPPED],
+        counts[FAILED],
+        counts[IGNORED],
+        time.perf_counter() - start,
+    )
+
+
+def _walk(directory: str, recursive: bool) -> Iterator[str]:
+    """Yield all files in directory excluding hidden files and directories."""
+    for root, dirnames, filenames in os.walk(directory):
+        dirnames[:] = (
+            sorted(name for name in dirnames if not name.startswith("."))
+            if recursive
+            else []
+        )
+        for filename in sorted(filenames):
+            if not filename.startswith("."):
+                yield os.path.join(root, filename)
+
+
+_generator: Optional[ThumbnailManager] = None
+
+
+def _init_generator(base_directory: str, size: int, embedded_preview: bool) -> None:
+    """Create the manager defining the thumbnail directories in a worker process."""
+    global _generator
+    api.settings.thumbnail.embedded_preview.value = embedded_preview
+    api.settings.thumbnail.processes.value = 0  # Workers create thumbnails themselves
+    _generator = ThumbnailManager(None, size=size, base_directory=base_directory)
+
+
+def _generate_thumbnail(
+    path: str, size: Optional[int] = None, directory: Optional[str] = None
+) -> str:
+    """Create the thumbnail for path in a worker process if path is an image.
+
+    Args:
+        path: Path to the image for which the thumbnail is created.
+        size: Size in pixels the thumbnails are displayed at, defaults to the size the
+            worker process was initialized with.
+        directory: Directory to create the thumbnail in, defaults to the directory of
+            the tier of size.
+    """
+    if not files.is_image(path):
+        return IGNORED
+    assert _generator is not None, "Worker process not initialized"
+    if size is not None:
+        _generator.set_size(size)
+    if directory is not None:
+        _generator.directory = directory
+    return ThumbnailCreator(0, path, _generator, 0).generate()